@@ -0,0 +1,18 @@
+import os
+
+# ✅ Where the tool keeps its own state (bookmarks, caches) - not next to the exe, which may be read-only
+APP_DIR_NAME = "SystemAudit"
+
+
+def data_dir():
+    """ %LOCALAPPDATA%\\SystemAudit (or SYSTEM_AUDIT_DATA_DIR when set), created on first use. """
+    path = os.environ.get("SYSTEM_AUDIT_DATA_DIR")
+    if not path:
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".local", "share")
+        path = os.path.join(base, APP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_path(name):
+    return os.path.join(data_dir(), name)
@@ -0,0 +1,150 @@
+import contextvars
+import functools
+import threading
+from contextlib import contextmanager
+
+
+class AuditContext:
+    """ Probe results memoized for the lifetime of one audit run, with hit/miss counters. """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._results = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return self._results[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # ✅ Concurrent callers of the same probe wait for the first one instead of re-running it
+        with key_lock:
+            with self._lock:
+                if key in self._results:
+                    self.hits += 1
+                    return self._results[key]
+
+            value = compute()  # exceptions are not cached
+
+            with self._lock:
+                self._results[key] = value
+                self.misses += 1
+            return value
+
+    def invalidate(self, func=None):
+        """ Forget cached results (all of them, or only those of one probe function). """
+        with self._lock:
+            if func is None:
+                self._results.clear()
+                return
+            name = (func.__module__, func.__qualname__)
+            for key in [k for k in self._results if k[:2] == name]:
+                del self._results[key]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._results)}
+
+
+# ✅ Scoped to the thread (context) that opened the run: run_probes copies it into its workers,
+#    so a report's probes share one cache while GUI threads keep reading live state
+_current = contextvars.ContextVar("audit_run", default=None)
+_active = set()
+_active_lock = threading.Lock()
+
+
+@contextmanager
+def audit_run():
+    """
+    Memoize every @audit_cached probe until the block exits. A nested audit_run() in the
+    same context (or in a run_probes worker started from it) joins the run already active.
+    """
+    context = _current.get()
+    if context is not None:
+        yield context
+        return
+
+    context = AuditContext()
+    token = _current.set(context)
+    with _active_lock:
+        _active.add(context)
+    try:
+        yield context
+    finally:
+        with _active_lock:
+            _active.discard(context)
+        _current.reset(token)
+
+
+def current_audit():
+    """ The AuditContext active in this context, or None outside of an audit run. """
+    return _current.get()
+
+
+def invalidate_probes(*probes):
+    """
+    Called after changing system state: drop the cached results of `probes` (or everything
+    when none are given) from every running audit, so no run keeps serving the old value.
+    """
+    with _active_lock:
+        contexts = list(_active)
+    for context in contexts:
+        for probe in probes or (None,):
+            context.invalidate(probe)
+
+
+def audit_cached(func):
+    """ Decorator: inside an audit run, each distinct call of the probe executes only once. """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        context = _current.get()
+        if context is None:
+            return func(*args, **kwargs)
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)  # unhashable arguments are never memoized
+        return context.get_or_compute(key, lambda: func(*args, **kwargs))
+
+    return wrapper
+
+
+def _check():
+    """ A run is shared with its run_probes workers but not with other threads; invalidation reaches it. """
+    from probe_executor import run_probes
+
+    calls = []
+
+    @audit_cached
+    def probe():
+        calls.append(threading.current_thread().name)
+        return len(calls)
+
+    with audit_run() as context:
+        results = run_probes({"a": probe, "b": probe, "c": probe})
+        outside = []
+        gui = threading.Thread(target=lambda: outside.extend([current_audit(), probe()]))
+        gui.start()
+        gui.join()
+        after_read = probe()
+
+        changer = threading.Thread(target=invalidate_probes, args=(probe,))
+        changer.start()
+        changer.join()
+        after_change = probe()
+
+    shared = set(results.values()) == {1}
+    print(f"{'✅' if shared else '❌'} run_probes workers share the run: {results}")
+    print(f"{'✅' if outside == [None, 2] else '❌'} another thread sees no run and reads live: {outside}")
+    print(f"{'✅' if (after_read, after_change) == (1, 3) else '❌'} invalidate_probes from another thread "
+          f"drops the cached value: {after_read} -> {after_change}, stats {context.stats()}")
+    print(f"{'✅' if current_audit() is None else '❌'} run closed: {current_audit()}")
+
+
+if __name__ == "__main__":
+    _check()
@@ -1,6 +1,7 @@
-import winreg
+from registry_backend import HKEY_LOCAL_MACHINE, KEY_READ, KEY_SET_VALUE, REG_DWORD, get_backend
 import subprocess
 from tkinter import messagebox
+from audit_context import invalidate_probes
 
 REG_PATH = r"SYSTEM\CurrentControlSet\Services\LanmanServer\Parameters"
 REG_NAME = "AutoShareWks"
@@ -11,8 +12,9 @@ def get_admin_share_status():
     False if enabled (1 or key missing).
     """
     try:
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, REG_PATH, 0, winreg.KEY_READ) as reg:
-            value, _ = winreg.QueryValueEx(reg, REG_NAME)
+        reg = get_backend()
+        with reg.OpenKey(HKEY_LOCAL_MACHINE, REG_PATH, 0, KEY_READ) as key:
+            value, _ = reg.QueryValueEx(key, REG_NAME)
             return value == 0
     except FileNotFoundError:
         return False
@@ -25,8 +27,10 @@ def set_admin_share_status(disable=True):
     Sets AutoShareWks value to disable or enable default admin shares.
     """
     try:
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, REG_PATH, 0, winreg.KEY_SET_VALUE) as reg:
-            winreg.SetValueEx(reg, REG_NAME, 0, winreg.REG_DWORD, 0 if disable else 1)
+        reg = get_backend()
+        with reg.OpenKey(HKEY_LOCAL_MACHINE, REG_PATH, 0, KEY_SET_VALUE) as key:
+            reg.SetValueEx(key, REG_NAME, 0, REG_DWORD, 0 if disable else 1)
+        invalidate_probes()  # registry probes of a running audit may hold the old value
         return "Default Admin Shares successfully " + ("disabled." if disable else "enabled.")
     except PermissionError:
         return "❌ Permission Denied: Please run the app as Administrator."
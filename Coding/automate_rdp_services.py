@@ -1,8 +1,5 @@
-import subprocess
-import time
-
-startupinfo = subprocess.STARTUPINFO()
-startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+from service_snapshot import get_service_snapshot
+from service_transitions import transition_services
 
 def disable_services():
     """Disables selected services."""
@@ -20,14 +17,9 @@ def disable_services():
     disabled_services = []
     failed_services = []
     
-    for service in services:
-        result = subprocess.run(
-            ["sc", "config", service, "start=", "disabled"],
-            capture_output=True,
-            text=True,
-            startupinfo=startupinfo
-        )
-        if "SUCCESS" in result.stdout:
+    # ✅ All `sc config` calls go out at once
+    for service, result in transition_services(services, "disabled").items():
+        if result.ok:
             disabled_services.append(service)
         else:
             failed_services.append(service)
@@ -50,44 +42,16 @@ def enable_services():
     enabled_services = []
     failed_services = []
 
-    for service in services:
-        try:
-            config_result = subprocess.run(
-                ["sc", "config", service, "start=", "auto"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                startupinfo=startupinfo
-            )
-
-            if "SUCCESS" not in config_result.stdout:
-                failed_services.append(f"{service} (config failed)")
-                continue
-
-            subprocess.run(
-                ["sc", "start", service],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                startupinfo=startupinfo
-            )
-
-            for _ in range(5):
-                time.sleep(1)
-                status_check = subprocess.run(
-                    ["sc", "query", service],
-                    capture_output=True,
-                    text=True,
-                    startupinfo=startupinfo
-                )
-                if "RUNNING" in status_check.stdout:
-                    enabled_services.append(service)
-                    break
-            else:
-                failed_services.append(f"{service} (didn't confirm running)")
-
-        except Exception as e:
-            failed_services.append(f"{service} (error: {e})")
+    # ✅ Configure + start everything concurrently, then confirm from one shared poll loop
+    for service, result in transition_services(services, "auto", start=True).items():
+        if result.ok:
+            enabled_services.append(service)
+        elif result.stage == "config":
+            failed_services.append(f"{service} (config failed)")
+        elif result.stage == "error":
+            failed_services.append(f"{service} (error: {result.detail})")
+        else:
+            failed_services.append(f"{service} (didn't confirm running)")
 
     return enabled_services, failed_services
 
@@ -103,31 +67,11 @@ def check_services_status():
         "XblGameSave": "Xbox Live Game Save"
     }
 
+    # ✅ One bulk snapshot answers both the `sc qc` (disabled?) and `sc query` (running?) questions
+    snapshot = get_service_snapshot()
     statuses = {}
 
     for service, service_name in services.items():
-        config_result = subprocess.run(
-            ["sc", "qc", service],
-            capture_output=True,
-            text=True,
-            startupinfo=startupinfo
-        )
-        if "DISABLED" in config_result.stdout:
-            statuses[service_name] = "Disabled"
-            continue
-
-        result = subprocess.run(
-            ["sc", "query", service],
-            capture_output=True,
-            text=True,
-            startupinfo=startupinfo
-        )
-        
-        if "RUNNING" in result.stdout:
-            statuses[service_name] = "Running"
-        elif "STOPPED" in result.stdout:
-            statuses[service_name] = "Stopped"
-        else:
-            statuses[service_name] = "Unknown"
+        statuses[service_name] = snapshot.status(service, include_config=True)
 
     return statuses
@@ -1,5 +1,8 @@
 import subprocess
-import time
+from audit_context import invalidate_probes
+from security_logs import get_autoplay_status, get_telnet_status
+from service_snapshot import get_service_snapshot, take_snapshot
+from service_transitions import transition_services
 
 # ✅ List of critical services
 CRITICAL_SERVICES = {
@@ -18,7 +21,7 @@ CRITICAL_SERVICES = {
     "Wi-Fi AutoConfig Service": "WlanSvc"
 }
 
-def get_service_status(service_name):
+def get_service_status(service_name, snapshot=None):
     try:
         if service_name == "AutoPlay":
             # Special case for AutoPlay: check registry
@@ -31,85 +34,47 @@ def get_service_status(service_name):
             else:
                 return "Running"   # AutoPlay active = Running ✅
 
-        # Normal Windows service checking
-        result = subprocess.run(
-            ["sc", "qc", service_name],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-
-        if "DISABLED" in result.stdout:
-            return "Disabled"
-
-        result = subprocess.run(
-            ["sc", "query", service_name],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-
-        if "RUNNING" in result.stdout:
-            return "Running"
-        elif "STOPPED" in result.stdout:
-            return "Stopped"
-        else:
-            return "Unknown"
+        # Normal Windows service checking (start type + state from one bulk snapshot)
+        snapshot = snapshot or take_snapshot()
+        return snapshot.status(service_name, include_config=True)
     except Exception as e:
         return f"Error: {e}"
 
 def check_all_services():
     """ ✅ Fetch all service statuses. """
+    snapshot = get_service_snapshot()
     statuses = {}
     for service, service_code in CRITICAL_SERVICES.items():
-        statuses[service] = get_service_status(service_code)
+        statuses[service] = get_service_status(service_code, snapshot)
     return statuses
 
 def start_all_services():
     """ ✅ Enable and start all stopped/disabled services. """
     started_services = []
     failed_services = []
-
-    for service_name, service_code in CRITICAL_SERVICES.items():
-        status = get_service_status(service_code)
-
-        if status in ["Stopped", "Disabled"]:
-            try:
-                # Step 1: Set to manual (or auto if you prefer)
-                config_result = subprocess.run(
-                    ["sc", "config", service_code, "start=", "demand"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
-
-                if "SUCCESS" not in config_result.stdout:
-                    failed_services.append(f"{service_name} (couldn't configure)")
-                    continue
-
-                # Step 2: Try to start
-                subprocess.run(
-                    ["sc", "start", service_code],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
-
-                # Step 3: Wait and check status
-                for _ in range(5):
-                    time.sleep(1)
-                    if get_service_status(service_code) == "Running":
-                        started_services.append(service_name)
-                        break
-                else:
-                    failed_services.append(f"{service_name} (couldn't confirm start)")
-
-            except Exception as e:
-                failed_services.append(f"{service_name} (error: {e})")
+    snapshot = take_snapshot()
+
+    # Step 1: Pick the stopped/disabled ones
+    to_start = {
+        service_code: service_name
+        for service_name, service_code in CRITICAL_SERVICES.items()
+        if get_service_status(service_code, snapshot) in ["Stopped", "Disabled"]
+    }
+
+    # Step 2 + 3: Set to manual and start them all at once, then wait for them together
+    results = transition_services(to_start, "demand", start=True)
+    invalidate_probes(get_telnet_status)  # transition_services already dropped the service probes
+
+    for service_code, result in results.items():
+        service_name = to_start[service_code]
+        if result.ok:
+            started_services.append(service_name)
+        elif result.stage == "config":
+            failed_services.append(f"{service_name} (couldn't configure)")
+        elif result.stage == "error":
+            failed_services.append(f"{service_name} (error: {result.detail})")
+        else:
+            failed_services.append(f"{service_name} (couldn't confirm start)")
 
     return started_services, failed_services
 
@@ -118,6 +83,10 @@ def disable_all_services():
     disabled_services = []
     failed_services = []
 
+    # ✅ Disable the standard Windows services concurrently
+    services = {code: name for name, code in CRITICAL_SERVICES.items() if code != "AutoPlay"}
+    results = transition_services(services, "disabled")
+
     for service_name, service_code in CRITICAL_SERVICES.items():
         try:
             if service_code == "AutoPlay":
@@ -139,22 +108,16 @@ def disable_all_services():
                     failed_services.append(service_name)
                 continue
 
-            # Disable standard Windows service
-            result = subprocess.run(
-                ["sc", "config", service_code, "start=", "disabled"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-
-            if "SUCCESS" in result.stdout:
+            # Standard Windows service (already configured above)
+            if results[service_code].ok:
                 disabled_services.append(service_name)
             else:
                 failed_services.append(service_name)
         except Exception:
             failed_services.append(service_name)
 
+    # ✅ Services and both AutoPlay values changed: drop those probes from any running audit
+    invalidate_probes(get_telnet_status, get_autoplay_status)
     return disabled_services, failed_services
 
 
@@ -0,0 +1,190 @@
+import time
+import tracemalloc
+from typing import NamedTuple
+from probe_executor import stream_command, set_backend, FakeBackend
+
+# ✅ Parse `ipconfig /displaydns` line by line as it streams in - every record type, no raw text kept
+DISPLAYDNS_COMMAND = "ipconfig /displaydns"
+
+RECORD_TYPES = {
+    "1": "A", "2": "NS", "5": "CNAME", "6": "SOA", "12": "PTR", "15": "MX",
+    "16": "TXT", "28": "AAAA", "33": "SRV", "65": "HTTPS",
+}
+
+
+class DnsCacheEntry(NamedTuple):
+    name: str
+    type: str      # "A", "AAAA", "CNAME", ... (or the numeric type when unknown)
+    ttl: int
+    data: str
+    section: str   # "Answer", "Additional", ...
+
+
+def _field(line):
+    """ "    Record Name . . . . . : www.example.com" -> ("Record Name", "www.example.com"); None for other lines. """
+    key, sep, value = line.partition(" : ")
+    if not sep:
+        if not line.rstrip().endswith(" :"):
+            return None
+        key, value = line.rstrip()[:-2], ""
+    return key.replace(" .", "").strip(" ."), value.strip()
+
+
+def iter_lines(chunks):
+    """ Lines from text chunks, carrying the unfinished tail over to the next chunk. """
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split("\n")
+        yield from lines
+    if pending:
+        yield pending
+
+
+def parse_displaydns(lines):
+    """
+    Yield a DnsCacheEntry per cached record. Fields are taken by position within each record
+    (name, type, TTL, data length, section, then the data line labelled by its type), so
+    localized ipconfig output parses the same as English. Extra data lines (SOA, MX) are ignored.
+    """
+    values = []
+    for line in lines:
+        field = _field(line)
+        if field is None:
+            values.clear()  # blank line / block title / "Name does not exist." ends a record
+            continue
+        values.append(field)
+        if len(values) == 6:
+            name, record_type, ttl, _, section, data = (value for _, value in values)
+            if record_type.isdigit():
+                yield DnsCacheEntry(name, RECORD_TYPES.get(record_type, record_type),
+                                    int(ttl) if ttl.isdigit() else 0, data, section)
+
+
+def domain_key(name):
+    return name.lower().rstrip(".")
+
+
+def unique_entries(entries):
+    """ Drop repeated (name, type, data) records - a domain reached via several CNAMEs shows up once per chain. """
+    seen = set()
+    for entry in entries:
+        key = (domain_key(entry.name), entry.type, entry.data.lower())
+        if key not in seen:
+            seen.add(key)
+            yield entry
+
+
+def group_by_domain(entries):
+    """ {domain: [entries]} in first-seen order, duplicates removed. """
+    domains = {}
+    for entry in unique_entries(entries):
+        domains.setdefault(domain_key(entry.name), []).append(entry)
+    return domains
+
+
+def read_dns_cache(timeout=None):
+    """ Unique DnsCacheEntries of the local resolver cache, parsed while ipconfig is still printing. """
+    return list(unique_entries(parse_displaydns(iter_lines(stream_command(DISPLAYDNS_COMMAND, timeout=timeout)))))
+
+
+# ✅ Recorded output (trimmed) for the benchmark below
+SAMPLE_DISPLAYDNS = """
+Windows IP Configuration
+
+    www.msftconnecttest.com
+    ----------------------------------------
+    Record Name . . . . . : www.msftconnecttest.com
+    Record Type . . . . . : 5
+    Time To Live  . . . . : 17
+    Data Length . . . . . : 8
+    Section . . . . . . . : Answer
+    CNAME Record  . . . . : www.msftncsi.com.edgesuite.net
+
+
+    Record Name . . . . . : a1961.g2.akamai.net
+    Record Type . . . . . : 1
+    Time To Live  . . . . : 17
+    Data Length . . . . . : 4
+    Section . . . . . . . : Answer
+    A (Host) Record . . . : 23.215.0.136
+
+
+    Record Name . . . . . : a1961.g2.akamai.net
+    Record Type . . . . . : 1
+    Time To Live  . . . . : 17
+    Data Length . . . . . : 4
+    Section . . . . . . . : Answer
+    A (Host) Record . . . : 23.215.0.137
+
+
+    login.live.com
+    ----------------------------------------
+    Record Name . . . . . : login.live.com
+    Record Type . . . . . : 28
+    Time To Live  . . . . : 244
+    Data Length . . . . . : 16
+    Section . . . . . . . : Answer
+    AAAA Record . . . . . : 2603:1036:3000:a0::2
+
+
+    1.0.0.10.in-addr.arpa
+    ----------------------------------------
+    Record Name . . . . . : 1.0.0.10.in-addr.arpa.
+    Record Type . . . . . : 12
+    Time To Live  . . . . : 86400
+    Data Length . . . . . : 8
+    Section . . . . . . . : Answer
+    PTR Record  . . . . . : lab-gateway.local
+
+
+    _ldap._tcp.dc._msdcs.lab.local
+    ----------------------------------------
+    Record Name . . . . . : _ldap._tcp.dc._msdcs.lab.local
+    Record Type . . . . . : 33
+    Time To Live  . . . . : 600
+    Data Length . . . . . : 8
+    Section . . . . . . . : Answer
+    SRV Record  . . . . . : dc01.lab.local
+
+
+    wpad
+    ----------------------------------------
+    Name does not exist.
+
+
+    tracker.example.invalid
+    ----------------------------------------
+    No records of type AAAA
+
+"""
+
+
+def _benchmark(copies=2000):
+    """ Entries/sec over a cache with `copies` x the recorded blocks, plus peak memory while streaming. """
+    corpus = SAMPLE_DISPLAYDNS + "".join(
+        SAMPLE_DISPLAYDNS.split("Windows IP Configuration", 1)[1].replace("login.live.com", f"host{i}.example.com")
+        for i in range(copies))
+    previous = set_backend(FakeBackend({DISPLAYDNS_COMMAND: corpus}))
+    try:
+        start = time.perf_counter()
+        records = sum(1 for _ in parse_displaydns(iter_lines(stream_command(DISPLAYDNS_COMMAND))))
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        unique = 0
+        for _ in unique_entries(parse_displaydns(iter_lines(stream_command(DISPLAYDNS_COMMAND)))):
+            unique += 1
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        set_backend(previous)
+
+    print(f"✅ Parsed {records} cache records in {elapsed:.2f}s ({records / elapsed:,.0f} records/sec)")
+    print(f"   {unique} unique after dedupe; peak {peak / 1024:,.0f} KiB for a {len(corpus) / 1024 / 1024:,.1f} MiB output")
+    for domain, entries in group_by_domain(parse_displaydns(iter_lines([SAMPLE_DISPLAYDNS]))).items():
+        print(f"   {domain}: " + ", ".join(f"{e.type} {e.data} (ttl {e.ttl}, {e.section})" for e in entries))
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,286 @@
+import json
+import os
+import threading
+from collections import deque
+from app_paths import data_path
+from event_queries import build_xpath
+from event_stream import stream_events
+
+# ✅ Remember the newest EventRecordID seen per channel so later collections only fetch what's new
+BOOKMARKS_FILE = "event_bookmarks.json"
+DEFAULT_WINDOW = 50
+
+
+class BookmarkStore:
+    """ {channel: last EventRecordID} persisted as JSON. """
+
+    def __init__(self, path=None):
+        self.path = path or data_path(BOOKMARKS_FILE)
+        self._lock = threading.Lock()
+        self._bookmarks = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {channel: int(record_id) for channel, record_id in data.items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def get(self, channel):
+        with self._lock:
+            return self._bookmarks.get(channel)
+
+    def set(self, channel, record_id):
+        with self._lock:
+            self._bookmarks[channel] = int(record_id)
+            snapshot = dict(self._bookmarks)
+        self._save(snapshot)
+
+    def reset(self, channel=None):
+        with self._lock:
+            if channel is None:
+                self._bookmarks.clear()
+            else:
+                self._bookmarks.pop(channel, None)
+            snapshot = dict(self._bookmarks)
+        self._save(snapshot)
+
+    def _save(self, bookmarks):
+        # Write to a temp file and swap it in, so a crash never leaves half a JSON file behind
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(bookmarks, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass  # bookmarks are an optimization; never fail a collection over them
+
+
+def since_bookmark(record_id, profile=None):
+    """
+    XPath for wevtutil /q: the bookmarked event and everything after it (of the profile's event IDs;
+    no time window, so the bookmarked event is found however old it is).
+    """
+    return build_xpath(profile.event_ids if profile is not None else (), after_record_id=int(record_id) - 1)
+
+
+def _drop_older(window, cutoff):
+    """ Trim a newest-first window to events at or after `cutoff` (naive UTC). """
+    if cutoff is None:
+        return
+    while window and window[-1].time_created is not None and window[-1].time_created < cutoff:
+        window.pop()
+
+
+class IncrementalCollector:
+    """
+    Keeps an in-memory window of the newest events per channel. Only events past the bookmark
+    are queried and merged in, so a refresh costs time proportional to new activity. After a
+    restart the rest of the window comes back from the event store; the whole window is read
+    from the log only the first time, or when the log was cleared.
+    """
+
+    def __init__(self, store=None, query=stream_events, sink=None):
+        self.store = store if store is not None else BookmarkStore()
+        self.query = query
+        self.sink = sink  # called with every batch of fetched records (default: the event store)
+        self.new_since_last_run = {}
+        self._windows = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _channel_lock(self, channel):
+        with self._lock:
+            return self._locks.setdefault(channel, threading.Lock())
+
+    def collect(self, channel, count=DEFAULT_WINDOW):
+        """ The newest `count` events of a channel, newest first. """
+        return self._collect(channel, channel, count, None)
+
+    def collect_profile(self, profile, count=None):
+        """
+        Events matching an event_queries.QueryProfile (event IDs and time window), newest first.
+        Each profile keeps its own window and bookmark, and events that age out of the time window
+        are dropped from it.
+        """
+        return self._collect(profile.name, profile.channel, count or profile.count, profile)
+
+    def _collect(self, key, channel, count, profile):
+        with self._channel_lock(key):
+            window = self._windows.get(key)
+            if window is None:
+                window = self._resume(key, channel, count, profile)
+            elif window.maxlen < count:
+                window = self._fetch_full(key, channel, count, profile)
+            else:
+                self._fetch_new(key, channel, window, profile)
+                window = self._windows[key]  # replaced if the log was cleared
+            if profile is not None:
+                _drop_older(window, profile.cutoff())
+            return list(window)[:count]
+
+    def _fetch_full(self, key, channel, count, profile=None):
+        previous = self.store.get(key)
+        xpath = profile.xpath() if profile is not None else None
+        window = deque(self.query(channel, count, xpath=xpath), maxlen=count)
+        self._windows[key] = window
+        self._record(window)
+
+        # How much happened since the bookmark left by an earlier run/audit
+        if previous is not None:
+            self.new_since_last_run[key] = sum(1 for r in window if r.record_id and r.record_id > previous)
+        self._update_bookmark(key, window)
+        return window
+
+    def _resume(self, key, channel, count, profile=None):
+        """ First collection in this process: events past the persisted bookmark + the stored ones before it. """
+        previous = self.store.get(key)
+        stored = self._stored(channel, count, profile, previous) if previous is not None else []
+        if not stored or stored[0].record_id != previous:
+            return self._fetch_full(key, channel, count, profile)
+        new_records = self._since_bookmark(channel, previous, count, profile)
+        if new_records is None:
+            return self._fetch_full(key, channel, count, profile)
+
+        window = deque((new_records + stored)[:count], maxlen=count)
+        self._windows[key] = window
+        self._record(new_records)
+        self.new_since_last_run[key] = len(new_records)
+        self._update_bookmark(key, window)
+        return window
+
+    def _since_bookmark(self, channel, last, count, profile=None):
+        """
+        Events after the bookmark, newest first, from one query that also returns the bookmarked event
+        itself. None when that event is gone: the log was cleared (record IDs restart) or wrapped past it.
+        """
+        records = list(self.query(channel, count, xpath=since_bookmark(last, profile)))
+        new_records = [r for r in records if r.record_id is not None and r.record_id > last]
+        if len(new_records) == len(records) and len(records) < count:
+            return None
+        return new_records
+
+    def _fetch_new(self, key, channel, window, profile=None):
+        last = window[0].record_id if window else self.store.get(key)
+        if last is None:
+            return self._fetch_full(key, channel, window.maxlen, profile)
+
+        new_records = self._since_bookmark(channel, last, window.maxlen, profile)
+        if new_records is None:
+            self._fetch_full(key, channel, window.maxlen, profile)
+            return
+        if not new_records:
+            return
+
+        window.extendleft(reversed(new_records))  # both are newest first
+        self._record(new_records)
+        self._update_bookmark(key, window)
+
+    def _record(self, records):
+        try:
+            if self.sink is not None:
+                self.sink(records)
+            else:
+                from event_store import get_store
+                get_store().add_records(records)
+        except Exception as e:
+            print(f"⚠️ Could not store events: {e}")
+
+    def _stored(self, channel, count, profile, until_record_id):
+        """ The newest `count` events up to the bookmark that earlier runs put in the event store. """
+        if self.sink is not None:
+            return []  # events went elsewhere
+        try:
+            from event_store import get_store
+            return get_store().records(channel, profile.event_ids if profile is not None else None,
+                                       until_record_id, count)
+        except Exception as e:
+            print(f"⚠️ Could not read stored events: {e}")
+            return []
+
+    def _update_bookmark(self, channel, window):
+        ids = [r.record_id for r in window if r.record_id is not None]
+        if ids:
+            self.store.set(channel, max(ids))
+
+    def forget(self, channel=None):
+        """ Drop the in-memory window(s) so the next collection reads the full window again. """
+        with self._lock:
+            if channel is None:
+                self._windows.clear()
+            else:
+                self._windows.pop(channel, None)
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+
+def get_collector():
+    """ Shared collector used by the log views and reports. """
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = IncrementalCollector()
+        return _collector
+
+
+def collect_events(channel, count=DEFAULT_WINDOW):
+    return get_collector().collect(channel, count)
+
+
+def collect_profile(profile, count=None):
+    return get_collector().collect_profile(profile, count)
+
+
+def _benchmark(size=5000):
+    """ wevtutil calls and events parsed per collection of a `size`-event log, across a restart and a clear. """
+    import re
+    import tempfile
+    import event_store
+    from event_records import EventRecord
+
+    log = []
+
+    def write(count):
+        start = log[0].record_id + 1 if log else 1
+        for record_id in range(start, start + count):
+            log.insert(0, EventRecord({"Log Name": "Security", "Event ID": "4624", "Record ID": str(record_id),
+                                       "Date": f"2025-05-14T08:{record_id // 60 % 60:02d}:{record_id % 60:02d}Z"}))
+
+    calls = []
+
+    def query(channel, count, xpath=None):
+        after = re.search(r"EventRecordID>(-?\d+)", xpath or "")
+        found = [r for r in log if not after or r.record_id > int(after.group(1))][:count]
+        calls.append(len(found))
+        return found
+
+    write(size)
+    previous_store = event_store.set_store(event_store.EventStore(":memory:"))
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            bookmarks = os.path.join(folder, BOOKMARKS_FILE)
+            collector = IncrementalCollector(BookmarkStore(bookmarks), query)
+            for label, before in (
+                ("first run", lambda: None),
+                ("refresh, nothing new", lambda: None),
+                ("refresh, 5 new events", lambda: write(5)),
+                ("restart, 3 new events", lambda: write(3)),
+                ("log cleared", lambda: (log.clear(), write(10))),
+            ):
+                before()
+                if label.startswith("restart"):
+                    collector = IncrementalCollector(BookmarkStore(bookmarks), query)
+                calls.clear()
+                window = collector.collect("Security")
+                same = [r.record_id for r in window] == [r.record_id for r in log[:DEFAULT_WINDOW]]
+                print(f"{'✅' if same else '❌'} {label:>22}: {len(calls)} wevtutil call(s), "
+                      f"{sum(calls)} events parsed, newest #{window[0].record_id}")
+    finally:
+        event_store.set_store(previous_store)
+
+
+if __name__ == "__main__":
+    _benchmark()
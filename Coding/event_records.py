@@ -0,0 +1,137 @@
+import re
+from datetime import datetime, timezone
+
+# ✅ Split each event's header up front and tokenize its description only once, on first lookup
+
+
+class EventRecord:
+    """
+    One parsed event. The header (Log Name, Source, Date, Event ID, ...) is split up front;
+    the "Key: Value" lines of the description are only tokenized the first time a field is
+    looked up, since most views never need them. Events read from XML also carry their
+    EventData/UserData values (TargetUserName, IpAddress, QueryName, ...) in `event_data`.
+    """
+
+    __slots__ = ("channel", "provider", "event_id", "record_id", "level", "timestamp", "task", "keyword",
+                 "user", "computer", "description", "header", "event_data", "_fields")
+
+    def __init__(self, header, description="", event_data=None):
+        event_id = header.get("Event ID", "")
+        record_id = header.get("Record ID", "")
+        self.header = header
+        self.event_data = event_data or {}
+        self.channel = header.get("Log Name", "")
+        self.provider = header.get("Source", "")
+        self.event_id = int(event_id) if event_id.isdigit() else None
+        self.record_id = int(record_id) if record_id.isdigit() else None
+        self.level = header.get("Level", "")
+        self.timestamp = header.get("Date", "")  # as printed by wevtutil
+        self.task = header.get("Task", "")
+        self.keyword = header.get("Keyword", "")
+        self.user = header.get("User", "")
+        self.computer = header.get("Computer", "")
+        self.description = description
+        self._fields = None
+
+    @property
+    def time_created(self):
+        return parse_timestamp(self.timestamp) if self.timestamp else None
+
+    @property
+    def local_time(self):
+        """ time_created (the event's UTC SystemTime) in this machine's time zone. """
+        created = self.time_created
+        if created is None:
+            return None
+        return (created if created.tzinfo else created.replace(tzinfo=timezone.utc)).astimezone()
+
+    def local_timestamp(self, default="Unknown"):
+        """ "2025-05-14 10:21:44" in local time, for reports and the log viewer. """
+        local = self.local_time
+        return local.strftime("%Y-%m-%d %H:%M:%S") if local else self.timestamp or default
+
+    @property
+    def fields(self):
+        """ "Key" and "Section.Key" -> value for the header, event data and description (first occurrence wins). """
+        if self._fields is None:
+            self._fields = _parse_fields({**self.header, **self.event_data}, self.description)
+        return self._fields
+
+    def get(self, key, default=None):
+        return self.fields.get(key, default)
+
+    def first(self, *keys, default="Unknown"):
+        """ Value of the first key that is present and not empty/"-". """
+        fields = self.fields
+        for key in keys:
+            value = fields.get(key)
+            if value and value != "-":
+                return value
+        return default
+
+    def __repr__(self):
+        return f"EventRecord({self.channel!r}, event_id={self.event_id}, timestamp={self.timestamp!r})"
+
+
+def parse_timestamp(value):
+    """ wevtutil dates ("2025-05-14T10:22:01.123" or with 7 fraction digits and a Z) -> datetime. """
+    value = value.strip().rstrip("Z")
+    if "." in value:
+        whole, fraction = value.split(".", 1)
+        value = f"{whole}.{fraction[:6]}"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+FIELD_LINE = re.compile(r"^([ \t]*)([^:\r\n]+):(.*)$", re.MULTILINE)
+
+
+def _parse_fields(header, description):
+    """
+    Every "Key: Value" line is split on its first colon only, so times, paths and IPv6
+    addresses stay whole. Unindented description lines ending in ":" open a section
+    ("Subject:", "New Logon:", ...) and the values below them are also stored as
+    "Section.Key", because e.g. "Account Name" appears once per section.
+    """
+    fields = dict(header)
+    section = None
+    for indent, key, value in FIELD_LINE.findall(description):
+        key = key.strip()
+        value = value.strip()
+        if not value and not indent:
+            section = key
+            continue
+        fields.setdefault(key, value)
+        if section:
+            fields.setdefault(f"{section}.{key}", value)
+    return fields
+
+
+USB_DEVICE_PATTERN = re.compile(r"USB\\VID_[^\s,;]*[^\s,;.]", re.IGNORECASE)
+ERROR_CODE_PATTERN = re.compile(r"Error Code: (\d+)")
+
+
+ACCOUNT_KEYS = ("TargetUserName", "New Logon.Account Name", "Account For Which Logon Failed.Account Name", "Account Name")
+IP_KEYS = ("IpAddress", "Source Network Address")
+
+
+def account_name(record, default="Unknown"):
+    """ The account an event is about ("Account Name" is listed per section; prefer the one logging on). """
+    return record.first(*ACCOUNT_KEYS, default=default)
+
+
+def source_ip(record, default="Unknown"):
+    return record.first(*IP_KEYS, default=default)
+
+
+def usb_device_id(record):
+    """ The USB\\VID_... instance id mentioned by a DriverFrameworks event, if any. """
+    match = USB_DEVICE_PATTERN.search(record.description) or USB_DEVICE_PATTERN.search(" ".join(record.event_data.values()))
+    return match.group(0) if match else "Unknown"
+
+
+def usb_error_code(record):
+    match = ERROR_CODE_PATTERN.search(record.description)
+    return match.group(1) if match else "None"
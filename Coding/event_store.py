@@ -0,0 +1,285 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from app_paths import data_path
+from event_records import EventRecord, account_name, source_ip
+
+# ✅ Every collected event lands in one local SQLite file, indexed for the questions audits ask
+STORE_FILE = "events.db"
+DEFAULT_MAX_AGE_DAYS = 90
+DEFAULT_MAX_EVENTS = 200_000
+COMPACT_EVERY = 5_000  # inserted rows between automatic compactions
+
+FAILED_LOGON = 4625
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    channel      TEXT NOT NULL,
+    record_id    INTEGER NOT NULL,
+    event_id     INTEGER,
+    time_created TEXT,          -- ISO 8601, UTC for events read from XML
+    provider     TEXT,
+    level        TEXT,
+    account      TEXT COLLATE NOCASE,
+    ip           TEXT,
+    computer     TEXT,
+    message      TEXT,
+    data         TEXT,          -- EventData/UserData as JSON
+    header       TEXT,          -- the EventRecord header as JSON, to hand the event back out as a record
+    PRIMARY KEY (channel, record_id)
+);
+CREATE INDEX IF NOT EXISTS events_by_time ON events (time_created);
+CREATE INDEX IF NOT EXISTS events_by_channel ON events (channel, time_created);
+CREATE INDEX IF NOT EXISTS events_by_event_id ON events (event_id, time_created);
+CREATE INDEX IF NOT EXISTS events_by_account ON events (account, time_created);
+CREATE INDEX IF NOT EXISTS events_by_ip ON events (ip, time_created);
+
+CREATE TABLE IF NOT EXISTS audit_snapshots (
+    taken_at TEXT NOT NULL,
+    kind     TEXT NOT NULL,
+    body     TEXT NOT NULL
+);
+"""
+
+
+def _iso(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(sep=" ")
+    return value
+
+
+def utc_now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _to_record(row):
+    header = json.loads(row["header"]) if row["header"] else {  # rows stored before the header column
+        "Log Name": row["channel"], "Source": row["provider"] or "", "Event ID": str(row["event_id"] or ""),
+        "Record ID": str(row["record_id"]), "Level": row["level"] or "", "Computer": row["computer"] or "",
+        "Date": row["time_created"].replace(" ", "T") + "Z" if row["time_created"] else "",
+    }
+    return EventRecord(header, row["message"] or "", json.loads(row["data"]) if row["data"] else None)
+
+
+class EventStore:
+    """
+    SQLite-backed event store. One connection shared behind a lock (WAL mode, so readers in
+    other processes are not blocked). Old events are trimmed by age and by total count.
+    """
+
+    def __init__(self, path=None, max_age_days=DEFAULT_MAX_AGE_DAYS, max_events=DEFAULT_MAX_EVENTS):
+        self.path = path or data_path(STORE_FILE)
+        self.max_age_days = max_age_days
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._inserted_since_compact = 0
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.execute("PRAGMA auto_vacuum = INCREMENTAL")  # only takes effect on a new file
+            if self.path != ":memory:":
+                self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.execute("PRAGMA synchronous = NORMAL")
+            self._db.executescript(SCHEMA)
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(events)")}
+            if "header" not in columns:  # store written by an older build
+                self._db.execute("ALTER TABLE events ADD COLUMN header TEXT")
+
+    def add_records(self, records):
+        """ Insert EventRecords (duplicates by channel + record id are ignored). Returns rows added. """
+        rows = [
+            (
+                record.channel,
+                record.record_id,
+                record.event_id,
+                _iso(record.time_created),
+                record.provider,
+                record.level,
+                account_name(record, default=None),
+                source_ip(record, default=None),
+                record.computer,
+                record.description,
+                json.dumps(record.event_data) if record.event_data else None,
+                json.dumps(record.header),
+            )
+            for record in records
+            if record.record_id is not None and record.channel
+        ]
+        if not rows:
+            return 0
+
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO events (channel, record_id, event_id, time_created, provider, level,"
+                " account, ip, computer, message, data, header) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            added = self._db.total_changes - before
+            self._inserted_since_compact += added
+            due = self._inserted_since_compact >= COMPACT_EVERY
+
+        if due:
+            self.compact()
+        return added
+
+    def add_snapshot(self, kind, body):
+        """ Keep a point-in-time status report (e.g. the security log text) next to the events. """
+        with self._lock, self._db:
+            self._db.execute("INSERT INTO audit_snapshots (taken_at, kind, body) VALUES (?, ?, ?)",
+                             (_iso(utc_now()), kind, body))
+
+    def query(self, channel=None, event_ids=None, account=None, ip=None, since=None, until=None,
+              limit=None, newest_first=True):
+        """ Events matching every given filter, as dicts. `since`/`until` are datetimes or ISO strings (UTC). """
+        clauses, params = [], []
+        if channel is not None:
+            clauses.append("channel = ?")
+            params.append(channel)
+        if event_ids is not None:
+            event_ids = [event_ids] if isinstance(event_ids, int) else list(event_ids)
+            clauses.append(f"event_id IN ({', '.join('?' * len(event_ids))})")
+            params.extend(event_ids)
+        if account is not None:
+            clauses.append("account = ?")
+            params.append(account)
+        if ip is not None:
+            clauses.append("ip = ?")
+            params.append(ip)
+        if since is not None:
+            clauses.append("time_created >= ?")
+            params.append(_iso(since))
+        if until is not None:
+            clauses.append("time_created < ?")
+            params.append(_iso(until))
+
+        sql = "SELECT * FROM events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY time_created {'DESC' if newest_first else 'ASC'}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params)]
+
+    def records(self, channel, event_ids=None, until_record_id=None, limit=None):
+        """ EventRecords of one channel, newest (highest record id) first, up to `until_record_id`. """
+        clauses, params = ["channel = ?"], [channel]
+        if event_ids:
+            clauses.append(f"event_id IN ({', '.join('?' * len(event_ids))})")
+            params.extend(event_ids)
+        if until_record_id is not None:
+            clauses.append("record_id <= ?")
+            params.append(until_record_id)
+        sql = f"SELECT * FROM events WHERE {' AND '.join(clauses)} ORDER BY record_id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [_to_record(row) for row in rows]
+
+    def failed_logons(self, account=None, days=7, limit=None):
+        """ Failed logons (4625), optionally for one account, over the last `days` days. """
+        since = utc_now() - timedelta(days=days)
+        return self.query(channel="Security", event_ids=FAILED_LOGON, account=account, since=since, limit=limit)
+
+    def count(self, channel=None):
+        with self._lock:
+            if channel is None:
+                return self._db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM events WHERE channel = ?", (channel,)).fetchone()[0]
+
+    def compact(self):
+        """ Apply retention (age, then total count) and hand freed pages back to the file system. """
+        with self._lock, self._db:
+            removed = 0
+            if self.max_age_days:
+                cutoff = _iso(utc_now() - timedelta(days=self.max_age_days))
+                removed += self._db.execute("DELETE FROM events WHERE time_created < ?", (cutoff,)).rowcount
+                self._db.execute("DELETE FROM audit_snapshots WHERE taken_at < ?", (cutoff,))
+            if self.max_events:
+                removed += self._db.execute(
+                    "DELETE FROM events WHERE rowid IN ("
+                    " SELECT rowid FROM events ORDER BY time_created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_events,),
+                ).rowcount
+            self._inserted_since_compact = 0
+
+        with self._lock:
+            self._db.execute("PRAGMA incremental_vacuum")
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """ Shared store, opened on first use. """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EventStore()
+        return _store
+
+
+def set_store(store):
+    """ Replace the shared store (e.g. with EventStore(":memory:")) and return the previous one. """
+    global _store
+    with _store_lock:
+        previous, _store = _store, store
+    return previous
+
+
+def _benchmark(count=100_000):
+    """ Fill an in-memory store with synthetic logon events and time the typical questions. """
+    from event_records import EventRecord
+
+    store = EventStore(":memory:", max_events=None)
+    accounts = ["administrator", "student", "lab-admin", "guest", "backup"]
+    now = utc_now()
+    records = []
+    for i in range(count):
+        failed = i % 3 == 0
+        header = {
+            "Log Name": "Security",
+            "Source": "Microsoft-Windows-Security-Auditing",
+            "Event ID": "4625" if failed else "4624",
+            "Record ID": str(i + 1),
+            "Date": (now - timedelta(minutes=i)).isoformat() + "Z",
+        }
+        records.append(EventRecord(header, "", {"TargetUserName": accounts[i % len(accounts)],
+                                                "IpAddress": f"10.0.{i % 7}.{i % 250}"}))
+
+    start = time.perf_counter()
+    store.add_records(records)
+    print(f"✅ Inserted {store.count()} events in {time.perf_counter() - start:.2f}s")
+
+    for label, run in (
+        ("failed logons for 'administrator', last 7 days", lambda: store.failed_logons("administrator", days=7)),
+        ("all events from 10.0.3.3", lambda: store.query(ip="10.0.3.3")),
+        ("latest 50 Security events", lambda: store.query(channel="Security", limit=50)),
+    ):
+        start = time.perf_counter()
+        rows = run()
+        print(f"   {label}: {len(rows)} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    store.max_age_days = 30
+    start = time.perf_counter()
+    removed = store.compact()
+    print(f"   compaction to 30 days removed {removed} rows in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,153 @@
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from probe_executor import stream_command, set_backend, FakeBackend
+from event_records import EventRecord
+
+# ✅ Read `wevtutil qe ... /f:RenderedXml` straight off the pipe and hand out events one at a time,
+# so a 10k-event query never sits in memory as one string
+EVENT_NS = "{http://schemas.microsoft.com/win/2004/08/events/event}"
+END_TAG = "</Event>"
+LEVEL_NAMES = {"0": "Information", "1": "Critical", "2": "Error", "3": "Warning", "4": "Information", "5": "Verbose"}
+
+
+def build_query(channel, count=None, newest_first=True, xpath=None):
+    """ The wevtutil command line for a channel query (RenderedXml includes the formatted message). """
+    command = f'wevtutil qe "{channel}" /f:RenderedXml'
+    if count:
+        command += f" /c:{int(count)}"
+    if newest_first:
+        command += " /rd:true"
+    if xpath:
+        command += f' /q:"{xpath}"'
+    return command
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _leaf_values(element):
+    """ Name -> text for EventData <Data Name=...> items, or the leaf elements of a UserData block. """
+    values = {}
+    for index, item in enumerate(element.iter()):
+        if item is element or len(item):
+            continue
+        name = item.get("Name") or _local(item.tag)
+        if name == "Data":
+            name = f"Data{index}"
+        values.setdefault(name, (item.text or "").strip())
+    return values
+
+
+def event_from_element(event):
+    """ Convert one <Event> element into an EventRecord with the same header keys as /f:text. """
+    system = event.find(EVENT_NS + "System")
+    rendering = event.find(EVENT_NS + "RenderingInfo")
+    header = {}
+
+    if system is not None:
+        provider = system.find(EVENT_NS + "Provider")
+        time_created = system.find(EVENT_NS + "TimeCreated")
+        security = system.find(EVENT_NS + "Security")
+        level = system.findtext(EVENT_NS + "Level", "")
+        header = {
+            "Log Name": system.findtext(EVENT_NS + "Channel", ""),
+            "Source": provider.get("Name", "") if provider is not None else "",
+            "Date": time_created.get("SystemTime", "") if time_created is not None else "",
+            "Event ID": (system.findtext(EVENT_NS + "EventID") or "").strip(),
+            "Record ID": (system.findtext(EVENT_NS + "EventRecordID") or "").strip(),
+            "Level": LEVEL_NAMES.get(level, level),
+            "Task": system.findtext(EVENT_NS + "Task", ""),
+            "Keyword": system.findtext(EVENT_NS + "Keywords", ""),
+            "User": security.get("UserID", "N/A") if security is not None else "N/A",
+            "Computer": system.findtext(EVENT_NS + "Computer", ""),
+        }
+
+    description = ""
+    if rendering is not None:
+        # Prefer the rendered (localized) names over the numeric System values
+        description = (rendering.findtext(EVENT_NS + "Message") or "").strip()
+        for key, tag in (("Level", "Level"), ("Task", "Task")):
+            text = rendering.findtext(EVENT_NS + tag)
+            if text:
+                header[key] = text
+        keywords = [k.text for k in rendering.iter(EVENT_NS + "Keyword") if k.text]
+        if keywords:
+            header["Keyword"] = ",".join(keywords)
+
+    event_data = {}
+    for block in ("EventData", "UserData"):
+        element = event.find(EVENT_NS + block)
+        if element is not None:
+            event_data.update(_leaf_values(element))
+
+    return EventRecord(header, description, event_data)
+
+
+def iter_xml_events(chunks):
+    """
+    Incrementally parse an iterable of XML text chunks and yield an EventRecord as soon as each
+    </Event> arrives. wevtutil prints bare <Event> elements back to back (no root), so the text is
+    cut at the end tags - a literal "</Event>" can't occur inside an event, markup in messages is
+    escaped - and each event is parsed on its own by the C parser. Only the unfinished tail of
+    the stream is ever buffered.
+    """
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        if END_TAG not in chunk and END_TAG not in pending[-len(chunk) - len(END_TAG):]:
+            continue
+        *complete, pending = pending.split(END_TAG)
+        for text in complete:
+            yield event_from_element(ET.fromstring(text + END_TAG))
+
+    if pending.strip():
+        raise ET.ParseError(f"Truncated event at end of stream ({len(pending)} characters)")
+
+
+def stream_events(channel, count=None, newest_first=True, xpath=None, timeout=None):
+    """ Yield EventRecords for a channel while wevtutil is still producing them. """
+    yield from iter_xml_events(stream_command(build_query(channel, count, newest_first, xpath), timeout=timeout))
+
+
+SAMPLE_EVENT_XML = """<Event xmlns='http://schemas.microsoft.com/win/2004/08/events/event'><System><Provider Name='Microsoft-Windows-Security-Auditing' Guid='{54849625-5478-4994-a5ba-3e3b0328c30d}'/><EventID>4625</EventID><Version>0</Version><Level>0</Level><Task>12544</Task><Opcode>0</Opcode><Keywords>0x8010000000000000</Keywords><TimeCreated SystemTime='2025-05-14T08:21:44.8703315Z'/><EventRecordID>{record_id}</EventRecordID><Correlation/><Execution ProcessID='712' ThreadID='5408'/><Channel>Security</Channel><Computer>LAB-PC-07</Computer><Security/></System><EventData><Data Name='SubjectUserSid'>S-1-0-0</Data><Data Name='SubjectUserName'>-</Data><Data Name='TargetUserName'>administrator</Data><Data Name='TargetDomainName'></Data><Data Name='Status'>0xc000006d</Data><Data Name='FailureReason'>%%2313</Data><Data Name='SubStatus'>0xc000006a</Data><Data Name='LogonType'>3</Data><Data Name='WorkstationName'>-</Data><Data Name='IpAddress'>10.0.4.21</Data><Data Name='IpPort'>51234</Data></EventData><RenderingInfo Culture='en-US'><Message>An account failed to log on.
+
+Subject:
+	Security ID:		S-1-0-0
+	Account Name:		-
+
+Account For Which Logon Failed:
+	Account Name:		administrator
+
+Network Information:
+	Source Network Address:	10.0.4.21
+	Source Port:		51234</Message><Level>Information</Level><Task>Logon</Task><Opcode>Info</Opcode><Channel>Security</Channel><Provider>Microsoft Windows security auditing.</Provider><Keywords><Keyword>Audit Failure</Keyword></Keywords></RenderingInfo></Event>"""
+
+
+def _benchmark(count=20000):
+    """ Stream `count` recorded events through a fake pipe and report events/sec and peak memory. """
+    corpus = "\n".join(SAMPLE_EVENT_XML.replace("{record_id}", str(i)) for i in range(count))
+    command = build_query("Security", count)
+    previous = set_backend(FakeBackend({command: corpus}))
+    try:
+        start = time.perf_counter()
+        seen = sum(1 for _ in stream_events("Security", count))
+        elapsed = time.perf_counter() - start
+
+        # Second pass under tracemalloc (slower) just for the memory high-water mark
+        tracemalloc.start()
+        for record in stream_events("Security", count):
+            last = record
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        set_backend(previous)
+
+    print(f"✅ Streamed {seen} events in {elapsed:.2f}s ({seen / elapsed:,.0f} events/sec)")
+    print(f"   peak {peak / 1024:,.0f} KiB of Python memory for a {len(corpus) / 1024 / 1024:,.1f} MiB stream")
+    print(f"   last: #{last.record_id} {last.event_id} {last.get('TargetUserName')} from {last.get('IpAddress')}")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -3,6 +3,7 @@ from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 import datetime
 import logs_analysis
+import log_collection
 
 def export_logs_to_pdf():
     filename = f"logs_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -22,13 +23,14 @@ def export_logs_to_pdf():
     text = c.beginText(margin_left, margin_top)
     text.setFont("Courier", 10)
 
-    # Gather logs
+    # Gather logs (all channels fetched concurrently; entries are formatted only as they are drawn)
+    logs = log_collection.collect_logs()
     log_sections = {
-        "🔌 USB Logs": logs_analysis.get_usb_logs(),
-        "🔐 Security Logs": logs_analysis.get_security_logs(),
-        "⚙️ System Logs": logs_analysis.get_system_logs(),
-        "🧠 Application Logs": logs_analysis.get_application_logs(),
-        "🌐 DNS Logs": logs_analysis.get_dns_logs()
+        "🔌 USB Logs": channel_lines("usb", logs["usb"]),
+        "🔐 Security Logs": channel_lines("security", logs["security"]),
+        "⚙️ System Logs": channel_lines("system", logs["system"]),
+        "🧠 Application Logs": channel_lines("application", logs["application"]),
+        "🌐 DNS Logs": channel_lines("dns", logs["dns"])
     }
 
     page_num = 1
@@ -40,7 +42,7 @@ def export_logs_to_pdf():
         text.setFont("Courier", 10)
         text.textLine("")
 
-        for line in content.splitlines():
+        for line in content:
             if text.getY() < 80:
                 c.drawText(text)
                 draw_footer(c, page_num)
@@ -69,6 +71,25 @@ def export_logs_to_pdf():
     c.save()
     return filename
 
+def section_lines(entries, empty_message):
+    """Lines of a log section, pulled from the entry iterator only as they are drawn."""
+    empty = True
+    for entry in entries:
+        if not empty:
+            yield ""
+        empty = False
+        yield from entry.splitlines()
+    if empty:
+        yield empty_message
+
+def channel_lines(name, logs):
+    """Lines of one collected channel (a log_collection.ChannelLogs)."""
+    if logs.error or logs.dns_cache is not None:
+        yield from logs_analysis.format_channel_logs(name, logs).splitlines()
+    else:
+        formatter = logs_analysis.FORMATTERS[name]
+        yield from section_lines((formatter(record) for record in logs.records), logs_analysis.EMPTY_MESSAGES[name])
+
 def draw_footer(c, page_num):
     """Draw footer with page number."""
     width, height = A4
@@ -1,21 +1,14 @@
 import os
 import sys
-import subprocess
 import tkinter as tk
-from PIL import Image, ImageTk  # Import Pillow for resizing images
-import disable_services_gui
 from tkinter import messagebox
-import automate_rdp_services
-import password_policy
-import cache_manager
-import automate_default_share
-import logs_analysis
-import export_logs_to_pdf
+import gui_tasks
 import threading
-import pdf_generator4
-import removable_device_control 
-import time_sync
 import random
+from datetime import datetime
+
+# ✅ Page modules (probes, reportlab, the log pipeline) are imported inside the functions that use
+# them, so the window appears before any of them load. `python import_times.py` tracks what's left.
 
 class ToolTip:
     def __init__(self, widget, text):
@@ -81,13 +74,45 @@ root = tk.Tk()
 root.geometry('1100x770')
 root.title('Cyber Security Audit Application')
 
-def show_automate_services(parent_frame):
-    """ ✅ Display service statuses in the GUI """
-    for widget in parent_frame.winfo_children():
-        widget.destroy()
-
-    service_statuses = disable_services_gui.check_all_services()
+# ✅ Page data loads run in the background; delete_pages() cancels the ones still pending
+tasks = gui_tasks.TaskRunner(root)
+
+def probe_services():
+    import disable_services_gui
+    return disable_services_gui.check_all_services()
+
+def probe_rdp_services():
+    import automate_rdp_services
+    return automate_rdp_services.check_services_status()
+
+def probe_password_policy():
+    import password_policy
+    return password_policy.get_current_policy()
+
+def probe_default_share():
+    import automate_default_share
+    return automate_default_share.get_admin_share_status()
+
+def probe_removable_devices():
+    import removable_device_control
+    return removable_device_control.get_usb_status(), removable_device_control.get_cd_status()
+
+def probe_time_sync():
+    import time_sync
+    return time_sync.get_time_service_status()
+
+# ✅ Probes behind each page, in the order users usually visit them (sidebar order); prefetched at startup
+PAGE_PROBES = {
+    "services": probe_services,
+    "rdp": probe_rdp_services,
+    "password_policy": probe_password_policy,
+    "default_share": probe_default_share,
+    "removable_devices": probe_removable_devices,
+    "time_sync": probe_time_sync,
+}
 
+def render_service_statuses(parent_frame, service_statuses, enable_command, disable_command):
+    """ ✅ Service name / status rows with ENABLE and DISABLE buttons """
     # 🔹 Header
     header_font = ("Arial", 12, "bold")
     tk.Label(parent_frame, text="Service Name", font=header_font, bg="white").grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
@@ -106,17 +131,25 @@ def show_automate_services(parent_frame):
     button_row = row_start + len(service_statuses) + 1
 
     tk.Button(parent_frame, text="ENABLE", font=button_font, width=button_width,
-            bg="green", fg="white", activebackground="#0f8c0f", command=start_automate_services).grid(
+            bg="green", fg="white", activebackground="#0f8c0f", command=enable_command).grid(
         row=button_row, column=0, padx=10, pady=15
     )
 
     tk.Button(parent_frame, text="DISABLE", font=button_font, width=button_width,
-            bg="red", fg="white", activebackground="#cc0000", command=disable_automate_services).grid(
+            bg="red", fg="white", activebackground="#cc0000", command=disable_command).grid(
         row=button_row, column=1, padx=10, pady=15
     )
 
+def show_automate_services(parent_frame, refresh=False):
+    """ ✅ Display service statuses in the GUI """
+    tasks.load(parent_frame, PAGE_PROBES["services"],
+               lambda service_statuses: render_service_statuses(parent_frame, service_statuses,
+                                                                start_automate_services, disable_automate_services),
+               key="services", refresh=refresh)
+
 def start_automate_services():
     """ ✅ Start all stopped services """
+    import disable_services_gui
     started_services, failed_services = disable_services_gui.start_all_services()
 
     if started_services:
@@ -124,10 +157,11 @@ def start_automate_services():
     if failed_services:
         messagebox.showwarning("Failed to Start", f"Could not start:\n" + "\n".join(failed_services))
 
-    show_automate_services(automateservices_inner_frame)
+    show_automate_services(automateservices_inner_frame, refresh=True)
 
 def disable_automate_services():
     """ ✅ Disable all critical services """
+    import disable_services_gui
     disabled_services, failed_services = disable_services_gui.disable_all_services()
 
     if disabled_services:
@@ -135,7 +169,7 @@ def disable_automate_services():
     if failed_services:
         messagebox.showwarning("Failed to Disable", f"Could not disable:\n" + "\n".join(failed_services))
 
-    show_automate_services(automateservices_inner_frame)
+    show_automate_services(automateservices_inner_frame, refresh=True)
 
 def automateservices_page():
     delete_pages()
@@ -153,42 +187,16 @@ def automateservices_page():
 
     show_automate_services(automateservices_inner_frame)
 
-def show_rdp_services(parent_frame):
+def show_rdp_services(parent_frame, refresh=False):
     """ ✅ Display RDP & Remote Services statuses in the GUI """
-    for widget in parent_frame.winfo_children():
-        widget.destroy()  # ✅ Clear old widgets
-
-    service_statuses = automate_rdp_services.check_services_status()  # ✅ Fetch service statuses
-
-    # 🔹 Title row
-    header_font = ("Arial", 12, "bold")
-    tk.Label(parent_frame, text="Service Name", font=header_font, bg="white").grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
-    tk.Label(parent_frame, text="Status", font=header_font, bg="white").grid(row=0, column=1, padx=10, pady=(10, 5))
-
-    # 🔹 Services list
-    row_start = 1
-    for i, (service, status) in enumerate(service_statuses.items()):
-        tk.Label(parent_frame, text=service, font=("Arial", 12), bg="white", anchor="w").grid(row=row_start + i, column=0, sticky="w", padx=10, pady=4)
-        tk.Label(parent_frame, text=status, font=("Arial", 12), fg="green" if status == "Running" else "red", bg="white").grid(row=row_start + i, column=1, padx=10, pady=4)
-
-    # 🔹 Buttons
-    button_font = ("Bold", 14)
-    button_width = 20
-
-    button_row = row_start + len(service_statuses) + 1
-
-    tk.Button(parent_frame, text="ENABLE", font=button_font, width=button_width,
-            bg="green", fg="white", activebackground="#0f8c0f", command=enable_rdp_services).grid(
-        row=button_row, column=0, padx=10, pady=15
-    )
-
-    tk.Button(parent_frame, text="DISABLE", font=button_font, width=button_width,
-            bg="red", fg="white", activebackground="#cc0000", command=disable_rdp_services).grid(
-        row=button_row, column=1, padx=10, pady=15
-    )
+    tasks.load(parent_frame, PAGE_PROBES["rdp"],  # ✅ Fetch service statuses
+               lambda service_statuses: render_service_statuses(parent_frame, service_statuses,
+                                                                enable_rdp_services, disable_rdp_services),
+               key="rdp", refresh=refresh)
 
 def enable_rdp_services():
     """ ✅ Enable all RDP & Remote Services """
+    import automate_rdp_services
     enabled_services, failed_services = automate_rdp_services.enable_services()
 
     if enabled_services:
@@ -196,10 +204,11 @@ def enable_rdp_services():
     if failed_services:
         messagebox.showwarning("Failed to Enable", f"Could not enable:\n" + "\n".join(failed_services))
 
-    show_rdp_services(rdp_inner_frame)  # ✅ Refresh the GUI
+    show_rdp_services(rdp_inner_frame, refresh=True)  # ✅ Refresh the GUI
 
 def disable_rdp_services():
     """ ✅ Disable all RDP & Remote Services """
+    import automate_rdp_services
     disabled_services, failed_services = automate_rdp_services.disable_services()
 
     if disabled_services:
@@ -207,7 +216,7 @@ def disable_rdp_services():
     if failed_services:
         messagebox.showwarning("Failed to Disable", f"Could not disable:\n" + "\n".join(failed_services))
 
-    show_rdp_services(rdp_inner_frame)  # ✅ Refresh the GUI
+    show_rdp_services(rdp_inner_frame, refresh=True)  # ✅ Refresh the GUI
 
 def rdp_services_page():
     """ ✅ Show the RDP & Remote Services page """
@@ -237,7 +246,7 @@ tooltips = {
     "Computer role": "Indicates whether this machine is a workstation or server."
 }
 
-def show_password_policy():
+def show_password_policy(refresh=False):
     """ ✅ Display the current password and lockout policy in the GUI """
     delete_pages()
 
@@ -271,41 +280,41 @@ def show_password_policy():
     canvas.pack(side="left", fill="both", expand=True, padx=10, pady=10)
     scrollbar.pack(side="right", fill="y")
 
-    # 🔹 Fetch current policy
-    policy_dict = password_policy.get_current_policy()
-
-    # 🔹 Display policy sections
-    for section_name, policies in policy_dict.items():
-        section_label = tk.Label(
-            scrollable_frame,
-            text=section_name,
-            font=("Segoe UI", 16, "bold"),
-            bg="white",
-            fg="#0078D7",
-            anchor="w"
-        )
-        section_label.pack(fill="x", pady=(15, 5), padx=5)
+    # 🔹 Display policy sections once the current policy has been read
+    def render_policy(policy_dict):
+        for section_name, policies in policy_dict.items():
+            section_label = tk.Label(
+                scrollable_frame,
+                text=section_name,
+                font=("Segoe UI", 16, "bold"),
+                bg="white",
+                fg="#0078D7",
+                anchor="w"
+            )
+            section_label.pack(fill="x", pady=(15, 5), padx=5)
 
-        for key, value in policies.items():
-            row = tk.Frame(scrollable_frame, bg="white")
-            row.pack(fill="x", pady=3, padx=5, anchor="w")
+            for key, value in policies.items():
+                row = tk.Frame(scrollable_frame, bg="white")
+                row.pack(fill="x", pady=3, padx=5, anchor="w")
 
-            key_label = tk.Label(
-                row, text=f"{key}:", font=("Segoe UI", 11, "bold"),
-                bg="white", fg="#2c3e50", anchor="w", width=35
-            )
-            key_label.pack(side="left", padx=(5, 10))
+                key_label = tk.Label(
+                    row, text=f"{key}:", font=("Segoe UI", 11, "bold"),
+                    bg="white", fg="#2c3e50", anchor="w", width=35
+                )
+                key_label.pack(side="left", padx=(5, 10))
 
-            value_label = tk.Label(
-                row, text=value, font=("Segoe UI", 11),
-                bg="white", fg="#34495e", anchor="w"
-            )
-            value_label.pack(side="left")
+                value_label = tk.Label(
+                    row, text=value, font=("Segoe UI", 11),
+                    bg="white", fg="#34495e", anchor="w"
+                )
+                value_label.pack(side="left")
 
-            # 🧠 Attach tooltip if available
-            if key in tooltips:
-                ToolTip(key_label, tooltips[key])
-                ToolTip(value_label, tooltips[key])
+                # 🧠 Attach tooltip if available
+                if key in tooltips:
+                    ToolTip(key_label, tooltips[key])
+                    ToolTip(value_label, tooltips[key])
+
+    tasks.load(scrollable_frame, PAGE_PROBES["password_policy"], render_policy, key="password_policy", refresh=refresh)
 
     # 🔹 Apply Button
     tk.Button(
@@ -326,15 +335,17 @@ def apply_password_policy():
     confirm = messagebox.askyesno("Confirm Policy Change", "Are you sure you want to apply the new password policy?")
     
     if confirm:  # Only proceed if the user clicks "Yes"
+        import password_policy
         result_password = password_policy.set_password_policy()
         result_lockout = password_policy.set_lockout_policy()
         messagebox.showinfo("Password and Lockout Policy Updated", f"{result_password}\n{result_lockout}")
 
 
         # ✅ Refresh to show the updated policy
-        show_password_policy()
+        show_password_policy(refresh=True)
 
 def show_cache_manager():
+    import cache_manager
     delete_pages()
 
     global cache_manager_frame
@@ -413,6 +424,7 @@ def show_cache_manager():
 
 def default_share_page():
     """ ✅ Show the Default Admin Share and Shared Folder controls """
+    import automate_default_share
     delete_pages()
 
     global default_share_frame
@@ -438,8 +450,14 @@ def default_share_page():
     tk.Label(admin_card, text="⚠ Restart required to apply changes", font=("Arial", 9),
              fg="gray", bg="white").pack(pady=(5, 10))
 
-    def update_ui():
-        is_disabled = automate_default_share.get_admin_share_status()
+    def update_ui(refresh=False):
+        status_label.config(text=gui_tasks.LOADING_TEXT, fg="gray")
+        toggle_button.config(state="disabled")
+        tasks.show(PAGE_PROBES["default_share"], show_status, key="default_share", refresh=refresh, owner=admin_card,
+                   on_error=show_error)
+
+    def show_status(is_disabled):
+        toggle_button.config(state="normal", command=toggle_share)
         if is_disabled:
             status_label.config(text="❌ Default Admin Shares are Disabled", fg="red")
             toggle_button.config(text="Enable Default Shares", bg="#2c3e50")
@@ -447,10 +465,14 @@ def default_share_page():
             status_label.config(text="✅ Default Admin Shares are Enabled", fg="green")
             toggle_button.config(text="Disable Default Shares", bg="#cc0000")
 
+    def show_error(error):
+        status_label.config(text=f"⚠️ Could not read the share status: {error}", fg="red")
+        toggle_button.config(state="normal", text="🔄 Retry", bg="#2c3e50", command=lambda: update_ui(refresh=True))
+
     def toggle_share():
         current_status = automate_default_share.get_admin_share_status()
         message = automate_default_share.set_admin_share_status(disable=not current_status)
-        update_ui()
+        update_ui(refresh=True)
         if "successfully" in message.lower():
             messagebox.showinfo("Success", message + "\nPlease restart your PC to take full effect.")
         else:
@@ -482,6 +504,7 @@ def default_share_page():
             messagebox.showinfo("Remove Shared Folders", result)
 
 def removable_devices_page():
+    import removable_device_control
     delete_pages()
 
     global removable_devices_frame
@@ -536,10 +559,14 @@ def removable_devices_page():
              font=("Arial", 9), fg="gray", bg="white").pack(pady=(15, 10))
 
     # 🔄 Status Update Function
-    def update_status():
-        usb = removable_device_control.get_usb_status()
-        cd = removable_device_control.get_cd_status()
-
+    def update_status(refresh=False):
+        for label in (status_usb, status_cd):
+            label.config(text=gui_tasks.LOADING_TEXT, fg="gray")
+        tasks.show(PAGE_PROBES["removable_devices"], show_status, key="removable_devices", refresh=refresh, owner=card,
+                   on_error=show_error)
+
+    def show_status(statuses):
+        usb, cd = statuses
         status_usb.config(
             text="✅ Enabled" if usb else "❌ Disabled" if usb is not None else "❓ Unknown",
             fg="green" if usb else "red" if usb is not None else "gray"
@@ -549,6 +576,10 @@ def removable_devices_page():
             fg="green" if cd else "red" if cd is not None else "gray"
         )
 
+    def show_error(error):
+        for label in (status_usb, status_cd):
+            label.config(text=f"⚠️ Could not read status: {error}", fg="red")
+
     def toggle_device(device_type):
         if device_type == 'usb':
             # ✅ Read raw registry value directly
@@ -586,11 +617,12 @@ def removable_devices_page():
 
         messagebox.showinfo("Device Access", msg + "\n\n⚠️ A system restart is required for the changes to fully apply.")
 
-        update_status()
+        update_status(refresh=True)
 
     update_status()
     
 def time_sync_page():
+    import time_sync
     delete_pages()
 
     global time_sync_frame
@@ -628,8 +660,12 @@ def time_sync_page():
     )
     status_label.pack(pady=(0, 15))
 
-    def update_status():
-        status = time_sync.get_time_service_status()
+    def update_status(refresh=False):
+        status_label.config(text=gui_tasks.LOADING_TEXT, fg="gray")
+        tasks.show(PAGE_PROBES["time_sync"], show_status, key="time_sync", refresh=refresh, owner=card,
+                   on_error=show_error)
+
+    def show_status(status):
         status_text = {
             "RUNNING": "✅ RUNNING",
             "STOPPED": "❌ STOPPED",
@@ -640,11 +676,14 @@ def time_sync_page():
             fg="green" if status == 'RUNNING' else "red" if status == 'STOPPED' else "gray"
         )
 
+    def show_error(error):
+        status_label.config(text=f"⚠️ Could not read status: {error}", fg="red")
+
     def enable_time_sync():
         msg1 = time_sync.set_time_service_automatic()
         msg2 = time_sync.set_time_server()
         messagebox.showinfo("Time Sync Status", f"{msg1}\n{msg2}")
-        update_status()
+        update_status(refresh=True)
 
     # Button with enhanced visuals
     sync_button = tk.Button(
@@ -675,7 +714,18 @@ def time_sync_page():
 
     update_status()
 
+LOG_TITLES = {
+    "usb": "🔌 USB",
+    "security": "🔐 Security",
+    "system": "🖥️ System",
+    "application": "📦 Application",
+    "dns": "🌐 DNS",
+}
+
 def show_logs_page():
+    import logs_analysis
+    import log_tail
+    import log_view
     delete_pages()
 
     global logs_frame
@@ -686,28 +736,102 @@ def show_logs_page():
     tk.Label(logs_frame, text="📝 System Logs Viewer", font=("Segoe UI", 24, "bold"),
              bg="#f9f9f9", fg="#2c3e50").pack(pady=(0, 15))
 
+    # 🔹 Toolbar: channel filter, pause/resume, status
+    toolbar = tk.Frame(logs_frame, bg="#f9f9f9")
+    toolbar.pack(fill="x", pady=(0, 10))
+
+    channel_vars = {name: tk.BooleanVar(value=True) for name in LOG_TITLES}
+    for name, title in LOG_TITLES.items():
+        tk.Checkbutton(toolbar, text=title, variable=channel_vars[name], bg="#f9f9f9",
+                       font=("Segoe UI", 10), command=lambda: apply_filter()).pack(side=tk.LEFT, padx=(0, 8))
+
+    pause_btn = tk.Button(toolbar, text="⏸ Pause", font=("Segoe UI", 10, "bold"), width=10,
+                          bg="#6c757d", fg="white", relief="flat", command=lambda: toggle_pause())
+    pause_btn.pack(side=tk.RIGHT)
+
+    status_label = tk.Label(toolbar, text="⏳ Loading logs...", font=("Segoe UI", 10), bg="#f9f9f9", fg="gray")
+    status_label.pack(side=tk.RIGHT, padx=10)
+
     # 🔹 Card-like container
     card = tk.Frame(logs_frame, bg="white", bd=2, relief="ridge")
     card.pack(fill="both", expand=True)
 
-    # 🔹 Scrollable Text Area
-    text_scroll = tk.Scrollbar(card)
-    text_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-
-    log_text = tk.Text(card, wrap="word", font=("Consolas", 10),
-                       yscrollcommand=text_scroll.set, bg="white", padx=10, pady=10)
-    log_text.pack(side=tk.LEFT, fill="both", expand=True)
+    # 🔹 Virtualized event list: only the visible rows are drawn, details are formatted on click
+    def describe(name, record):
+        return f"{LOG_TITLES[name]} ─ " + logs_analysis.FORMATTERS[name](record)
+
+    log_list = log_view.VirtualLogList(card, describe, bg="white", padx=10, pady=10)
+    log_list.pack(fill="both", expand=True)
+
+    # 🔹 Per-channel notices (empty channel, collection error) and the DNS resolver cache fallback
+    notices = {}
+    notice_label = tk.Label(card, font=("Segoe UI", 10), bg="white", fg="#6c757d", justify="left", anchor="w")
+    dns_frame = tk.Frame(card, bg="white")
+    tk.Label(dns_frame, text="🌐 DNS Cache (the DNS-Client log is disabled)", font=("Segoe UI", 10, "bold"),
+             bg="white", fg="#2c3e50", anchor="w").pack(fill="x")
+    dns_text = tk.Text(dns_frame, height=10, wrap="word", font=("Consolas", 10), bg="white", relief="flat",
+                       state="disabled")
+    dns_text.pack(fill="x")
+
+    def render_notices():
+        shown = [name for name in LOG_TITLES if name in notices and channel_vars[name].get()]
+        if shown:
+            notice_label.config(text="\n".join(f"{LOG_TITLES[name]}: {notices[name]}" for name in shown))
+            notice_label.pack(fill="x", padx=10, pady=(10, 0), before=log_list)
+        else:
+            notice_label.pack_forget()
+        if channel_vars["dns"].get() and "dns" in tail.dns_cache:
+            dns_frame.pack(side=tk.BOTTOM, fill="x", padx=10, pady=(0, 10), before=log_list)
+        else:
+            dns_frame.pack_forget()
 
-    text_scroll.config(command=log_text.yview)
+    def show_dns_cache(entries):
+        dns_text.config(state="normal")
+        dns_text.delete("1.0", tk.END)
+        dns_text.insert(tk.END, logs_analysis.format_dns_cache(entries))
+        dns_text.config(state="disabled")
 
-    # 🔹 Load logs into text box
-    log_text.insert(tk.END, "🔌 USB Logs:\n" + logs_analysis.get_usb_logs() + "\n\n")
-    log_text.insert(tk.END, "🔐 Security Logs:\n" + logs_analysis.get_security_logs() + "\n\n")
-    log_text.insert(tk.END, "🖥️ System Logs:\n" + logs_analysis.get_system_logs() + "\n\n")
-    log_text.insert(tk.END, "📦 Application Logs:\n" + logs_analysis.get_application_logs() + "\n\n")
-    log_text.insert(tk.END, "🌐 DNS Logs:\n" + logs_analysis.get_dns_logs() + "\n\n")
+    def on_events(name, records, error, dns_cache):
+        # Runs on the Tk thread (handed over by root.after); the page may be gone by now
+        if not log_list.winfo_exists():
+            return
+        if error:
+            notices[name] = f"⚠️ Could not collect logs: {error}"
+        elif dns_cache is not None:
+            notices[name] = "DNS-Client log is disabled, showing the resolver cache instead."
+            show_dns_cache(dns_cache)
+        elif records or tail.snapshot([name]):
+            notices.pop(name, None)
+        else:
+            notices[name] = logs_analysis.EMPTY_MESSAGES[name]
+        render_notices()
+        if not channel_vars[name].get():
+            return
+        log_list.append_rows([(name, record) for record in records])
+        if error:
+            status_label.config(text=f"⚠️ {LOG_TITLES[name]}: {error}")
+        else:
+            status_label.config(text=f"🟢 Live ─ last update {datetime.now().strftime('%H:%M:%S')}")
+
+    def apply_filter():
+        selected = [name for name, var in channel_vars.items() if var.get()]
+        tail.set_channels(selected)
+        log_list.set_rows(tail.snapshot(selected))
+        render_notices()
+
+    def toggle_pause():
+        if tail.paused:
+            tail.resume()
+            pause_btn.config(text="⏸ Pause", bg="#6c757d")
+            status_label.config(text="🟢 Live")
+        else:
+            tail.pause()
+            pause_btn.config(text="▶ Resume", bg="#28a745")
+            status_label.config(text="⏸ Paused")
 
-    log_text.config(state="disabled")  # Read-only
+    # 🔹 New events arrive from the background tail; nothing blocks the window
+    tail = log_tail.LogTail(lambda *event: root.after(0, lambda: on_events(*event))).start()
+    logs_frame.bind("<Destroy>", lambda e: tail.stop() if e.widget is logs_frame else None)
 
     # 🔹 Export Button
     tk.Button(logs_frame, text="EXPORT LOGS TO PDF", font=("Segoe UI", 12, "bold"),
@@ -716,6 +840,7 @@ def show_logs_page():
 
 def export_logs():
     try:
+        import export_logs_to_pdf
         path = export_logs_to_pdf.export_logs_to_pdf()
         messagebox.showinfo("Success", f"Logs exported to:\n{path}")
     except Exception as e:
@@ -901,9 +1026,11 @@ def export_to_pdf_page():
 
         def run():
             try:
-                pdf_generator4.generate_pdf_report(user_name, lab_name)
+                import pdf_generator4  # reportlab and every probe module: loaded off the Tk thread
+                stats = pdf_generator4.generate_pdf_report(user_name, lab_name)
                 running[0] = False
-                root.after(0, lambda: status_label.config(text="✅ Report generated successfully!", fg="green"))
+                root.after(0, lambda: status_label.config(
+                    text=f"✅ Report generated successfully! ({stats['misses']} probes run, {stats['hits']} reused)", fg="green"))
                 root.after(0, lambda: messagebox.showinfo("Done", "PDF Report has been generated."))
             except Exception as e:
                 running[0] = False
@@ -950,15 +1077,23 @@ def hide_indicators():
     time_sync_indicate.config(bg='#c3c3c3')
 
 def delete_pages():
+    tasks.cancel_all()  # ✅ Results of the page being left are no longer wanted
     for frame in main_frame.winfo_children():
         frame.destroy()
 
 def indicate(lb, page):
+    global current_page
+    current_page = (lb, page)
     hide_indicators()
     lb.config(bg='#2c3e50')
     delete_pages()
     page()
 
+def refresh_page():
+    """ ✅ F5: re-probe everything instead of showing cached results """
+    tasks.cache.invalidate()
+    indicate(*current_page)
+
 # Sidebar container frame (Now it does NOT restrict options_frame)
 sidebar_frame = tk.Frame(root, bg='#c3c3c3')
 
@@ -968,6 +1103,8 @@ options_frame.configure(width=140, height=600)  # Explicitly set size
 
 # Load and Resize Logo (Separate from options_frame)
 try:
+    from PIL import Image, ImageTk  # Import Pillow for resizing images
+
     original_image = Image.open(image_path)
     resized_image = original_image.resize((96, 96), Image.LANCZOS)  # Resize to fit
     logo_img = ImageTk.PhotoImage(resized_image)  # Convert to Tkinter-compatible format
@@ -1112,5 +1249,9 @@ main_frame.pack(side=tk.LEFT, fill="both", expand=True)
 # 👉 Automatically open the HOME page on launch
 indicate(home_indicate, home_page)
 
+# 👉 Then warm the other pages' data in the background while the user reads it
+root.after(0, lambda: tasks.prefetch(PAGE_PROBES))
+root.bind("<F5>", lambda e: refresh_page())
+
 root.mainloop()
 
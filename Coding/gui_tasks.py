@@ -0,0 +1,186 @@
+import itertools
+import queue
+import threading
+import time
+import tkinter as tk
+
+# ✅ Run page data loads off the Tk thread; results come back through root.after
+LOADING_TEXT = "⏳ Loading..."
+WORKERS = 4
+CACHE_TTL = 120  # seconds a probe result is served from the cache
+
+PAGE_LOAD = 0    # priorities: a page the user is looking at goes before prefetching
+PREFETCH = 1
+
+_MISSING = object()
+
+
+class TtlCache:
+    """ Probe results by key for `ttl` seconds. Concurrent gets of one key run the probe once. """
+
+    def __init__(self, ttl=CACHE_TTL):
+        self.ttl = ttl
+        self._results = {}  # key -> (value, stored at)
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def peek(self, key, default=None):
+        """ The cached value if still fresh, else `default`. """
+        with self._lock:
+            entry = self._results.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            return default
+        return entry[0]
+
+    def get(self, key, compute, refresh=False):
+        """ Fresh cached value, or compute() and store it. `refresh` always recomputes. """
+        if not refresh:
+            value = self.peek(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # ✅ A page opened while its prefetch is running waits for that result instead of probing again
+        with key_lock:
+            if not refresh:
+                value = self.peek(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+            value = compute()  # exceptions are not cached
+            with self._lock:
+                self._results[key] = (value, time.monotonic())
+            return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._results.clear()
+            else:
+                self._results.pop(key, None)
+
+
+class Task:
+    """
+    One submitted load. Once cancelled its result is dropped, and it never starts if still queued.
+    Tasks without a generation (prefetches) are not tied to a page and survive navigation.
+    """
+
+    __slots__ = ("fetch", "on_done", "on_error", "owner", "generation", "cancelled")
+
+    def __init__(self, fetch, on_done, on_error, owner, generation):
+        self.fetch = fetch
+        self.on_done = on_done
+        self.on_error = on_error
+        self.owner = owner
+        self.generation = generation
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TaskRunner:
+    """
+    Small pool of daemon workers for GUI loads. `fetch()` runs on a worker; `on_done(result)` or
+    `on_error(exception)` runs on the Tk thread, unless the task was cancelled, a navigation
+    happened in between (cancel_all), or its `owner` widget has been destroyed.
+
+    With a `key`, results go through the TtlCache: fresh data is used without probing again and
+    `refresh=True` bypasses it.
+    """
+
+    def __init__(self, root, workers=WORKERS, cache=None):
+        self.root = root
+        self.workers = workers
+        self.cache = TtlCache() if cache is None else cache
+        self.generation = 0
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._threads = []
+
+    def submit(self, fetch, on_done, on_error=None, owner=None, key=None, refresh=False, priority=PAGE_LOAD):
+        if not self._threads:
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"gui-task-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        if key is not None:
+            fetch = lambda fetch=fetch: self.cache.get(key, fetch, refresh)
+        generation = self.generation if priority == PAGE_LOAD else None
+        task = Task(fetch, on_done, on_error, owner, generation)
+        self._queue.put((priority, next(self._order), task))
+        return task
+
+    def load(self, parent, fetch, render, key=None, refresh=False, text=LOADING_TEXT):
+        """ Clear `parent`, show a placeholder in it, then `render(result)` once `fetch()` returns. """
+        for widget in parent.winfo_children():
+            widget.destroy()
+        if key is not None and not refresh:
+            cached = self.cache.peek(key, _MISSING)
+            if cached is not _MISSING:
+                render(cached)  # ✅ Warm cache: no placeholder, no round trip through a worker
+                return None
+        placeholder = show_placeholder(parent, text)
+
+        def done(result):
+            placeholder.destroy()
+            render(result)
+
+        def failed(error):
+            placeholder.config(text=f"⚠️ Could not load: {error}", fg="red")
+
+        return self.submit(fetch, done, failed, owner=parent, key=key, refresh=refresh)
+
+    def show(self, fetch, on_done, key, refresh=False, owner=None, on_error=None):
+        """ Like submit(), but calls on_done right away when the cache holds fresh data. """
+        if not refresh:
+            cached = self.cache.peek(key, _MISSING)
+            if cached is not _MISSING:
+                on_done(cached)
+                return None
+        return self.submit(fetch, on_done, on_error, owner=owner, key=key, refresh=refresh)
+
+    def prefetch(self, probes):
+        """ Warm the cache from {key: fetch}, in the given order, behind any page loads. """
+        for key, fetch in probes.items():
+            self.submit(fetch, lambda result: None, lambda error: None, key=key, priority=PREFETCH)
+
+    def cancel_all(self):
+        """ Called on navigation: every load submitted so far is stale. """
+        self.generation += 1
+
+    def _stale(self, task):
+        return task.cancelled or (task.generation is not None and task.generation != self.generation)
+
+    def _worker(self):
+        while True:
+            _, _, task = self._queue.get()
+            if self._stale(task):
+                continue
+            try:
+                result, ok = task.fetch(), True
+            except Exception as e:
+                result, ok = e, False
+            if not self._stale(task):
+                self.root.after(0, lambda task=task, ok=ok, result=result: self._deliver(task, ok, result))
+
+    def _deliver(self, task, ok, result):
+        # Tk thread: check again, the user may have navigated while the result was queued
+        if self._stale(task) or (task.owner is not None and not task.owner.winfo_exists()):
+            return
+        if ok:
+            task.on_done(result)
+        elif task.on_error is not None:
+            task.on_error(result)
+        else:
+            print(f"⚠️ Page load failed: {result}")
+
+
+def show_placeholder(parent, text=LOADING_TEXT, **kwargs):
+    options = {"font": ("Segoe UI", 12), "bg": parent["bg"], "fg": "gray"}
+    options.update(kwargs)
+    label = tk.Label(parent, text=text, **options)
+    label.pack(pady=20)
+    return label
@@ -0,0 +1,82 @@
+import ast
+import os
+import subprocess
+import sys
+
+# ✅ What the GUI pays for imports before its window appears, measured with `python -X importtime`
+GUI_SCRIPT = "gui2.py"
+STARTUP_BUDGET_MS = 150  # cumulative import time of gui2's module-level imports
+TOP_N = 15
+
+# __import__ rather than importlib.import_module: only the former shows up in -X importtime
+_IMPORT_LOOP = """
+for name in {names!r}:
+    try:
+        __import__(name)
+    except Exception as e:
+        print(f"{{name}}: {{type(e).__name__}}: {{e}}")
+"""
+
+
+def startup_imports(script=GUI_SCRIPT):
+    """ Modules a script imports at module level (what runs before its first line of UI code). """
+    with open(script, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), script)
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def measure(names):
+    """
+    Import `names` in a fresh interpreter. Returns ([(self_us, cumulative_us, depth, module)], failures).
+    A module that fails to import (missing dependency) is reported and the rest still load.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _IMPORT_LOOP.format(names=names)],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, module.strip()))
+        if depth == 0 and module.strip() == "site":
+            rows.clear()  # interpreter startup, paid by every script
+    failures = [line for line in result.stdout.splitlines() if line]
+    return rows, failures
+
+
+def report(names, budget_ms=STARTUP_BUDGET_MS, top=TOP_N):
+    """ Print the slowest imports and the total; True when the total is within `budget_ms`. """
+    rows, failures = measure(names)
+    top_level = [row for row in rows if row[2] == 0]
+    total_ms = sum(row[1] for row in top_level) / 1000
+
+    print(f"📦 {len(names)} requested imports, {len(rows)} modules loaded, {total_ms:.0f} ms cumulative")
+    print("\n🔹 Requested modules (cumulative ms):")
+    for self_us, cumulative_us, _, module in sorted(top_level, key=lambda row: -row[1]):
+        if module in names:
+            print(f"   {cumulative_us / 1000:8.1f}  {module}")
+    print(f"\n🔹 Slowest {top} modules by own time (ms):")
+    for self_us, _, _, module in sorted(rows, key=lambda row: -row[0])[:top]:
+        print(f"   {self_us / 1000:8.1f}  {module}")
+    for failure in failures:
+        print(f"⚠️ Not measured: {failure}")
+
+    within = total_ms <= budget_ms
+    print(f"\n{'✅' if within else '❌'} Startup imports: {total_ms:.0f} ms (budget {budget_ms} ms)")
+    return within
+
+
+if __name__ == "__main__":
+    # python import_times.py                -> gui2's module-level imports, against the budget
+    # python import_times.py pdf_generator4 -> any modules, e.g. what a page pays on first use
+    requested = sys.argv[1:] or startup_imports()
+    sys.exit(0 if report(requested) else 1)
@@ -0,0 +1,115 @@
+import subprocess
+import time
+from typing import NamedTuple
+from probe_executor import run_probes, set_backend, FakeBackend
+from event_bookmarks import collect_events, collect_profile
+from event_queries import SECURITY_LOGONS
+from logs_analysis import USB_CHANNEL, DNS_CHANNEL, dns_client_log_enabled
+from dns_cache import read_dns_cache
+
+# ✅ Fetch the five log channels side by side: the slowest channel sets the wait, not the sum of all five
+COLLECTION_TIMEOUT = 60  # seconds for the whole collection
+DEFAULT_COUNT = 50
+
+LOG_CHANNELS = {
+    "usb": USB_CHANNEL,
+    "security": "Security",
+    "system": "System",
+    "application": "Application",
+    "dns": DNS_CHANNEL,
+}
+LOG_PROFILES = {"security": SECURITY_LOGONS}  # channels read through an event ID / time window filter
+
+
+class ChannelLogs(NamedTuple):
+    records: list
+    error: str = ""        # why the channel could not be read (the other channels are unaffected)
+    dns_cache: list = None  # DnsCacheEntries from `ipconfig /displaydns`, when the DNS-Client log is disabled
+
+
+def _command_error(error):
+    """ What the failed wevtutil/ipconfig printed ("Access is denied.", "The specified channel could not be found."). """
+    return " ".join((error.stderr or "").split()) or str(error)
+
+
+def _collect_channel(name, count):
+    try:
+        if name in LOG_PROFILES:
+            return ChannelLogs(collect_profile(LOG_PROFILES[name], count))
+        return ChannelLogs(collect_events(LOG_CHANNELS[name], count))
+    except subprocess.CalledProcessError as e:
+        return ChannelLogs([], error=_command_error(e))
+
+
+def _collect_dns(count):
+    # Two steps (log enabled? then events or the resolver cache), but still one slot in the batch
+    try:
+        if dns_client_log_enabled():
+            return ChannelLogs(collect_events(DNS_CHANNEL, count))
+        return ChannelLogs([], dns_cache=read_dns_cache())
+    except subprocess.CalledProcessError as e:
+        return ChannelLogs([], error=_command_error(e))
+
+
+def collect_logs(names=None, count=DEFAULT_COUNT, timeout=COLLECTION_TIMEOUT):
+    """
+    Collect the newest events of several channels concurrently. `names` are keys of
+    LOG_CHANNELS (default: all five); `count` is one number or {name: count}. Returns
+    {name: ChannelLogs} in LOG_CHANNELS order - a channel that fails or runs past
+    `timeout` comes back with an empty record list and its `error` set.
+    """
+    names = [name for name in LOG_CHANNELS if names is None or name in names]
+
+    def count_for(name):
+        return count.get(name, DEFAULT_COUNT) if isinstance(count, dict) else count
+
+    probes = {}
+    for name in names:
+        if name == "dns":
+            probes[name] = lambda n=count_for(name): _collect_dns(n)
+        else:
+            probes[name] = lambda name=name, n=count_for(name): _collect_channel(name, n)
+
+    results = run_probes(probes, max_workers=len(probes), timeout=timeout)
+    return {
+        name: result if isinstance(result, ChannelLogs) else ChannelLogs([], error=str(result).replace("Error: ", "", 1))
+        for name, result in results.items()
+    }
+
+
+def _benchmark(delay=0.3):
+    """ Sequential vs concurrent collection when every wevtutil/ipconfig call takes `delay` seconds. """
+    import os
+    import tempfile
+    import event_bookmarks
+    from event_bookmarks import IncrementalCollector, BookmarkStore
+
+    previous_backend = set_backend(FakeBackend(delay=delay))
+    previous_collector = event_bookmarks._collector
+    folder = tempfile.TemporaryDirectory()
+    bookmarks = os.path.join(folder.name, "bookmarks.json")
+    try:
+        for label, run in (
+            ("one after another", lambda: [collect_logs([name]) for name in LOG_CHANNELS]),
+            ("concurrent", lambda: collect_logs()),
+        ):
+            event_bookmarks._collector = IncrementalCollector(BookmarkStore(bookmarks), sink=lambda records: None)
+            start = time.perf_counter()
+            run()
+            print(f"✅ {label:>17}: {time.perf_counter() - start:.2f}s")
+
+        # wevtutil failing (no admin rights for Security) must show up as the channel's error, not "no events"
+        from event_stream import build_query
+        denied = build_query("Security", DEFAULT_COUNT, xpath=SECURITY_LOGONS.xpath())
+        set_backend(FakeBackend({denied: ("", 5, "Failed to read events. Access is denied.\r\n")}))
+        event_bookmarks._collector = IncrementalCollector(BookmarkStore(bookmarks), sink=lambda records: None)
+        error = collect_logs(["security"])["security"].error
+        print(f"{'✅' if error == 'Failed to read events. Access is denied.' else '❌'} wevtutil failure: {error!r}")
+    finally:
+        set_backend(previous_backend)
+        event_bookmarks._collector = previous_collector
+        folder.cleanup()
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+from log_collection import LOG_CHANNELS, collect_logs
+
+# ✅ Poll the log channels in the background and hand over only events that weren't seen yet
+TAIL_INTERVAL = 5        # seconds between polls
+TAIL_BUFFER_SIZE = 200   # events kept per channel (also the most one poll can catch up on)
+DNS_CACHE_INTERVAL = 60  # seconds between re-reads of the resolver cache while the DNS-Client log is disabled
+
+
+class LogTail:
+    """
+    Background tail over the log channels. Every poll goes through the bookmark collector, so
+    after the first (backfill) poll wevtutil only returns events newer than the last one seen.
+
+    `on_events(name, records, error, dns_cache)` is called on the worker thread with the new
+    records of a channel, oldest first - the GUI hands it over to Tk with root.after. Each channel
+    keeps a bounded ring buffer, so a long session never grows past `buffer_size` events per channel.
+
+    A channel without an event log to follow (DNS-Client log disabled) reports its fallback, the
+    resolver cache, as `dns_cache` (a DnsCacheEntry list, None otherwise); it is re-read every
+    `dns_cache_interval` seconds instead of every poll.
+    """
+
+    def __init__(self, on_events, names=None, interval=TAIL_INTERVAL, buffer_size=TAIL_BUFFER_SIZE,
+                 dns_cache_interval=DNS_CACHE_INTERVAL):
+        self.on_events = on_events
+        self.interval = interval
+        self.buffer_size = buffer_size
+        self.dns_cache_interval = dns_cache_interval
+        self.buffers = {name: deque(maxlen=buffer_size) for name in LOG_CHANNELS}
+        self.errors = {}
+        self.dns_cache = {}  # channel -> latest DnsCacheEntry list, for channels showing the resolver cache
+        self._names = set(LOG_CHANNELS if names is None else names)
+        self._last_seen = {}
+        self._cache_due = {}  # channel -> monotonic time its resolver cache is read again
+        self._paused = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def paused(self):
+        return self._paused
+
+    @property
+    def channels(self):
+        with self._lock:
+            return [name for name in LOG_CHANNELS if name in self._names]
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-tail", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def pause(self):
+        """ Stop polling; the bookmarks make the first poll after resume() catch up. """
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        self._wake.set()
+
+    def set_channels(self, names):
+        """ Only poll (and report) these channels from now on; one that was never polled gets a backfill. """
+        with self._lock:
+            self._names = set(names)
+        self._wake.set()
+
+    def snapshot(self, names=None):
+        """ Buffered (name, record) pairs of the given channels, oldest first across channels. """
+        with self._lock:
+            names = self._names if names is None else names
+            pairs = [(name, record) for name in LOG_CHANNELS if name in names for record in self.buffers[name]]
+        pairs.sort(key=lambda pair: pair[1].timestamp)
+        return pairs
+
+    def poll(self):
+        """ One round over the enabled channels. Returns {name: new records, oldest first}. """
+        now = time.monotonic()
+        names = [name for name in self.channels if self._cache_due.get(name, 0) <= now]
+        if not names:
+            return {}
+
+        new_events = {}
+        for name, logs in collect_logs(names, count=self.buffer_size).items():
+            error, dns_cache = logs.error, logs.dns_cache
+            if dns_cache is not None:
+                self._cache_due[name] = time.monotonic() + self.dns_cache_interval
+                with self._lock:
+                    self.dns_cache[name] = dns_cache
+            else:
+                self._cache_due.pop(name, None)
+                with self._lock:
+                    self.dns_cache.pop(name, None)
+            first_poll = name not in self._last_seen
+            last = self._last_seen.get(name, 0)
+            fresh = [r for r in reversed(logs.records) if first_poll or (r.record_id or 0) > last]
+            if fresh or first_poll:
+                self._last_seen[name] = max([last] + [r.record_id or 0 for r in fresh])
+                with self._lock:
+                    self.buffers[name].extend(fresh)
+
+            changed_error = error != self.errors.get(name, "")
+            self.errors[name] = error
+            if fresh or changed_error or first_poll or dns_cache is not None:
+                new_events[name] = fresh
+                if not self._stopped.is_set():
+                    self.on_events(name, fresh, error, dns_cache)
+        return new_events
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if not self._paused:
+                started = time.monotonic()
+                try:
+                    self.poll()
+                except Exception as e:
+                    print(f"⚠️ Log tail poll failed: {e}")
+                wait = max(0.0, self.interval - (time.monotonic() - started))
+            else:
+                wait = None
+            self._wake.wait(wait)
+            self._wake.clear()
@@ -0,0 +1,341 @@
+import time
+import tkinter as tk
+
+# ✅ Only the rows on screen become Tk items, so 100k events open as fast as 50
+COLUMNS = (
+    # key, heading, width (px)
+    ("time", "Time", 190),
+    ("event_id", "Event ID", 80),
+    ("source", "Source", 300),
+    ("level", "Level", 100),
+    ("channel", "Channel", 110),
+)
+ROW_HEIGHT = 20
+MAX_ROWS = 200_000  # oldest rows are dropped past this during long live-tail sessions
+CHAR_WIDTH = 7  # approximate, for cutting cell text to the column width
+
+_SORT_KEYS = {
+    "time": lambda row: row[1].timestamp,
+    "event_id": lambda row: row[1].event_id or 0,
+    "source": lambda row: (row[1].provider or "").lower(),
+    "level": lambda row: row[1].level or "",
+    "channel": lambda row: row[0],
+}
+
+
+def cell_values(name, record):
+    return (
+        record.local_timestamp(default=""),
+        str(record.event_id or ""),
+        record.provider,
+        record.level,
+        name,
+    )
+
+
+class LogListModel:
+    """
+    (channel name, EventRecord) rows plus the current search and sort, as an index list into
+    the rows. Views only ask for the slice they display.
+    """
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.query = ""
+        self.sort_column = None
+        self.descending = False
+        self._haystacks = []   # lower-cased searchable text per row, built on the first search
+        self._view = list(range(len(self.rows)))
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, index):
+        return self.rows[self._view[index]]
+
+    def window(self, first, count):
+        """ The rows at view positions first .. first + count. """
+        rows = self.rows
+        return [rows[i] for i in self._view[first:first + count]]
+
+    def set_rows(self, rows):
+        self.rows = list(rows)
+        self._haystacks = []
+        self._refresh()
+
+    def append_rows(self, rows, limit=MAX_ROWS):
+        self.rows.extend(rows)
+        excess = len(self.rows) - limit
+        if excess > 0:
+            del self.rows[:excess]
+            del self._haystacks[:excess]
+        self._refresh()
+
+    def search(self, query):
+        """ Keep rows containing `query` (case-insensitive) in any column or the description. """
+        query = query.strip().lower()
+        narrower = self.query and query.startswith(self.query)
+        self.query = query
+        if narrower:
+            # Typing more characters only narrows the current result - filter that, not everything
+            haystacks = self._haystack()
+            self._view = [i for i in self._view if query in haystacks[i]]
+        else:
+            self._refresh()
+
+    def sort(self, column, descending=None):
+        """ Sort by a COLUMNS key; sorting by the same column again flips the direction. """
+        if descending is None:
+            descending = not self.descending if column == self.sort_column else column == "time"
+        self.sort_column = column
+        self.descending = descending
+        self._sort()
+
+    def _haystack(self):
+        rows = self.rows
+        haystacks = self._haystacks
+        for index in range(len(haystacks), len(rows)):
+            name, record = rows[index]
+            haystacks.append(" ".join((name, record.timestamp, str(record.event_id or ""), record.provider,
+                                       record.level, record.description)).lower())
+        return haystacks
+
+    def _refresh(self):
+        if self.query:
+            haystacks = self._haystack()
+            query = self.query
+            self._view = [i for i, text in enumerate(haystacks) if query in text]
+        else:
+            self._view = list(range(len(self.rows)))
+        self._sort()
+
+    def _sort(self):
+        if self.sort_column is None:
+            return
+        key = _SORT_KEYS[self.sort_column]
+        rows = self.rows
+        self._view.sort(key=lambda i: key(rows[i]), reverse=self.descending)
+
+
+class VirtualLogList(tk.Frame):
+    """
+    Column list over a LogListModel drawn on a Canvas with one pool of text items per visible row.
+    Click a heading to sort, type in the search box to filter, click a row to show its details
+    (`describe(name, record)` is only called for the selected row).
+    """
+
+    def __init__(self, parent, describe, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.model = LogListModel()
+        self.describe = describe
+        self.first = 0
+        self.selected = None
+        self._search_job = None
+        self._pool = []
+
+        # 🔹 Search box
+        search_bar = tk.Frame(self, bg=self["bg"])
+        search_bar.pack(fill="x", pady=(0, 5))
+        tk.Label(search_bar, text="🔍", bg=self["bg"]).pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *_: self._schedule_search())
+        tk.Entry(search_bar, textvariable=self.search_var, font=("Segoe UI", 10), relief="solid", bd=1).pack(
+            side=tk.LEFT, fill="x", expand=True, padx=5)
+        self.count_label = tk.Label(search_bar, text="", font=("Segoe UI", 9), bg=self["bg"], fg="gray")
+        self.count_label.pack(side=tk.RIGHT)
+
+        # 🔹 Column headings (click to sort)
+        header = tk.Frame(self, bg="#dfe6ee")
+        header.pack(fill="x")
+        self.heading_buttons = {}
+        x = 0
+        for key, title, width in COLUMNS:
+            button = tk.Button(header, text=title, anchor="w", relief="flat", bg="#dfe6ee",
+                               font=("Segoe UI", 9, "bold"), command=lambda key=key: self.sort(key))
+            button.place(x=x, y=0, width=width)
+            self.heading_buttons[key] = button
+            x += width
+        header.config(height=24)
+
+        # 🔹 Rows + scrollbar
+        body = tk.Frame(self)
+        body.pack(fill="both", expand=True)
+        self.scrollbar = tk.Scrollbar(body, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(body, bg="white", highlightthickness=0)
+        self.canvas.pack(side=tk.LEFT, fill="both", expand=True)
+        self.highlight = self.canvas.create_rectangle(0, 0, 0, 0, fill="#cce5ff", outline="")
+
+        # 🔹 Details of the selected row
+        self.details = tk.Text(self, height=9, wrap="word", font=("Consolas", 9), bg="#fbfbfb", relief="solid", bd=1)
+        self.details.pack(fill="x", pady=(5, 0))
+        self.details.config(state="disabled")
+
+        self.canvas.bind("<Configure>", lambda e: self._render())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.canvas.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll(3))
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "page-up"), ("<Next>", "page-down")):
+            self.canvas.bind(key, lambda e, step=step: self._on_key(step))
+
+    # --- Data ----------------------------------------------------------------
+
+    def set_rows(self, rows):
+        self.model.set_rows(rows)
+        self.selected = None
+        self.first = 0
+        self._render()
+
+    def append_rows(self, rows):
+        """ Add rows (e.g. from the live tail); follows the end of the list if it was showing it. """
+        at_end = self.first + self._visible_rows() >= len(self.model)
+        self.model.append_rows(rows)
+        if at_end and self.model.sort_column is None:
+            self.first = max(0, len(self.model) - self._visible_rows())
+        self._render()
+
+    def sort(self, column):
+        self.model.sort(column)
+        for key, button in self.heading_buttons.items():
+            title = next(t for k, t, _ in COLUMNS if k == key)
+            if key == column:
+                title += " ▼" if self.model.descending else " ▲"
+            button.config(text=title)
+        self.first = 0
+        self._render()
+
+    def _schedule_search(self):
+        # Debounce: search once typing pauses for a moment
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(150, self._search)
+
+    def _search(self):
+        self._search_job = None
+        self.model.search(self.search_var.get())
+        self.first = 0
+        self.selected = None
+        self._render()
+
+    # --- Scrolling -----------------------------------------------------------
+
+    def _visible_rows(self):
+        return max(1, self.canvas.winfo_height() // ROW_HEIGHT)
+
+    def scroll(self, rows):
+        self.first = max(0, min(self.first + rows, len(self.model) - self._visible_rows()))
+        self._render()
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.first = int(float(args[0]) * len(self.model))
+            self.scroll(0)
+        elif action == "scroll":
+            amount = int(args[0])
+            self.scroll(amount * (self._visible_rows() if args[1] == "pages" else 1))
+
+    def _on_key(self, step):
+        if step in ("page-up", "page-down"):
+            self.scroll(self._visible_rows() * (-1 if step == "page-up" else 1))
+            return
+        if len(self.model):
+            position = self.selected if self.selected is not None else self.first - 1
+            self._select(max(0, min(len(self.model) - 1, position + step)))
+
+    # --- Selection -----------------------------------------------------------
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        position = self.first + event.y // ROW_HEIGHT
+        if position < len(self.model):
+            self._select(position)
+
+    def _select(self, position):
+        self.selected = position
+        visible = self._visible_rows()
+        if position < self.first:
+            self.first = position
+        elif position >= self.first + visible:
+            self.first = position - visible + 1
+        self._render()
+
+        name, record = self.model[position]
+        self.details.config(state="normal")
+        self.details.delete("1.0", tk.END)
+        self.details.insert(tk.END, self.describe(name, record))
+        if record.description:
+            self.details.insert(tk.END, "\n\n" + record.description)
+        self.details.config(state="disabled")
+
+    # --- Drawing -------------------------------------------------------------
+
+    def _render(self):
+        canvas = self.canvas
+        visible = self._visible_rows()
+        total = len(self.model)
+
+        # Grow the item pool to the number of visible rows (never one item per record)
+        while len(self._pool) < visible:
+            y = len(self._pool) * ROW_HEIGHT + ROW_HEIGHT // 2
+            x = 4
+            items = []
+            for _, _, width in COLUMNS:
+                items.append(canvas.create_text(x, y, anchor="w", font=("Consolas", 9)))
+                x += width
+            self._pool.append(items)
+
+        rows = self.model.window(self.first, visible)
+        for index, items in enumerate(self._pool):
+            values = cell_values(*rows[index]) if index < len(rows) else ("",) * len(COLUMNS)
+            for item, value, (_, _, width) in zip(items, values, COLUMNS):
+                limit = width // CHAR_WIDTH - 1
+                canvas.itemconfigure(item, text=value if len(value) <= limit else value[:limit - 1] + "…")
+
+        if self.selected is not None and self.first <= self.selected < self.first + visible:
+            top = (self.selected - self.first) * ROW_HEIGHT
+            canvas.coords(self.highlight, 0, top, canvas.winfo_width(), top + ROW_HEIGHT)
+        else:
+            canvas.coords(self.highlight, 0, 0, 0, 0)
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+        shown = f"{total:,} of {len(self.model.rows):,} events" if self.model.query else f"{total:,} events"
+        self.count_label.config(text=shown)
+
+
+def _benchmark(count=100_000):
+    """ Model operations over 100k rows - what opening, sorting and searching cost (no display needed). """
+    from datetime import datetime, timedelta
+    from event_records import EventRecord
+
+    start_time = datetime(2025, 5, 14)
+    providers = ["Service Control Manager", "Microsoft-Windows-Kernel-General", "Application Error", "Schannel"]
+    levels = ["Information", "Warning", "Error"]
+    rows = []
+    for i in range(count):
+        header = {"Log Name": "System", "Source": providers[i % 4], "Event ID": str(7000 + i % 50),
+                  "Record ID": str(i), "Level": levels[i % 3],
+                  "Date": (start_time + timedelta(seconds=i * 7 % 86400)).isoformat()}
+        rows.append(("system", EventRecord(header, f"The service number {i} entered the running state.")))
+
+    model = LogListModel()
+    for label, run in (
+        ("open", lambda: model.set_rows(rows)),
+        ("first screen (40 rows)", lambda: [cell_values(*row) for row in model.window(0, 40)]),
+        ("sort by time", lambda: model.sort("time")),
+        ("sort by event ID", lambda: model.sort("event_id")),
+        ("search 'sched' (first, builds index)", lambda: model.search("sched")),
+        ("search 'number 99' ", lambda: model.search("number 99")),
+        ("search 'number 999' (narrows)", lambda: model.search("number 999")),
+        ("clear search", lambda: model.search("")),
+    ):
+        start = time.perf_counter()
+        run()
+        print(f"✅ {label:>38}: {(time.perf_counter() - start) * 1000:7.1f} ms ({len(model):,} rows in view)")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,314 @@
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from audit_context import audit_cached
+from event_records import account_name, source_ip
+
+# ✅ Sliding-window counters over Security logon events (4625 failures, 4624 successes, 4740 lockouts)
+WINDOW_MINUTES = 10
+FAILURE_THRESHOLD = 5   # failures inside the window that make a burst
+SPRAY_THRESHOLD = 5     # distinct accounts one source fails against inside the window
+
+FAILED_LOGON = 4625
+SUCCESSFUL_LOGON = 4624
+ACCOUNT_LOCKOUT = 4740
+REMOTE_INTERACTIVE = "10"  # RDP
+NETWORK_CLEARTEXT = "8"
+
+LOCAL_SOURCES = {None, "", "-", "::1", "127.0.0.1", "localhost"}
+SEVERITY_ORDER = {"High": 0, "Medium": 1, "Low": 2}
+EPOCH = datetime(1970, 1, 1)
+
+
+class Finding:
+    """ One detection. Counters are updated in place while the burst lasts; the text is only built when shown. """
+
+    __slots__ = ("kind", "severity", "account", "ip", "count", "first_seen", "last_seen", "accounts")
+
+    def __init__(self, kind, severity, account, ip, first_seen, count=1):
+        self.kind = kind
+        self.severity = severity
+        self.account = account
+        self.ip = ip
+        self.count = count
+        self.first_seen = first_seen  # seconds since the epoch (UTC)
+        self.last_seen = first_seen
+        self.accounts = 0
+
+    @property
+    def minutes(self):
+        minutes = max(1, round((self.last_seen - self.first_seen) / 60))
+        return f"{minutes} minute{'s' if minutes != 1 else ''}"
+
+    @property
+    def when(self):
+        return EPOCH + timedelta(seconds=self.first_seen)
+
+    @property
+    def local_time(self):
+        """ `when` (naive UTC) in this machine's time zone, like EventRecord.local_time. """
+        return self.when.replace(tzinfo=timezone.utc).astimezone()
+
+    @property
+    def message(self):
+        if self.kind == "success_after_failures":
+            return (f"{self.count} failed logons from {self.ip} in {self.minutes} "
+                    f"followed by a successful logon as {self.account}")
+        if self.kind == "brute_force":
+            return f"{self.count} failed logons from {self.ip} in {self.minutes}"
+        if self.kind == "password_spray":
+            return f"{self.ip} failed to log on as {self.accounts} different accounts in {self.minutes}"
+        if self.kind == "account_targeted":
+            return f"{self.count} failed logons for {self.account} from several sources in {self.minutes}"
+        if self.kind == "lockout":
+            return f"Account {self.account} was locked out" + (f" ({self.count} times)" if self.count > 1 else "")
+        if self.kind == "remote_logon":
+            return f"Remote Desktop logon as {self.account} from {self.ip}" + (f" ({self.count} times)" if self.count > 1 else "")
+        if self.kind == "cleartext_logon":
+            return f"Network logon with a cleartext password as {self.account} from {self.ip}"
+        return self.kind
+
+    def __repr__(self):
+        return f"Finding({self.severity}: {self.message})"
+
+
+class _Window:
+    __slots__ = ("times", "names", "name_counts", "finding", "spray", "success", "last_source", "mixed")
+
+    def __init__(self, track_names=False):
+        self.times = deque()
+        self.names = deque() if track_names else None
+        self.name_counts = {} if track_names else None
+        self.finding = None
+        self.spray = None
+        self.success = None
+        self.last_source = None
+        self.mixed = False
+
+    def slide(self, now, span):
+        times = self.times
+        oldest = now - span
+        names = self.names
+        while times and times[0] < oldest:
+            times.popleft()
+            if names is not None:
+                name = names.popleft()
+                left = self.name_counts[name] - 1
+                if left:
+                    self.name_counts[name] = left
+                else:
+                    del self.name_counts[name]
+        if not times:  # the burst is over; a later one is a new finding
+            self.finding = self.spray = self.success = None
+            self.mixed = False
+
+
+class LogonDetector:
+    """
+    Feed events oldest first. Failures are counted per source IP and per account in sliding
+    windows; findings are opened when a window crosses its threshold and then just counted up.
+    """
+
+    def __init__(self, window_minutes=WINDOW_MINUTES, failure_threshold=FAILURE_THRESHOLD,
+                 spray_threshold=SPRAY_THRESHOLD):
+        self.span = window_minutes * 60
+        self.failure_threshold = failure_threshold
+        self.spray_threshold = spray_threshold
+        self.findings = []
+        self.events = 0
+        self._by_ip = {}
+        self._by_account = {}
+        self._lockouts = {}
+        self._remote = {}
+
+    def feed(self, now, event_id, account, ip, logon_type=None):
+        """ One event: `now` in seconds, `account` lower-cased, `ip` as logged. """
+        self.events += 1
+        if event_id == FAILED_LOGON:
+            self._failure(now, account, ip)
+        elif event_id == SUCCESSFUL_LOGON:
+            self._success(now, account, ip, logon_type)
+        elif event_id == ACCOUNT_LOCKOUT:
+            finding = self._lockouts.get(account)
+            if finding is None:
+                self._lockouts[account] = self._open("lockout", "Medium", account, None, now)
+            else:
+                finding.count += 1
+                finding.last_seen = now
+
+    def _open(self, kind, severity, account, ip, first_seen, count=1):
+        finding = Finding(kind, severity, account, ip, first_seen, count)
+        self.findings.append(finding)
+        return finding
+
+    def _failure(self, now, account, ip):
+        span = self.span
+        threshold = self.failure_threshold
+
+        if ip not in LOCAL_SOURCES:
+            window = self._by_ip.get(ip)
+            if window is None:
+                window = self._by_ip[ip] = _Window(track_names=True)
+            else:
+                window.slide(now, span)
+            window.times.append(now)
+            window.names.append(account)
+            window.name_counts[account] = window.name_counts.get(account, 0) + 1
+
+            if window.finding is not None:
+                window.finding.count += 1
+                window.finding.last_seen = now
+            elif len(window.times) >= threshold:
+                window.finding = self._open("brute_force", "Medium", account, ip, window.times[0], len(window.times))
+                window.finding.last_seen = now
+
+            distinct = len(window.name_counts)
+            if window.spray is not None:
+                window.spray.accounts = max(window.spray.accounts, distinct)
+                window.spray.count += 1
+                window.spray.last_seen = now
+            elif distinct >= self.spray_threshold:
+                window.spray = self._open("password_spray", "High", None, ip, window.times[0], len(window.times))
+                window.spray.accounts = distinct
+                window.spray.last_seen = now
+
+        if account:
+            window = self._by_account.get(account)
+            if window is None:
+                window = self._by_account[account] = _Window()
+            else:
+                window.slide(now, span)
+            window.times.append(now)
+            if window.last_source is not None and window.last_source != ip:
+                window.mixed = True
+            window.last_source = ip
+
+            if window.finding is not None:
+                window.finding.count += 1
+                window.finding.last_seen = now
+            elif window.mixed and len(window.times) >= threshold:
+                window.finding = self._open("account_targeted", "Medium", account, None, window.times[0], len(window.times))
+                window.finding.last_seen = now
+
+    def _success(self, now, account, ip, logon_type):
+        span = self.span
+        # A success right after a burst of failures from the same source, or after an account was
+        # targeted from several sources
+        for window, burst_only in ((self._by_ip.get(ip), False), (self._by_account.get(account), True)):
+            if window is None:
+                continue
+            window.slide(now, span)
+            if burst_only and window.finding is None:
+                continue
+            if window.success is None and len(window.times) >= self.failure_threshold:
+                burst = window.finding
+                window.success = self._open("success_after_failures", "High", account, ip, window.times[0],
+                                            burst.count if burst is not None else len(window.times))
+                window.success.last_seen = now
+                break
+
+        if ip in LOCAL_SOURCES:
+            return
+        if logon_type == REMOTE_INTERACTIVE:
+            key = (account, ip)
+            finding = self._remote.get(key)
+            if finding is None:
+                self._remote[key] = self._open("remote_logon", "Low", account, ip, now)
+            else:
+                finding.count += 1
+                finding.last_seen = now
+        elif logon_type == NETWORK_CLEARTEXT:
+            self._open("cleartext_logon", "Medium", account, ip, now)
+
+    def results(self):
+        """ Findings, most severe first, then newest first. """
+        return sorted(self.findings, key=lambda f: (SEVERITY_ORDER.get(f.severity, 3), -f.last_seen))
+
+
+def logon_fields(record):
+    """ (seconds, event id, account, ip, logon type) of an EventRecord, or None without a usable time. """
+    when = record.time_created
+    if when is None:
+        return None
+    data = record.event_data
+    if data:
+        account = data.get("TargetUserName")
+        ip = data.get("IpAddress")
+        logon_type = data.get("LogonType")
+    else:  # no EventData: fall back to the description's "Key: Value" lines
+        account = account_name(record, default=None)
+        ip = source_ip(record, default=None)
+        logon_type = record.get("Logon Type")
+    if when.tzinfo is not None:
+        when = when.replace(tzinfo=None) - when.utcoffset()
+    return ((when - EPOCH).total_seconds(), record.event_id, account.lower() if account else account, ip, logon_type)
+
+
+def detect(records, **settings):
+    """ Run a LogonDetector over EventRecords (any order) and return its findings. """
+    events = [fields for fields in map(logon_fields, records) if fields is not None]
+    events.sort(key=itemgetter(0))
+    detector = LogonDetector(**settings)
+    feed = detector.feed
+    for event in events:
+        feed(*event)
+    return detector.results()
+
+
+@audit_cached
+def detect_logon_anomalies():
+    """ Findings over the last day of Security logon events. """
+    from event_bookmarks import collect_profile
+    from event_queries import LOGON_DETECTION
+    return detect(collect_profile(LOGON_DETECTION))
+
+
+def has_logon_attacks(findings):
+    return any(finding.severity == "High" for finding in findings)
+
+
+def _benchmark(count=100_000):
+    """ 100k synthetic logon events: background noise plus a brute force, a spray and an RDP session. """
+    from event_records import EventRecord
+
+    start_time = datetime(2025, 5, 14, 8, 0, 0)
+    accounts = ["student", "lab-admin", "teacher", "backup", "guest"]
+    records = []
+    for i in range(count):
+        when = start_time + timedelta(seconds=i * 3)
+        event_id, account, ip, logon_type = 4624, accounts[i % 5], f"10.0.{i % 7}.{i % 200 + 20}", "3"
+        if i % 400 == 0:
+            event_id, account = 4625, accounts[i // 400 % 5]  # scattered typos
+        if 50_000 <= i < 50_030:
+            event_id, account, ip = 4625, "administrator", "203.0.113.9"  # brute force ...
+        elif i == 50_030:
+            account, ip = "administrator", "203.0.113.9"                   # ... that got in
+        elif 70_000 <= i < 70_012:
+            event_id, account, ip = 4625, f"user{i % 12}", "198.51.100.4"  # password spray
+        elif i == 80_001:
+            account, ip, logon_type = "lab-admin", "192.0.2.77", "10"
+        elif i == 80_002:
+            event_id, account = 4740, "teacher"
+        header = {"Log Name": "Security", "Event ID": str(event_id), "Record ID": str(i + 1),
+                  "Date": when.isoformat() + ".1234567Z"}
+        records.append(EventRecord(header, "", {"TargetUserName": account, "IpAddress": ip, "LogonType": logon_type}))
+
+    start = time.perf_counter()
+    findings = detect(records)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {count} events in {elapsed:.2f}s ({count / elapsed:,.0f} events/sec), {len(findings)} findings")
+
+    events = sorted(map(logon_fields, records), key=itemgetter(0))
+    detector = LogonDetector()
+    start = time.perf_counter()
+    for event in events:
+        detector.feed(*event)
+    print(f"   counters alone: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for finding in findings:
+        print(f"   [{finding.severity}] {finding.message} at {finding.when:%H:%M}")
+
+
+if __name__ == "__main__":
+    _benchmark()
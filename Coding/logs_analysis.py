@@ -1,38 +1,32 @@
-import subprocess
-import re
-
-# ✅ Suppress black CMD windows
-startupinfo = subprocess.STARTUPINFO()
-startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-def get_usb_logs():
-    """Fetch last 50 USB-related logs with deep details for cybersecurity auditing."""
-    command = 'wevtutil qe "Microsoft-Windows-DriverFrameworks-UserMode/Operational" /c:50 /f:text'
-    result = subprocess.run(command, shell=True, capture_output=True, text=True, startupinfo=startupinfo)
-    logs = result.stdout.strip().split("\n\n")  # Split log entries
-
-    parsed_logs = []
-    for log in logs:
-        if "Event ID:" in log:
-            lines = log.split("\n")
-            
-            # Extract relevant details
-            event_id = next((line.split(":")[1].strip() for line in lines if "Event ID" in line), "Unknown")
-            timestamp = next((line.split(":")[1].strip() for line in lines if "Date" in line), "Unknown")
-            device_id = next((line.split(":")[1].strip() for line in lines if "USB\\VID" in line), "Unknown")
-            serial_number = next((line.split(":")[1].strip() for line in lines if "Serial Number" in line), "Unknown")
-            user = next((line.split(":")[1].strip() for line in lines if "User" in line), "SYSTEM")
-            driver_name = next((line.split(":")[1].strip() for line in lines if "Driver Name" in line), "Unknown")
-            driver_version = next((line.split(":")[1].strip() for line in lines if "Driver Version" in line), "Unknown")
-            port_used = next((line.split(":")[1].strip() for line in lines if "Port" in line), "Unknown")
-            description = next((line.strip() for line in lines if "Description:" in line), "No Description")
-            installation_status = "Success" if "Status: Success" in log else "Failure"
-            error_code = next((match.group(1) if (match := re.search(r'Error Code: (\d+)', line)) else None for line in lines), "None")
-
-            # Flag unknown devices
-            flagged_device = "Suspicious Device" if "VID_0000" in device_id or "Unknown" in driver_name else "Known Device"
-
-            parsed_logs.append(f"""
+from event_records import account_name, source_ip, usb_device_id, usb_error_code
+from event_bookmarks import collect_events, collect_profile
+from event_queries import SECURITY_LOGONS
+from dns_cache import read_dns_cache, group_by_domain
+from probe_executor import run_command
+
+USB_CHANNEL = "Microsoft-Windows-DriverFrameworks-UserMode/Operational"
+DNS_CHANNEL = "Microsoft-Windows-DNS-Client/Operational"
+DNS_CACHE_DOMAINS = 100
+
+# ✅ Formatting of a single event (shared with log_manager)
+
+def format_usb_record(record):
+    event_id = record.event_id or "Unknown"
+    timestamp = record.local_timestamp()
+    device_id = usb_device_id(record)
+    serial_number = record.first("Serial Number", "SerialNumber")
+    user = record.user or "SYSTEM"
+    driver_name = record.first("Driver Name", "DriverName")
+    driver_version = record.first("Driver Version", "DriverVersion")
+    port_used = record.first("Port")
+    description = record.description.split("\n", 1)[0] or "No Description"
+    installation_status = "Success" if record.get("Status") == "Success" else "Failure"
+    error_code = usb_error_code(record)
+
+    # Flag unknown devices
+    flagged_device = "Suspicious Device" if "VID_0000" in device_id or "Unknown" in driver_name else "Known Device"
+
+    return f"""
 📌 **Event ID:** {event_id}
         **Timestamp:** {timestamp}
         **Device ID:** {device_id}
@@ -44,130 +38,169 @@ def get_usb_logs():
         **Installation Status:** {installation_status}
         **Error Code:** {error_code}
         **Security Check:** {flagged_device}
-            """.strip())
+    """.strip()
 
+def format_security_record(record):
+    event_id = record.event_id or "Unknown"
+    time_created = record.local_timestamp()
+    account = account_name(record)
+    ip_address = source_ip(record)
+    logon_type = record.first("LogonType", "Logon Type")
+
+    return f"""
+🔐 **Event ID:** {event_id}
+    **Timestamp:** {time_created}
+    **Account:** {account}
+    **IP Address:** {ip_address}
+    **Logon Type:** {logon_type}
+    """.strip()
+
+def format_system_record(record):
+    return f"""
+⚙️ **Event ID:** {record.event_id or "Unknown"}
+    **Timestamp:** {record.local_timestamp()}
+    **Source:** {record.provider or "Unknown"}
+    **Level:** {record.level or "Unknown"}
+    """.strip()
+
+def format_application_record(record):
+    return f"""
+🗂️ **Event ID:** {record.event_id or "Unknown"}
+    **Timestamp:** {record.local_timestamp()}
+    **Application:** {record.provider or "Unknown"}
+    **Level:** {record.level or "Unknown"}
+    """.strip()
+
+def format_dns_record(record):
+    queried_domain = record.first("QueryName")
+    response_ip = record.first("QueryResults", "Address")
+    query_status = "Success" if record.get("QueryStatus", record.get("Status")) == "0" else "Failure"
+
+    return f"""
+🌐 **Domain Queried:** {queried_domain}
+    **Timestamp:** {record.local_timestamp()}
+    **Response IP:** {response_ip}
+    **Query Status:** {query_status}
+    """.strip()
+
+# ✅ Structured fields for renderers that lay events out themselves (PDF tables, lists)
+
+def record_source(name, record):
+    """ What produced / is concerned by the event, per channel. """
+    if name == "usb":
+        return record.first("Driver Name", "DriverName", default="") or usb_device_id(record)
+    if name == "security":
+        return f"{account_name(record)} ({source_ip(record)})"
+    if name == "dns":
+        return record.first("QueryName")
+    return record.provider or "Unknown"
+
+def record_outcome(name, record):
+    """ "Error", "Warning", "Failure" or the event's level - used to color entries. """
+    if name == "security" and record.event_id in (4625, 4740):
+        return "Failure"
+    if name == "dns" and record.get("QueryStatus", record.get("Status")) not in (None, "0"):
+        return "Failure"
+    return record.level or "Information"
+
+# ✅ One formatted entry at a time; after the first call only events newer than the bookmark are queried
+
+def iter_usb_logs(count=50):
+    for record in collect_events(USB_CHANNEL, count):
+        yield format_usb_record(record)
+
+def iter_security_logs(count=50):
+    # Only logon-related IDs from the last week - filtered by wevtutil, not after the fact
+    for record in collect_profile(SECURITY_LOGONS, count):
+        yield format_security_record(record)
+
+def iter_system_logs(count=50):
+    for record in collect_events("System", count):
+        yield format_system_record(record)
+
+def iter_application_logs(count=50):
+    for record in collect_events("Application", count):
+        yield format_application_record(record)
+
+def dns_client_log_enabled():
+    """ Check if DNS-Client Operational Log is enabled """
+    check_command = f'wevtutil gl "{DNS_CHANNEL}"'
+    check_result = run_command(check_command)
+    return "enabled: false" not in check_result.stdout.lower()
+
+def iter_dns_logs(count=50):
+    for record in collect_events(DNS_CHANNEL, count):
+        yield format_dns_record(record)
+
+
+FORMATTERS = {
+    "usb": format_usb_record,
+    "security": format_security_record,
+    "system": format_system_record,
+    "application": format_application_record,
+    "dns": format_dns_record,
+}
+
+EMPTY_MESSAGES = {
+    "usb": "No USB activity detected.",
+    "security": "No Security Logs Found.",
+    "system": "No System Logs Found.",
+    "application": "No Application Logs Found.",
+    "dns": "No DNS Logs Found.",
+}
+
+def format_dns_cache(entries):
+    """ Resolver cache (DnsCacheEntries) grouped per domain, shown when the DNS-Client log is disabled. """
+    domains = group_by_domain(entries)
+    if not domains:
+        return "DNS Client Logs are disabled and no DNS Cache found."
+
+    blocks = []
+    for domain, records in list(domains.items())[:DNS_CACHE_DOMAINS]:
+        lines = [f"🌐 **Domain:** {domain}"]
+        lines += [f"    **{record.type}:** {record.data} (TTL {record.ttl}s, {record.section})" for record in records]
+        blocks.append("\n".join(lines))
+    if len(domains) > DNS_CACHE_DOMAINS:
+        blocks.append(f"[Only {DNS_CACHE_DOMAINS} of {len(domains)} cached domains shown]")
+    return "\n\n".join(blocks)
+
+def format_channel_logs(name, logs, separator="\n\n"):
+    """ Text of one channel from log_collection.collect_logs (`logs` is its ChannelLogs). """
+    if logs.error:
+        return f"⚠️ Could not collect logs: {logs.error}"
+    if logs.dns_cache is not None:
+        return format_dns_cache(logs.dns_cache)
+    entries = [FORMATTERS[name](record) for record in logs.records]
+    return separator.join(entries) if entries else EMPTY_MESSAGES[name]
+
+
+def get_usb_logs():
+    """Fetch last 50 USB-related logs with deep details for cybersecurity auditing."""
+    parsed_logs = list(iter_usb_logs(50))
     usb_logs = "\n\n".join(parsed_logs) if parsed_logs else "No USB activity detected."
     return usb_logs.strip()
 
 
 def get_security_logs():
     """Fetch and clean last 50 security logs."""
-    command = 'wevtutil qe Security /c:50 /f:text'
-    result = subprocess.run(command, shell=True, capture_output=True, text=True, startupinfo=startupinfo)
-    
-    logs = result.stdout.strip().split("\n\n")
-    parsed_logs = []
-    for log in logs:
-        if "Event ID:" in log:
-            lines = log.split("\n")
-            event_id = next((line.split(":")[1].strip() for line in lines if "Event ID" in line), "Unknown")
-            time_created = next((line.split(":")[1].strip() for line in lines if "TimeCreated" in line), "Unknown")
-            account_name = next((line.split(":")[1].strip() for line in lines if "Account Name" in line), "Unknown")
-            ip_address = next((line.split(":")[1].strip() for line in lines if "IpAddress" in line), "Unknown")
-            logon_type = next((line.split(":")[1].strip() for line in lines if "Logon Type" in line), "Unknown")
-            
-            parsed_logs.append(f"""
-🔐 **Event ID:** {event_id}
-    **Timestamp:** {time_created}
-    **Account:** {account_name}
-    **IP Address:** {ip_address}
-    **Logon Type:** {logon_type}
-            """.strip())
-    
+    parsed_logs = list(iter_security_logs(50))
     return "\n\n".join(parsed_logs) if parsed_logs else "No Security Logs Found."
 
 def get_system_logs():
     """Fetch and clean last 50 system logs."""
-    command = 'wevtutil qe System /c:50 /f:text'
-    result = subprocess.run(command, shell=True, capture_output=True, text=True, startupinfo=startupinfo)
-
-    logs = result.stdout.strip().split("\n\n")
-    parsed_logs = []
-    
-    for log in logs:
-        if "Event ID:" in log:
-            lines = log.split("\n")
-            event_id = next((line.split(":")[1].strip() for line in lines if "Event ID" in line), "Unknown")
-            timestamp = next((line.split(":")[1].strip() for line in lines if "TimeCreated" in line), "Unknown")
-            source = next((line.split(":")[1].strip() for line in lines if "Provider Name" in line), "Unknown")
-            level = next((line.split(":")[1].strip() for line in lines if "Level" in line), "Unknown")
-
-            parsed_logs.append(f"""
-⚙️ **Event ID:** {event_id}
-    **Timestamp:** {timestamp}
-    **Source:** {source}
-    **Level:** {level}
-            """.strip())
-    
+    parsed_logs = list(iter_system_logs(50))
     return "\n\n".join(parsed_logs) if parsed_logs else "No System Logs Found."
 
 def get_application_logs():
     """Fetch and clean last 50 application logs."""
-    command = 'wevtutil qe Application /c:50 /f:text'
-    result = subprocess.run(command, shell=True, capture_output=True, text=True, startupinfo=startupinfo)
-
-    logs = result.stdout.strip().split("\n\n")
-    parsed_logs = []
-
-    for log in logs:
-        if "Event ID:" in log:
-            lines = log.split("\n")
-            event_id = next((line.split(":")[1].strip() for line in lines if "Event ID" in line), "Unknown")
-            timestamp = next((line.split(":")[1].strip() for line in lines if "TimeCreated" in line), "Unknown")
-            source = next((line.split(":")[1].strip() for line in lines if "Provider Name" in line), "Unknown")
-            level = next((line.split(":")[1].strip() for line in lines if "Level" in line), "Unknown")
-
-            parsed_logs.append(f"""
-🗂️ **Event ID:** {event_id}
-    **Timestamp:** {timestamp}
-    **Application:** {source}
-    **Level:** {level}
-            """.strip())
-
+    parsed_logs = list(iter_application_logs(50))
     return "\n\n".join(parsed_logs) if parsed_logs else "No Application Logs Found."
 
 def get_dns_logs():
     """Fetch and clean last 50 DNS lookup logs, or fallback to DNS cache if unavailable."""
-    
-    # Check if DNS-Client Operational Log is enabled
-    check_command = 'wevtutil gl "Microsoft-Windows-DNS-Client/Operational"'
-    check_result = subprocess.run(check_command, shell=True, capture_output=True, text=True, startupinfo=startupinfo)
-    
-    if "enabled: false" in check_result.stdout.lower():
+    if not dns_client_log_enabled():
         # Fallback to DNS Cache
-        fallback_result = subprocess.run('ipconfig /displaydns', shell=True, capture_output=True, text=True, startupinfo=startupinfo)
-        fallback_output = fallback_result.stdout.strip()
-        lines = fallback_output.splitlines()
-        trimmed_output = "\n".join(lines[:100])
-        return trimmed_output + "\n\n[Only top 100 DNS cache lines shown]" if trimmed_output else "DNS Client Logs are disabled and no DNS Cache found."
-
-    
-    # Fetch last 5 DNS events
-    fetch_command = 'wevtutil qe "Microsoft-Windows-DNS-Client/Operational" /c:50 /f:text'
-    fetch_result = subprocess.run(fetch_command, shell=True, capture_output=True, text=True, startupinfo=startupinfo)
-    
-    logs = fetch_result.stdout.strip().split("\n\n")
-    parsed_logs = []
-    
-    for log in logs:
-        if "Event ID:" in log:
-            lines = log.split("\n")
-            event_id = next((line.split(":")[1].strip() for line in lines if "Event ID" in line), "Unknown")
-            timestamp = next((line.split(":")[1].strip() for line in lines if "TimeCreated" in line), "Unknown")
-            queried_domain = next((line.split(":")[1].strip() for line in lines if "QueryName" in line), "Unknown")
-            response_ip = next((line.split(":")[1].strip() for line in lines if "Address" in line), "Unknown")
-            query_status = "Success" if "Status: 0" in log else "Failure"
-
-            parsed_logs.append(f"""
-🌐 **Domain Queried:** {queried_domain}
-    **Timestamp:** {timestamp}
-    **Response IP:** {response_ip}
-    **Query Status:** {query_status}
-            """.strip())
-    
-    return "\n\n".join(parsed_logs) if parsed_logs else "No DNS Logs Found."
-
-
-
-
+        return format_dns_cache(read_dns_cache())
 
+    parsed_logs = list(iter_dns_logs(50))
+    return "\n\n".join(parsed_logs) if parsed_logs else "No DNS Logs Found."
@@ -1,9 +1,10 @@
 import subprocess
+from probe_executor import run_command
 
 def get_current_policy():
     """ ✅ Retrieve and organize the current Password, Lockout Policy, and Inactivity Timeout """
     try:
-        result = subprocess.run(["net", "accounts"], capture_output=True, text=True)
+        result = run_command(["net", "accounts"])
         lines = result.stdout.strip().splitlines()
 
         password_policy = {}
@@ -23,9 +24,9 @@ def get_current_policy():
 
         # ✅ Get Machine Inactivity Limit from Registry
         try:
-            reg_result = subprocess.run([
+            reg_result = run_command([
                 "reg", "query", "HKCU\\Control Panel\\Desktop", "/v", "ScreenSaveTimeOut"
-            ], capture_output=True, text=True)
+            ])
             reg_output = reg_result.stdout.strip()
             timeout_seconds = None
 
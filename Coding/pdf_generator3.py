@@ -15,13 +15,9 @@ from system_information import (
     get_plug_and_play_status,
     get_geolocation_status
 )
-from log_manager import (
-    get_security_logs,
-    get_system_logs,
-    get_application_logs,
-    get_dns_logs,
-    get_usb_logs,
-)
+from log_manager import collect_report_logs, format_dns_cache_entries
+from logs_analysis import record_source, record_outcome
+from xml.sax.saxutils import escape
 from security_logs import (
     get_antivirus_status,
     get_firewall_status,
@@ -889,68 +885,48 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Spacer(1, 20))  # Space after table
 
     # ✅ Log Analysis with Color Coding
-    def format_logs_for_pdf(logs):
-        if not logs.strip():
+    def format_logs_for_pdf(name, channel_logs):
+        # ✅ Built straight from the collected EventRecords - no text to re-parse
+        if channel_logs.error:
+            return [(f"<b>Could not collect logs:</b> {escape(clean_text(channel_logs.error))}", error_style)]
+        if channel_logs.dns_cache is not None:
+            entries = format_dns_cache_entries(channel_logs.dns_cache).split("\n\n")
+            return [(clean_text(entry), info_style) for entry in entries if entry.strip()]
+        if not channel_logs.records:
             return [("<b>No logs found.</b>", info_style)]
 
-        events = logs.strip().split("Event[")
         formatted_logs = []
-
-        for event in events:
-            event = event.strip()
-            if event:
-                event_lines = event.split("\n")
-                event_id = next((line.split(":")[1].strip() for line in event_lines if "Event ID" in line), "Unknown")
-                timestamp_raw = next((line.split(":", 1)[1].strip() if ":" in line else "Unknown" for line in event_lines if "Date" in line), "Unknown")
-                timestamp = format_timestamp(timestamp_raw)  # ✅ Convert timestamp
-                source = next((line.split(":")[1].strip() for line in event_lines if "Source" in line), "Unknown")
-                description_lines = []
-                capture_description = False
-
-                for line in event_lines:
-                    if "Description:" in line:
-                        capture_description = True
-                        description_lines.append(line.split("Description:", 1)[1].strip())
-                    elif capture_description:
-                        if line.strip() == "":
-                            break  # Stop capturing on an empty line
-                        description_lines.append(line.strip())
-
-                description = " ".join(description_lines).strip() if description_lines else "No Description Found"
-                
-                description = clean_text(description)
-
-                # ✅ Fix: Replace problematic characters for ReportLab
-                description = " ".join(description_lines) if description_lines else "No Description Found"
-                description = clean_text(description)
-
-                level = next((line.split(":")[1].strip() for line in event_lines if "Level" in line), "Information")
-
-                log_style = error_style if "Error" in level else warning_style if "Warning" in level else info_style
-                formatted_logs.append((
-                    f"<b>Event ID:</b> {event_id}<br/>"
-                    f"<b>Timestamp:</b> {timestamp}<br/>"
-                    f"<b>Source:</b> {source}<br/>"
-                    f"<b>Description:</b> {description}<br/><br/>", 
-                    log_style
-                ))
+        for record in channel_logs.records:
+            timestamp = record.local_timestamp()
+            description = clean_text(record.description.split("\n\n", 1)[0]) if record.description else "No Description Found"
+            outcome = record_outcome(name, record)
+
+            log_style = error_style if "Error" in outcome else warning_style if "Warning" in outcome or "Failure" in outcome else info_style
+            formatted_logs.append((
+                f"<b>Event ID:</b> {record.event_id or 'Unknown'}<br/>"
+                f"<b>Timestamp:</b> {timestamp}<br/>"
+                f"<b>Source:</b> {escape(clean_text(record_source(name, record)))}<br/>"
+                f"<b>Description:</b> {escape(description)}<br/><br/>",
+                log_style
+            ))
 
         return formatted_logs
 
-    def add_log_section(title, logs):
+    def add_log_section(title, name, channel_logs):
         elements.append(Paragraph(f"<b>{title}</b>", heading_style))
         elements.append(Spacer(1, 5))
 
-        log_entries = format_logs_for_pdf(logs)
+        log_entries = format_logs_for_pdf(name, channel_logs)
         list_items = [ListItem(Paragraph(log[0], log[1])) for log in log_entries]
         elements.append(ListFlowable(list_items, bulletType="bullet"))
         elements.append(Spacer(1, 20))
 
-    add_log_section("<u>USB Logs</u>", get_usb_logs())
-    add_log_section("<u>Security Logs</u>", get_security_logs())
-    add_log_section("<u>System Logs</u>", get_system_logs())
-    add_log_section("<u>Application Logs</u>", get_application_logs())
-    add_log_section("<u>DNS Logs</u>", get_dns_logs())
+    logs = collect_report_logs()  # ✅ the five channels are fetched concurrently, as records
+    add_log_section("<u>USB Logs</u>", "usb", logs["usb"])
+    add_log_section("<u>Security Logs</u>", "security", logs["security"])
+    add_log_section("<u>System Logs</u>", "system", logs["system"])
+    add_log_section("<u>Application Logs</u>", "application", logs["application"])
+    add_log_section("<u>DNS Logs</u>", "dns", logs["dns"])
 
     # ✅ End of Report Section (on same page)
     elements.append(Spacer(1, 40))  # Small space before ending text
@@ -15,13 +15,9 @@ from system_information import (
     get_plug_and_play_status,
     get_geolocation_status
 )
-from log_manager import (
-    get_security_logs,
-    get_system_logs,
-    get_application_logs,
-    get_dns_logs,
-    get_usb_logs,
-)
+from log_manager import collect_report_logs, format_dns_cache_entries
+from logs_analysis import record_source, record_outcome
+from xml.sax.saxutils import escape
 from security_logs import (
     get_antivirus_status,
     get_firewall_status,
@@ -44,10 +40,13 @@ from smartphone_dongle_history import get_smartphone_dongle_history
 from extra_installed_programs import get_installed_programs
 from startup_apps import get_startup_programs
 from shared_folders import get_shared_folders
-from unwanted_softwares import detect_unwanted_software
+from unwanted_softwares import detect_unwanted_matches
 from remote_services import check_remote_services
 from service_checker import check_critical_services
 from security_scoring import calculate_security_health
+from logon_detector import detect_logon_anomalies
+from probe_executor import run_probes
+from audit_context import audit_run
 from datetime import datetime
 import re
 
@@ -186,6 +185,15 @@ def format_timestamp(timestamp):
         return timestamp  # Return as is if parsing fails
     
 def generate_pdf_report(user_name="", user_lab=""):
+    """ Build the report inside one audit run so every probe executes at most once. """
+    with audit_run() as audit_context:
+        _build_pdf_report(user_name, user_lab)
+        stats = audit_context.stats()
+
+    print(f"✅ Probe cache: {stats['misses']} probes run, {stats['hits']} reused")
+    return stats
+
+def _build_pdf_report(user_name, user_lab):
     filename = "System_Audit_Report.pdf"
     doc = SimpleDocTemplate(filename, pagesize=letter)
 
@@ -281,6 +289,53 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(desirable_table)
     elements.append(Spacer(1, 20))
 
+    # ✅ Run the remaining audit probes concurrently before building the sections
+    audit = run_probes({
+        "system_info": get_system_info,
+        "network_details": get_network_details,
+        "open_ports": get_open_ports,
+        "antivirus": get_antivirus_status,
+        "firewall": get_firewall_status,
+        "last_scan": get_last_scan_time,
+        "usb_control": get_usb_device_control_status,
+        "autoplay": get_autoplay_status,
+        "rdp": get_rdp_status,
+        "telnet": get_telnet_status,
+        "default_share": get_default_share_status,
+        "shared_folder_status": get_shared_folder_status,
+        "bios_password": get_bios_password_status,
+        "browser_passwords": check_browser_saved_passwords,
+        "login_password": get_login_password_status,
+        "password_policy": get_password_policy_status,
+        "lockout_policy": get_lockout_policy_status,
+        "user_accounts": get_all_user_accounts,
+        "windows_updates": get_last_windows_update,
+        "remote_services": check_remote_services,
+        "critical_services": check_critical_services,
+        "desktop_files": get_desktop_files,
+        "usb_devices": get_usb_history,
+        "smartphones": get_smartphone_dongle_history,
+        "installed_programs": get_installed_programs,
+        "startup_apps": get_startup_programs,
+        "shared_folders": get_shared_folders,
+        "unwanted_software": detect_unwanted_matches,
+        "logon_findings": detect_logon_anomalies,
+    }, defaults={
+        "system_info": {},
+        "network_details": {},
+        "open_ports": {"tcp": ["Error retrieving TCP ports."], "udp": ["Error retrieving UDP services."]},
+        "remote_services": {},
+        "critical_services": {},
+        "desktop_files": ("Could not retrieve desktop files.", 0),
+        "usb_devices": [],
+        "smartphones": [],
+        "installed_programs": [],
+        "startup_apps": [],
+        "shared_folders": [],
+        "unwanted_software": [],
+        "logon_findings": [],
+    })
+
     # ✅ Insert Page Break before System Information
     elements.append(PageBreak())
 
@@ -289,7 +344,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Spacer(1, 20))  # Space after title
 
     # ✅ System Information Section
-    system_info = get_system_info()
+    system_info = audit["system_info"]
     elements.append(Paragraph("<b><u>System Information</u></b>", heading_style))
     elements.append(Spacer(1, 5))  # Small space before table
 
@@ -331,7 +386,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Spacer(1, 20))  # Space after table
 
     # ✅ Collect Network Details in Table
-    network_details = get_network_details()
+    network_details = audit["network_details"]
     elements.append(Spacer(1, 5))
     elements.append(Paragraph("<b><u>Network Details</u></b>", heading_style))
     elements.append(Spacer(1, 10))  # Small space before table
@@ -378,27 +433,27 @@ def generate_pdf_report(user_name="", user_lab=""):
     ]
 
     # ✅ Get Open Ports Data
-    open_ports = get_open_ports()
+    open_ports = audit["open_ports"]
     open_ports_status = open_ports["tcp"]  # ✅ TCP Ports
     udp_services_status = open_ports["udp"]  # ✅ UDP Services
 
     # ✅ Populate table with serial numbers
     security_entries = [
         ["Timestamp", timestamp],
-        ["Antivirus Installed", get_antivirus_status()],
-        ["Windows Firewall Status", get_firewall_status()],
-        ["Last Windows Defender Scan Time", get_last_scan_time()],
-        ["USB Storage Device Access", get_usb_device_control_status()],
-        ["AutoPlay Status", get_autoplay_status()],
-        ["Remote Desktop Protocol (RDP)", get_rdp_status()],
-        ["Telnet", get_telnet_status()],
-        ["Default Share Status", get_default_share_status()],
-        ["Shared Folder Status", get_shared_folder_status()],
-        ["BIOS Password", get_bios_password_status()],
-        ["Saved Browser Passwords", check_browser_saved_passwords()],
-        ["Windows Login Password", get_login_password_status()],
-        ["Password Policy", get_password_policy_status()],
-        ["System Lockout Policy", get_lockout_policy_status()],
+        ["Antivirus Installed", audit["antivirus"]],
+        ["Windows Firewall Status", audit["firewall"]],
+        ["Last Windows Defender Scan Time", audit["last_scan"]],
+        ["USB Storage Device Access", audit["usb_control"]],
+        ["AutoPlay Status", audit["autoplay"]],
+        ["Remote Desktop Protocol (RDP)", audit["rdp"]],
+        ["Telnet", audit["telnet"]],
+        ["Default Share Status", audit["default_share"]],
+        ["Shared Folder Status", audit["shared_folder_status"]],
+        ["BIOS Password", audit["bios_password"]],
+        ["Saved Browser Passwords", audit["browser_passwords"]],
+        ["Windows Login Password", audit["login_password"]],
+        ["Password Policy", audit["password_policy"]],
+        ["System Lockout Policy", audit["lockout_policy"]],
         ["Open TCP Ports", "\n".join(open_ports_status) if open_ports_status else "No open TCP ports detected."],
         ["UDP Services", "\n".join(udp_services_status) if udp_services_status else "No active UDP services detected."],
     ]
@@ -434,14 +489,14 @@ def generate_pdf_report(user_name="", user_lab=""):
     # ✅ Users Accounts
     elements.append(Paragraph("<b><u>Users Accounts</u></b>", heading_style))
     elements.append(Spacer(1, 5))
-    elements.append(Paragraph(get_all_user_accounts(), body_style))
+    elements.append(Paragraph(audit["user_accounts"], body_style))
     elements.append(Spacer(1, 20))
 
     # ✅ Last Windows Update
     elements.append(Paragraph("<b><u>Last Windows Update</u></b>", heading_style))
     elements.append(Spacer(1, 5))
 
-    updates = get_last_windows_update()
+    updates = audit["windows_updates"]
 
     if updates:
         # Regex split: lookahead for " - KB"
@@ -461,7 +516,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Spacer(1, 10))
 
     # ✅ Fetch service statuses
-    remote_services_status = check_remote_services()
+    remote_services_status = audit["remote_services"]
 
     # ✅ Display total count
     num_services = len(remote_services_status)
@@ -509,7 +564,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Spacer(1, 10))
 
     # ✅ Fetch service statuses
-    critical_services_status = check_critical_services()
+    critical_services_status = audit["critical_services"]
 
     # ✅ Display total count
     num_services = len(critical_services_status)
@@ -557,7 +612,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Spacer(1, 5))
 
     # Retrieve the desktop file list and count correctly
-    desktop_files, file_count = get_desktop_files()
+    desktop_files, file_count = audit["desktop_files"]
 
     # Display total number of desktop files first
     elements.append(Paragraph(f"<b>Number of Desktop Files: {file_count}</b>", body_style))
@@ -612,7 +667,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     )
 
     # ✅ USB Device History
-    usb_devices = get_usb_history()
+    usb_devices = audit["usb_devices"]
     elements.append(Paragraph("<b><u>USB Device Connection History</u></b>", heading_style))
     elements.append(Spacer(1, 5))
 
@@ -675,7 +730,7 @@ def generate_pdf_report(user_name="", user_lab=""):
             return timestamp  # Return as is if parsing fails
 
     # ✅ Smartphone / Dongle Connection History
-    smartphones = get_smartphone_dongle_history()
+    smartphones = audit["smartphones"]
     elements.append(Paragraph("<b><u>Smartphone and Dongle Connection History</u></b>", heading_style))
     elements.append(Spacer(1, 5))
 
@@ -721,7 +776,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Paragraph("<b><u>Installed Programs</u></b>", heading_style))
     elements.append(Spacer(1, 5))
 
-    installed_programs = get_installed_programs()
+    installed_programs = audit["installed_programs"]
     num_programs = len(installed_programs)
 
     # Display total number of installed programs
@@ -785,7 +840,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Paragraph("<b><u>Startup Applications</u></b>", heading_style))
     elements.append(Spacer(1, 5))
 
-    startup_apps = get_startup_programs()
+    startup_apps = audit["startup_apps"]
     num_startup_apps = len(startup_apps)
 
     # Display total number of startup applications
@@ -847,7 +902,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Paragraph("<b><u>Shared Folders</u></b>", heading_style))
     elements.append(Spacer(1, 5))
 
-    shared_folders = get_shared_folders()
+    shared_folders = audit["shared_folders"]
     num_shared_folders = len(shared_folders)
 
     # Display total number of shared folders
@@ -918,7 +973,7 @@ def generate_pdf_report(user_name="", user_lab=""):
     elements.append(Spacer(1, 10))
 
     # ✅ Detect unwanted software
-    unwanted_software_list = detect_unwanted_software() or []  # ✅ Prevent NoneType error
+    unwanted_software_list = audit["unwanted_software"] or []  # ✅ Prevent NoneType error
 
     # ✅ Display total count
     num_unwanted = len(unwanted_software_list)
@@ -927,14 +982,14 @@ def generate_pdf_report(user_name="", user_lab=""):
 
     if num_unwanted > 0:
         # ✅ Table Headers
-        data = [["S.No", "Software Name"]]
+        data = [["S.No", "Software Name", "Category", "Severity"]]
         
-        # ✅ Add detected software
-        for i, software in enumerate(unwanted_software_list, start=1):
-            data.append([str(i), software])
+        # ✅ Add detected software with the signature's category and severity (most severe first)
+        for i, match in enumerate(unwanted_software_list, start=1):
+            data.append([str(i), match.program, match.category, match.severity])
 
         # ✅ Define table column widths (Prevent Overflow)
-        unwanted_table = Table(data, colWidths=[50, 400])  
+        unwanted_table = Table(data, colWidths=[40, 230, 120, 60])  
 
         # ✅ Apply Styles
         unwanted_table.setStyle(TableStyle([
@@ -961,65 +1016,82 @@ def generate_pdf_report(user_name="", user_lab=""):
 
     elements.append(Spacer(1, 20))  # Space after table
 
+    # ✅ Logon Anomalies (brute force, spraying, lockouts, RDP) over the last 24 hours
+    elements.append(Paragraph("<b><u>Logon Anomalies (Last 24 Hours)</u></b>", heading_style))
+    elements.append(Spacer(1, 5))
+
+    logon_findings = audit["logon_findings"]
+    if logon_findings:
+        data = [["Severity", "Finding", "First Seen"]]
+        for finding in logon_findings:
+            data.append([finding.severity, Paragraph(escape(finding.message), body_style), finding.local_time.strftime("%Y-%m-%d %H:%M")])
+
+        findings_table = Table(data, colWidths=[60, 300, 100])
+        findings_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ]))
+
+        # ✅ Color the severity cell
+        for row_idx, finding in enumerate(logon_findings, start=1):
+            severity_color = colors.red if finding.severity == "High" else colors.orange if finding.severity == "Medium" else colors.green
+            findings_table.setStyle(TableStyle([
+                ('TEXTCOLOR', (0, row_idx), (0, row_idx), severity_color),
+            ]))
+
+        elements.append(findings_table)
+    else:
+        elements.append(Paragraph("<i>No suspicious logon activity detected.</i>", body_style))
+
+    elements.append(Spacer(1, 20))
+
     # ✅ Log Analysis with Color Coding
-    def format_logs_for_pdf(logs):
-        if not logs.strip():
+    def format_logs_for_pdf(name, channel_logs):
+        # ✅ Built straight from the collected EventRecords - no text to re-parse
+        if channel_logs.error:
+            return [(f"<b>Could not collect logs:</b> {escape(clean_text(channel_logs.error))}", error_style)]
+        if channel_logs.dns_cache is not None:
+            entries = format_dns_cache_entries(channel_logs.dns_cache).split("\n\n")
+            return [(clean_text(entry), info_style) for entry in entries if entry.strip()]
+        if not channel_logs.records:
             return [("<b>No logs found.</b>", info_style)]
 
-        # ✅ Correct split: split by double newline between events
-        events = logs.strip().split("---")
         formatted_logs = []
-
-        for event in events:
-            event = event.strip()
-            if event:
-                event_lines = event.split("\n")
-                event_id = next((line.split(":")[1].strip() for line in event_lines if "Event ID" in line), "Unknown")
-                timestamp_raw = next((line.split(":", 1)[1].strip() if ":" in line else "Unknown" for line in event_lines if "Timestamp" in line or "TimeCreated" in line or "Date" in line), "Unknown")
-                timestamp = format_timestamp(timestamp_raw)
-                source = next((line.split(":")[1].strip() for line in event_lines if "Source" in line or "Application" in line or "Driver" in line), "Unknown")
-                description_lines = []
-                capture_description = False
-
-                for line in event_lines:
-                    if "Description:" in line:
-                        capture_description = True
-                        description_lines.append(line.split("Description:", 1)[1].strip())
-                    elif capture_description:
-                        if line.strip() == "":
-                            break
-                        description_lines.append(line.strip())
-
-                description = " ".join(description_lines).strip() if description_lines else "No Description Found"
-                description = clean_text(description)
-
-                level = next((line.split(":")[1].strip() for line in event_lines if "Level" in line or "Status" in line or "Installation Status" in line), "Information")
-
-                log_style = error_style if "Error" in level else warning_style if "Warning" in level or "Failure" in level else info_style
-                formatted_logs.append((
-                    f"<b>Event ID:</b> {event_id}<br/>"
-                    f"<b>Timestamp:</b> {timestamp}<br/>"
-                    f"<b>Source:</b> {source}<br/>"
-                    f"<b>Description:</b> {description}<br/><br/>", 
-                    log_style
-                ))
+        for record in channel_logs.records:
+            timestamp = record.local_timestamp()
+            description = clean_text(record.description.split("\n\n", 1)[0]) if record.description else "No Description Found"
+            outcome = record_outcome(name, record)
+
+            log_style = error_style if "Error" in outcome else warning_style if "Warning" in outcome or "Failure" in outcome else info_style
+            formatted_logs.append((
+                f"<b>Event ID:</b> {record.event_id or 'Unknown'}<br/>"
+                f"<b>Timestamp:</b> {timestamp}<br/>"
+                f"<b>Source:</b> {escape(clean_text(record_source(name, record)))}<br/>"
+                f"<b>Description:</b> {escape(description)}<br/><br/>",
+                log_style
+            ))
 
         return formatted_logs
 
-    def add_log_section(title, logs):
+    def add_log_section(title, name, channel_logs):
         elements.append(Paragraph(f"<b>{title}</b>", heading_style))
         elements.append(Spacer(1, 5))
 
-        log_entries = format_logs_for_pdf(logs)
+        log_entries = format_logs_for_pdf(name, channel_logs)
         list_items = [ListItem(Paragraph(log[0], log[1])) for log in log_entries]
         elements.append(ListFlowable(list_items, bulletType="bullet"))
         elements.append(Spacer(1, 20))
 
-    add_log_section("<u>USB Logs</u>", get_usb_logs())
-    add_log_section("<u>Security Logs</u>", get_security_logs())
-    add_log_section("<u>System Logs</u>", get_system_logs())
-    add_log_section("<u>Application Logs</u>", get_application_logs())
-    add_log_section("<u>DNS Logs</u>", get_dns_logs())
+    logs = collect_report_logs()  # ✅ the five channels are fetched concurrently, as records
+    add_log_section("<u>USB Logs</u>", "usb", logs["usb"])
+    add_log_section("<u>Security Logs</u>", "security", logs["security"])
+    add_log_section("<u>System Logs</u>", "system", logs["system"])
+    add_log_section("<u>Application Logs</u>", "application", logs["application"])
+    add_log_section("<u>DNS Logs</u>", "dns", logs["dns"])
 
     # ✅ End of Report Section (on same page)
     elements.append(Spacer(1, 40))  # Small space before ending text
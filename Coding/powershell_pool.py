@@ -0,0 +1,315 @@
+import atexit
+import base64
+import json
+import queue
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import NamedTuple
+import probe_executor
+
+# ✅ Starting powershell.exe costs hundreds of milliseconds, so keep a few hosts alive
+DEFAULT_POOL_SIZE = 4
+DEFAULT_COMMAND_TIMEOUT = 60  # seconds
+MAX_COMMANDS_PER_SESSION = 250  # recycle hosts now and then to keep memory in check
+
+
+class ShellError(Exception):
+    """ Raised when a pooled shell dies or stops following the protocol. """
+
+
+class ShellResult(NamedTuple):
+    output: str        # the command's regular output
+    error_output: str  # text of its error records, kept apart like stderr
+    error_count: int   # error records, non-terminating ones included
+    failed: bool       # terminating error or non-zero native exit code
+
+
+class PowerShellDialect:
+    """
+    Line protocol for `powershell -Command -`: each command is sent as one line and the host
+    answers with the command output, a `<marker> stderr` line, the text of the error records,
+    then a `<marker> <error count> <failed>` line.
+    """
+
+    argv = ["powershell", "-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-Command", "-"]
+    startup = "[Console]::OutputEncoding = [Text.Encoding]::UTF8\n"
+
+    def frame(self, command, marker):
+        # Base64 keeps quotes and newlines in the command from breaking the one-line framing
+        encoded = base64.b64encode(command.encode("utf-8")).decode("ascii")
+        return (
+            "$Error.Clear(); $global:LASTEXITCODE = 0; $__failed = $false; "
+            "$__errors = New-Object System.Collections.ArrayList; "
+            f"try {{ Invoke-Expression ([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('{encoded}'))) 2>&1 "
+            "| ForEach-Object { if ($_ -is [Management.Automation.ErrorRecord]) { [void]$__errors.Add($_) } else { $_ } } "
+            "| Out-String -Stream -Width 4096 } "
+            "catch { $__failed = $true; [void]$__errors.Add($_) }; "
+            f"Write-Output '{marker} stderr'; "
+            "$__errors | Out-String -Stream -Width 4096; "
+            f"Write-Output ('{marker} ' + $Error.Count + ' ' + [int]($__failed -or $LASTEXITCODE -ne 0))\n"
+        )
+
+    def to_json(self, command):
+        return f"{command} | ConvertTo-Json -Compress -Depth 4"
+
+
+_STAND_IN_SOURCE = r'''
+import contextlib, io, json, sys, traceback
+namespace = {}
+for line in sys.stdin:
+    request = json.loads(line)
+    buffer, error_buffer = io.StringIO(), io.StringIO()
+    errors = 0
+    with contextlib.redirect_stdout(buffer):
+        try:
+            exec(request["command"], namespace)
+        except Exception:
+            errors = 1
+            traceback.print_exc(file=error_buffer)
+    for text in (buffer.getvalue(), f"{request['marker']} stderr\n", error_buffer.getvalue()):
+        sys.stdout.write(text if not text or text.endswith("\n") else text + "\n")
+    sys.stdout.write(f"{request['marker']} {errors} {errors}\n")
+    sys.stdout.flush()
+'''
+
+
+class PythonStandInDialect:
+    """ A Python process speaking the same protocol, so the pool can be driven without PowerShell. """
+
+    argv = [sys.executable, "-u", "-c", _STAND_IN_SOURCE]
+    startup = ""
+
+    def frame(self, command, marker):
+        return json.dumps({"command": command, "marker": marker}) + "\n"
+
+    def to_json(self, command):
+        return f"import json as _json; print(_json.dumps({command}))"
+
+
+class ShellSession:
+    """ One long-lived shell process plus a reader thread feeding its output lines to a queue. """
+
+    def __init__(self, dialect):
+        self.dialect = dialect
+        self.commands_run = 0
+        self.broken = False
+        self.process = subprocess.Popen(
+            dialect.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, daemon=True).start()
+        if dialect.startup:
+            self._send(dialect.startup)
+
+    def _pump(self):
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)  # EOF
+
+    def _send(self, text):
+        try:
+            self.process.stdin.write(text)
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            self.broken = True
+            raise ShellError(f"Shell input closed: {e}")
+
+    def alive(self):
+        return not self.broken and self.process.poll() is None
+
+    def execute(self, command, timeout):
+        """ Run one command and return its ShellResult. Raises TimeoutExpired on a hang. """
+        marker = f"__POOL_DONE_{uuid.uuid4().hex}__"
+        self._send(self.dialect.frame(command, marker))
+        deadline = time.monotonic() + timeout
+        output, error_output = [], []
+        target = output
+
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = self._lines.get(timeout=max(0.0, remaining))
+            except queue.Empty:
+                self.broken = True
+                raise subprocess.TimeoutExpired(command, timeout, output="".join(output))
+
+            if line is None:
+                self.broken = True
+                raise ShellError("Shell exited while running a command")
+            if line.startswith(marker):
+                fields = line.split()
+                if fields[1:] == ["stderr"]:
+                    target = error_output
+                    continue
+                self.commands_run += 1
+                return ShellResult("".join(output), "".join(error_output), int(fields[1]), fields[2] != "0")
+            target.append(line)
+
+    def close(self):
+        self.broken = True
+        try:
+            self.process.kill()
+            self.process.wait(timeout=5)
+        except Exception:
+            pass
+
+
+class ShellPool:
+    """
+    Pool of long-lived shell sessions. At most `size` commands are in flight at once; a
+    session that hangs past its timeout or dies is killed and replaced on the next checkout.
+    """
+
+    def __init__(self, dialect=None, size=DEFAULT_POOL_SIZE, command_timeout=DEFAULT_COMMAND_TIMEOUT,
+                 max_commands_per_session=MAX_COMMANDS_PER_SESSION):
+        self.dialect = dialect or PowerShellDialect()
+        self.size = size
+        self.command_timeout = command_timeout
+        self.max_commands_per_session = max_commands_per_session
+        self.restarts = 0
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _checkout(self):
+        with self._lock:
+            while self._idle:
+                session = self._idle.pop()
+                if session.alive():
+                    return session
+                session.close()
+        return ShellSession(self.dialect)
+
+    def _checkin(self, session):
+        with self._lock:
+            if self._closed or not session.alive() or session.commands_run >= self.max_commands_per_session:
+                session.close()
+            else:
+                self._idle.append(session)
+
+    def run(self, command, timeout=None):
+        """ Run a command on a pooled session and return its ShellResult. """
+        timeout = self.command_timeout if timeout is None else timeout
+        remaining = probe_executor.remaining_time()
+        # ✅ Inside a probe, waiting for a session counts against its deadline; past it, nothing runs
+        if remaining == 0 or not self._slots.acquire(timeout=remaining):
+            raise subprocess.TimeoutExpired(command, remaining)
+        try:
+            remaining = probe_executor.remaining_time()
+            if remaining is not None:
+                timeout = min(timeout, remaining)
+            session = self._checkout()
+            try:
+                result = session.execute(command, timeout)
+            except BaseException:
+                # Whatever went wrong (hang, dead shell, broken pipe, decode error), the session's
+                # state is unknown: never hand it out again
+                session.close()
+                with self._lock:
+                    self.restarts += 1
+                raise
+            self._checkin(session)
+            return result
+        finally:
+            self._slots.release()
+
+    def health_check(self, timeout=5):
+        """ Ping every idle session, drop the ones that don't answer and return how many are healthy. """
+        with self._lock:
+            sessions, self._idle = self._idle, []
+
+        healthy = []
+        for session in sessions:
+            try:
+                if session.alive():
+                    session.execute(self.dialect.to_json("1"), timeout)
+                    healthy.append(session)
+                    continue
+            except (subprocess.TimeoutExpired, ShellError):
+                pass
+            session.close()
+            with self._lock:
+                self.restarts += 1
+
+        with self._lock:
+            self._idle.extend(healthy)
+        return len(healthy)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            session.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """ Shared PowerShell pool, started on first use. """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ShellPool()
+        return _pool
+
+
+def set_pool(pool):
+    """ Replace the shared pool (e.g. with a PythonStandInDialect pool) and return the previous one. """
+    global _pool
+    with _pool_lock:
+        previous, _pool = _pool, pool
+    return previous
+
+
+def close_pool():
+    pool = set_pool(None)
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(close_pool)
+
+
+def run_powershell(command, timeout=None, check=True):
+    """
+    Run a PowerShell command on the shared pool and return its output (error records are left
+    out, like stderr with subprocess.check_output). With `check`, CalledProcessError is raised
+    when the command failed: a terminating error, a non-zero native exit code, or errors and no
+    output at all. Non-terminating errors next to real output are not a failure; their text is
+    in the exception's `stderr` when one is raised.
+    """
+    # A fake/alternate command backend gets the classic one-process command line instead
+    if not isinstance(probe_executor.get_backend(), probe_executor.SubprocessBackend):
+        if not check:
+            return probe_executor.run_command(f'powershell -Command "{command}"', timeout=timeout).stdout
+        return probe_executor.check_output(f'powershell -Command "{command}"', timeout=timeout)
+
+    remaining = probe_executor.remaining_time()
+    if remaining is not None:
+        timeout = remaining if timeout is None else min(timeout, remaining)
+
+    result = get_pool().run(command, timeout=timeout)
+    if check and (result.failed or (result.error_count and not result.output.strip())):
+        raise subprocess.CalledProcessError(1, command, output=result.output, stderr=result.error_output)
+    return result.output
+
+
+def run_powershell_json(command, timeout=None):
+    """ Run a command whose objects are converted to JSON in the shell and return the decoded value. """
+    pool = get_pool()
+    output = run_powershell(pool.dialect.to_json(command), timeout=timeout).strip()
+    return json.loads(output) if output else None
@@ -0,0 +1,258 @@
+import codecs
+import contextvars
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# ✅ Most probes just sit on a powershell/wmic process, so run several at once
+DEFAULT_MAX_PARALLEL = 8
+DEFAULT_PROBE_TIMEOUT = 90  # seconds per probe
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_settings = {"max_parallel": DEFAULT_MAX_PARALLEL, "probe_timeout": DEFAULT_PROBE_TIMEOUT}
+_command_slots = threading.BoundedSemaphore(DEFAULT_MAX_PARALLEL)
+_probe_state = threading.local()
+
+
+class SubprocessBackend:
+    """ Runs probe commands through the real subprocess module. """
+
+    def run(self, command, timeout=None, stderr_to_stdout=False):
+        return subprocess.run(
+            command,
+            shell=isinstance(command, str),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if stderr_to_stdout else subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            encoding="utf-8",
+            errors="replace",
+            timeout=timeout,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+
+    def stream(self, command, timeout=None):
+        """
+        Yield the command's stdout as text chunks while it runs; the process is killed on close/timeout.
+        Once the output ends, a non-zero exit raises CalledProcessError with the command's stderr text
+        (e.g. wevtutil's "Access is denied."), and a kill at the timeout raises TimeoutExpired.
+        """
+        process = subprocess.Popen(
+            command,
+            shell=isinstance(command, str),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+        # Drained on its own thread, so a chatty stderr can't block the process while stdout is read
+        errors = []
+        error_reader = threading.Thread(target=lambda: errors.append(process.stderr.read()), daemon=True)
+        error_reader.start()
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            process.kill()
+
+        killer = threading.Timer(timeout, kill) if timeout is not None else None
+        if killer:
+            killer.daemon = True
+            killer.start()
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            while True:
+                data = process.stdout.read1(STREAM_CHUNK_SIZE)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if text:
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+        finally:
+            if killer:
+                killer.cancel()
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+            error_reader.join()
+            process.stderr.close()
+
+        stderr = b"".join(errors).decode("utf-8", errors="replace")
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(command, timeout, stderr=stderr)
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr)
+
+
+class FakeBackend:
+    """
+    Canned command outputs so probes can be exercised on hosts without Windows tooling.
+    `responses` maps a command string to its stdout, a (stdout, returncode[, stderr]) tuple or an exception.
+    """
+
+    def __init__(self, responses=None, delay=0.0):
+        self.responses = dict(responses or {})
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def run(self, command, timeout=None, stderr_to_stdout=False):
+        key = command if isinstance(command, str) else subprocess.list2cmdline(command)
+        with self._lock:
+            self.calls.append(key)
+
+        if self.delay:
+            if timeout is not None and self.delay > timeout:
+                time.sleep(timeout)
+                raise subprocess.TimeoutExpired(command, timeout)
+            time.sleep(self.delay)
+
+        response = self.responses.get(key, "")
+        if isinstance(response, BaseException):
+            raise response
+        output, returncode, stderr = (response + ("",))[:3] if isinstance(response, tuple) else (response, 0, "")
+        return subprocess.CompletedProcess(command, returncode, stdout=output, stderr=stderr)
+
+    def stream(self, command, timeout=None, chunk_size=4096):
+        """ Canned stdout handed out in small chunks, like a pipe would; a non-zero exit raises at the end. """
+        result = self.run(command, timeout=timeout)
+        output = result.stdout
+        for start in range(0, len(output), chunk_size):
+            yield output[start:start + chunk_size]
+        if result.returncode:
+            raise subprocess.CalledProcessError(result.returncode, command, stderr=result.stderr)
+
+
+_backend = SubprocessBackend()
+
+
+def set_backend(backend):
+    """ Swap the command backend (e.g. a FakeBackend) and return the previous one. """
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
+
+
+def get_backend():
+    return _backend
+
+
+def configure(max_parallel=None, probe_timeout=None):
+    """ Change the global parallelism limit and/or the default per-probe timeout. """
+    global _command_slots
+    if max_parallel is not None:
+        _settings["max_parallel"] = max(1, int(max_parallel))
+        _command_slots = threading.BoundedSemaphore(_settings["max_parallel"])
+    if probe_timeout is not None:
+        _settings["probe_timeout"] = probe_timeout
+
+
+def remaining_time():
+    """ Seconds left before the probe running on this thread hits its deadline. """
+    deadline = getattr(_probe_state, "deadline", None)
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def run_command(command, timeout=None, stderr_to_stdout=False):
+    """
+    Run one external command through the active backend and return a CompletedProcess
+    with text output. At most `max_parallel` commands run at the same time, and inside
+    a probe the command never outlives the probe's deadline.
+    """
+    remaining = remaining_time()
+    slots = _command_slots
+    # ✅ Waiting for a slot counts against the deadline too; once it has passed, nothing is started
+    if remaining == 0 or not slots.acquire(timeout=remaining):
+        raise subprocess.TimeoutExpired(command, remaining)
+    try:
+        remaining = remaining_time()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return _backend.run(command, timeout=timeout, stderr_to_stdout=stderr_to_stdout)
+    finally:
+        slots.release()
+
+
+def check_output(command, timeout=None, stderr_to_stdout=False):
+    """ Like subprocess.check_output(..., text=True) but routed through run_command. """
+    result = run_command(command, timeout=timeout, stderr_to_stdout=stderr_to_stdout)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, command, output=result.stdout, stderr=result.stderr)
+    return result.stdout
+
+
+def stream_command(command, timeout=None):
+    """
+    Iterate over a command's stdout as it is produced (text chunks), for outputs too big to
+    hold in memory. Inside a probe the process is killed at the probe's deadline. Streams don't
+    take one of the `max_parallel` command slots, since the consumer decides how long they stay open.
+    """
+    remaining = remaining_time()
+    if remaining is not None:
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    return _backend.stream(command, timeout=timeout)
+
+
+def run_probes(probes, max_workers=None, timeout=None, defaults=None):
+    """
+    Run a dict of {name: callable} concurrently and return {name: result} in the same order.
+
+    - A probe that raises gets its `defaults` entry, or an "Error: ..." string.
+    - A probe still running after `timeout` seconds is abandoned the same way; commands it
+      started through run_command are killed when the deadline passes.
+    """
+    timeout = _settings["probe_timeout"] if timeout is None else timeout
+    max_workers = max_workers or _settings["max_parallel"]
+    defaults = defaults or {}
+    outer_deadline = getattr(_probe_state, "deadline", None)
+
+    if not probes:
+        return {}
+
+    started = {}
+
+    def call(name, probe):
+        deadline = time.monotonic() + timeout
+        if outer_deadline is not None:
+            deadline = min(deadline, outer_deadline)
+        started[name] = deadline
+        _probe_state.deadline = deadline
+        try:
+            return probe()
+        finally:
+            _probe_state.deadline = None
+
+    results = {}
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(probes)), thread_name_prefix="probe")
+    try:
+        # ✅ Each worker runs in a copy of the caller's context, so it joins the caller's audit run
+        futures = {pool.submit(contextvars.copy_context().run, call, name, probe): name for name, probe in probes.items()}
+        pending = set(futures)
+
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = defaults.get(name, f"Error: {e}")
+
+            now = time.monotonic()
+            for future in list(pending):
+                name = futures[future]
+                if name in started and now > started[name]:
+                    pending.discard(future)
+                    results[name] = defaults.get(name, f"Error: probe timed out after {timeout}s")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return {name: results[name] for name in probes}
@@ -0,0 +1,678 @@
+import gzip
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import NamedTuple
+import registry_backend
+from registry_backend import (HKEY_CURRENT_USER, HKEY_LOCAL_MACHINE, KEY_READ, REG_BINARY, REG_DWORD, REG_EXPAND_SZ,
+                              REG_MULTI_SZ, REG_QWORD, REG_SZ, FakeKey)
+
+# ✅ Read collected SYSTEM / SOFTWARE / NTUSER.DAT hive files directly (no Windows needed), behind
+# winreg's function names, so the registry probes run unchanged on a Linux analysis box
+HIVE_SIGNATURE = b"regf"
+BIN_SIGNATURE = b"hbin"
+BASE_BLOCK_SIZE = 4096
+HBIN_HEADER_SIZE = 32
+BIG_DATA_SEGMENT = 16344  # bytes per "db" segment; longer values are split up (hive format 1.4+)
+NO_CELL = 0xFFFFFFFF
+KEY_COMP_NAME = 0x0020    # nk name stored as Latin-1 instead of UTF-16
+VALUE_COMP_NAME = 0x0001  # same for vk names
+DATA_INLINE = 0x80000000  # vk data of 4 bytes or less is kept in the data offset field itself
+LIST_LIMIT = 500          # entries per subkey list the sample writer puts under one "ri"
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_u16 = struct.Struct("<H").unpack_from
+_u32 = struct.Struct("<I").unpack_from
+_NK = struct.Struct("<2sHQ8xI4xI4xII28xH")  # sig, flags, written, subkeys, subkey list, values, value list, name size
+_VK = struct.Struct("<2sHIIIH")              # sig, name size, data size, data offset, type, flags
+
+
+class RegfError(Exception):
+    """ Raised for structures that don't match the REGF format. """
+
+
+class _ValueCell(NamedTuple):
+    name: str
+    type: int
+    size: int   # raw vk data size, DATA_INLINE bit included
+    data: int   # data cell offset, or the inline bytes
+
+
+class _KeyNode:
+    """ A parsed nk cell. Its subkey and value lists are read the first time they are asked for. """
+
+    __slots__ = ("offset", "name", "last_written", "subkey_count", "subkeys_list", "value_count", "values_list",
+                 "subkeys", "subkey_index", "values", "value_index")
+
+    def __init__(self, offset, name, last_written, subkey_count, subkeys_list, value_count, values_list):
+        self.offset = offset
+        self.name = name
+        self.last_written = last_written
+        self.subkey_count = subkey_count
+        self.subkeys_list = subkeys_list
+        self.value_count = value_count
+        self.values_list = values_list
+        self.subkeys = None       # [subkey cell offset] in stored (sorted) order
+        self.subkey_index = None  # lower-cased name -> subkey cell offset
+        self.values = None        # [_ValueCell] in stored order
+        self.value_index = None   # lower-cased name -> _ValueCell
+
+
+def decode_value(raw, value_type):
+    """ Value bytes -> what winreg returns for that type. """
+    if value_type == REG_SZ or value_type == REG_EXPAND_SZ:
+        return raw[:len(raw) & ~1].decode("utf-16-le", "replace").split("\x00", 1)[0]
+    if value_type == REG_MULTI_SZ:
+        strings = raw[:len(raw) & ~1].decode("utf-16-le", "replace").split("\x00")
+        while strings and not strings[-1]:
+            strings.pop()
+        return strings
+    if value_type == REG_DWORD:
+        return int.from_bytes(raw[:4], "little")
+    if value_type == REG_QWORD:
+        return int.from_bytes(raw[:8], "little")
+    return bytes(raw) or None
+
+
+class Hive:
+    """
+    Memory-mapped hive file. Cells are parsed on first access and cached by offset; a key's
+    subkey list and name index are only built when that key is enumerated or searched, so
+    opening one path reads a handful of cells whatever the size of the hive.
+
+    Transaction logs (.LOG1/.LOG2) are not replayed: `dirty` tells when the file has pending writes.
+    Caches are filled idempotently, so concurrent readers at worst parse a cell twice.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise RegfError(f"{path} is empty")
+        buf = self._map
+        if len(buf) < BASE_BLOCK_SIZE + HBIN_HEADER_SIZE or buf[:4] != HIVE_SIGNATURE:
+            self.close()
+            raise RegfError(f"{path} is not a registry hive")
+        sequence_1, sequence_2, self.last_written, self.major, self.minor = struct.unpack_from("<IIQII", buf, 4)
+        self.dirty = sequence_1 != sequence_2
+        self.root_offset = _u32(buf, 36)[0]
+        self._nodes = {}  # nk cell offset -> _KeyNode
+        self.root = self.key(self.root_offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    # --- Cells -------------------------------------------------------------
+
+    def _cell(self, offset):
+        """ File position of a cell's data (offsets count from the first hive bin). """
+        pos = BASE_BLOCK_SIZE + offset
+        if offset == NO_CELL or pos + 4 > len(self._map):
+            raise RegfError(f"{self.path}: cell offset 0x{offset:x} out of range")
+        return pos + 4
+
+    def key(self, offset):
+        node = self._nodes.get(offset)
+        if node is None:
+            pos = self._cell(offset)
+            signature, flags, written, subkeys, subkeys_list, values, values_list, name_size = \
+                _NK.unpack_from(self._map, pos)
+            if signature != b"nk":
+                raise RegfError(f"{self.path}: expected a key node at 0x{offset:x}, got {signature!r}")
+            raw = self._map[pos + 76:pos + 76 + name_size]
+            name = raw.decode("latin-1") if flags & KEY_COMP_NAME else raw.decode("utf-16-le", "replace")
+            node = self._nodes[offset] = _KeyNode(offset, name, written, subkeys, subkeys_list, values, values_list)
+        return node
+
+    def _list_offsets(self, offset, out, nested=False):
+        """ Append the nk offsets of an lf / lh / li subkey list (or of every list under an ri). """
+        buf = self._map
+        pos = self._cell(offset)
+        signature, count = buf[pos:pos + 2], _u16(buf, pos + 2)[0]
+        if signature == b"lf" or signature == b"lh":  # (offset, name hint / hash) pairs
+            out.extend(struct.unpack_from(f"<{count * 2}I", buf, pos + 4)[::2])
+        elif signature == b"li":
+            out.extend(struct.unpack_from(f"<{count}I", buf, pos + 4))
+        elif signature == b"ri" and not nested:
+            for sublist in struct.unpack_from(f"<{count}I", buf, pos + 4):
+                self._list_offsets(sublist, out, nested=True)
+        else:
+            raise RegfError(f"{self.path}: unexpected subkey list {signature!r} at 0x{offset:x}")
+
+    # --- Keys --------------------------------------------------------------
+
+    def subkeys(self, node):
+        """ Cell offsets of a key's subkeys, in the hive's (sorted by name) order. """
+        if node.subkeys is None:
+            offsets = []
+            if node.subkey_count and node.subkeys_list != NO_CELL:
+                self._list_offsets(node.subkeys_list, offsets)
+            node.subkeys = offsets
+        return node.subkeys
+
+    def subkey(self, node, name):
+        """ The _KeyNode of a direct subkey (case-insensitive), or None. """
+        if node.subkey_index is None:
+            node.subkey_index = {self.key(offset).name.lower(): offset for offset in self.subkeys(node)}
+        offset = node.subkey_index.get(name.lower())
+        return None if offset is None else self.key(offset)
+
+    def current_control_set(self):
+        """ Number of the control set SYSTEM\\CurrentControlSet points to (Select\\Current), 1 if unknown. """
+        select = self.subkey(self.root, "Select")
+        current = select and self.value(select, "Current")
+        data = current and self.value_data(current)
+        return data if isinstance(data, int) and data else 1
+
+    # --- Values ------------------------------------------------------------
+
+    def values(self, node):
+        if node.values is None:
+            buf, cells = self._map, []
+            if node.value_count and node.values_list != NO_CELL:
+                for offset in struct.unpack_from(f"<{node.value_count}I", buf, self._cell(node.values_list)):
+                    pos = self._cell(offset)
+                    signature, name_size, size, data, value_type, flags = _VK.unpack_from(buf, pos)
+                    if signature != b"vk":
+                        raise RegfError(f"{self.path}: expected a value at 0x{offset:x}, got {signature!r}")
+                    raw = buf[pos + 20:pos + 20 + name_size]
+                    name = raw.decode("latin-1") if flags & VALUE_COMP_NAME else raw.decode("utf-16-le", "replace")
+                    cells.append(_ValueCell(name, value_type, size, data))
+            node.values = cells
+        return node.values
+
+    def value(self, node, name):
+        """ The _ValueCell of a value (case-insensitive, "" is the default value), or None. """
+        if node.value_index is None:
+            node.value_index = {cell.name.lower(): cell for cell in self.values(node)}
+        return node.value_index.get(name.lower())
+
+    def value_data(self, cell):
+        buf = self._map
+        length = cell.size & ~DATA_INLINE
+        if cell.size & DATA_INLINE:
+            raw = struct.pack("<I", cell.data)[:min(length, 4)]
+        else:
+            pos = self._cell(cell.data)
+            if length > BIG_DATA_SEGMENT and buf[pos:pos + 2] == b"db":
+                count, segments = _u16(buf, pos + 2)[0], _u32(buf, pos + 4)[0]
+                parts = []
+                for segment in struct.unpack_from(f"<{count}I", buf, self._cell(segments)):
+                    start = self._cell(segment)
+                    parts.append(buf[start:start + min(BIG_DATA_SEGMENT, length - BIG_DATA_SEGMENT * len(parts))])
+                raw = b"".join(parts)
+            else:
+                raw = buf[pos:pos + length]
+        return decode_value(raw, cell.type)
+
+
+class OfflineKey:
+    """ An open key of an OfflineRegistry (what winreg.OpenKey's handle is for the live registry). """
+
+    __slots__ = ("hive", "node", "path")
+
+    def __init__(self, hive, node, path=None):
+        self.hive = hive
+        self.node = node
+        self.path = path  # (predefined key, parts) for keys above the mount points, e.g. HKLM itself
+
+    def Close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _not_found():
+    return FileNotFoundError(2, "The system cannot find the file specified")
+
+
+def _no_more_data():
+    return OSError(259, "No more data is available")
+
+
+class OfflineRegistry:
+    """
+    winreg-compatible reader over mounted hive files: HKLM\\SYSTEM, HKLM\\SOFTWARE, HKCU, ... each
+    map to a hive's root key, and SYSTEM\\CurrentControlSet follows Select\\Current like on a live PC.
+    Hives are read-only; SetValueEx raises PermissionError.
+    """
+
+    def __init__(self):
+        self.mounts = {}  # predefined key -> {lower-cased path parts: Hive}
+        self._opened = []
+
+    def mount(self, root, path, hive):
+        """ Serve `hive` (a Hive or a file path) at root\\path, e.g. mount(HKEY_LOCAL_MACHINE, "SYSTEM", "SYSTEM"). """
+        if not isinstance(hive, Hive):
+            hive = Hive(hive)
+            self._opened.append(hive)
+        self.mounts.setdefault(root, {})[tuple(part.lower() for part in path.split("\\") if part)] = hive
+        return hive
+
+    def close(self):
+        for hive in self._opened:
+            hive.close()
+        self._opened.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _child(self, hive, node, name):
+        child = hive.subkey(node, name)
+        if child is None and node is hive.root and name.lower() == "currentcontrolset":
+            child = hive.subkey(node, f"ControlSet{hive.current_control_set():03d}")
+        if child is None:
+            raise _not_found()
+        return child
+
+    def _virtual_children(self, root, parts):
+        depth, lowered = len(parts), tuple(part.lower() for part in parts)
+        return sorted({prefix[depth].upper() for prefix in self.mounts.get(root, {})
+                       if len(prefix) > depth and prefix[:depth] == lowered})
+
+    def _handle(self, key):
+        return key if isinstance(key, OfflineKey) else self.OpenKey(key, "")
+
+    # --- winreg interface ----------------------------------------------------
+
+    def OpenKey(self, key, sub_key, reserved=0, access=KEY_READ):
+        parts = [part for part in (sub_key or "").split("\\") if part]
+        if isinstance(key, OfflineKey):
+            if key.hive is None:
+                return self.OpenKey(key.path[0], "\\".join(key.path[1] + tuple(parts)))
+            hive, node = key.hive, key.node
+        else:
+            mounts = self.mounts.get(key, {})
+            lowered = tuple(part.lower() for part in parts)
+            for length in range(len(parts), -1, -1):  # longest mount point first
+                hive = mounts.get(lowered[:length])
+                if hive is not None:
+                    break
+            else:
+                if not self._virtual_children(key, parts):
+                    raise _not_found()
+                return OfflineKey(None, None, (key, tuple(parts)))
+            node, parts = hive.root, parts[length:]
+        for part in parts:
+            node = self._child(hive, node, part)
+        return OfflineKey(hive, node)
+
+    OpenKeyEx = OpenKey
+
+    def CloseKey(self, key):
+        pass
+
+    def EnumKey(self, key, index):
+        key = self._handle(key)
+        if key.hive is None:
+            names = self._virtual_children(*key.path)
+            if not 0 <= index < len(names):
+                raise _no_more_data()
+            return names[index]
+        offsets = key.hive.subkeys(key.node)
+        if not 0 <= index < len(offsets):
+            raise _no_more_data()
+        return key.hive.key(offsets[index]).name
+
+    def EnumValue(self, key, index):
+        key = self._handle(key)
+        cells = key.hive.values(key.node) if key.hive is not None else []
+        if not 0 <= index < len(cells):
+            raise _no_more_data()
+        cell = cells[index]
+        return cell.name, key.hive.value_data(cell), cell.type
+
+    def QueryInfoKey(self, key):
+        key = self._handle(key)
+        if key.hive is None:
+            return len(self._virtual_children(*key.path)), 0, 0
+        return key.node.subkey_count, key.node.value_count, key.node.last_written
+
+    def QueryValueEx(self, key, name):
+        key = self._handle(key)
+        cell = key.hive.value(key.node, name or "") if key.hive is not None else None
+        if cell is None:
+            raise _not_found()
+        return key.hive.value_data(cell), cell.type
+
+    def SetValueEx(self, key, name, reserved, value_type, value):
+        raise PermissionError(13, "Offline hives are read-only")
+
+
+@contextmanager
+def offline_hives(system=None, software=None, ntuser=None):
+    """
+    Point the registry backend at collected hive files for the duration of the block:
+
+        with audit_run(), offline_hives(system="SYSTEM", software="SOFTWARE", ntuser="NTUSER.DAT"):
+            devices = usb_devices_list.get_usb_history()
+    """
+    registry = OfflineRegistry()
+    try:
+        for root, path, hive in ((HKEY_LOCAL_MACHINE, "SYSTEM", system), (HKEY_LOCAL_MACHINE, "SOFTWARE", software),
+                                 (HKEY_CURRENT_USER, "", ntuser)):
+            if hive:
+                registry.mount(root, path, hive)
+        previous = registry_backend.set_backend(registry)
+        try:
+            yield registry
+        finally:
+            registry_backend.set_backend(previous)
+    finally:
+        registry.close()
+
+
+# --- Sample hive writer (benchmark / self-check only) ----------------------------------------
+
+def _name_bytes(name, compressed_flag):
+    try:
+        return name.encode("latin-1"), compressed_flag
+    except UnicodeEncodeError:
+        return name.encode("utf-16-le"), 0
+
+
+def _lh_hash(name):
+    value = 0
+    for char in name.upper():
+        value = (value * 37 + ord(char)) & 0xFFFFFFFF
+    return value
+
+
+def _encode_value(data, value_type):
+    if value_type == REG_SZ or value_type == REG_EXPAND_SZ:
+        return (data + "\x00").encode("utf-16-le")
+    if value_type == REG_MULTI_SZ:
+        return "".join(s + "\x00" for s in data).encode("utf-16-le") + b"\x00\x00"
+    if value_type == REG_DWORD:
+        return struct.pack("<I", data)
+    if value_type == REG_QWORD:
+        return struct.pack("<Q", data)
+    return bytes(data)
+
+
+class _SampleHiveWriter:
+    """ Minimal REGF writer: a single hive bin, lh subkey lists (under an ri past LIST_LIMIT), db for big values. """
+
+    def __init__(self, written):
+        self.bins = bytearray(HBIN_HEADER_SIZE)
+        self.written = written
+
+    def cell(self, payload):
+        size = (4 + len(payload) + 7) & ~7
+        offset = len(self.bins)
+        self.bins += struct.pack("<i", -size) + payload + bytes(size - 4 - len(payload))
+        return offset
+
+    def value(self, name, data, value_type):
+        raw = _encode_value(data, value_type)
+        if len(raw) <= 4:
+            size, data_offset = len(raw) | DATA_INLINE, int.from_bytes(raw.ljust(4, b"\x00"), "little")
+        elif len(raw) > BIG_DATA_SEGMENT:
+            segments = [self.cell(raw[i:i + BIG_DATA_SEGMENT]) for i in range(0, len(raw), BIG_DATA_SEGMENT)]
+            segment_list = self.cell(struct.pack(f"<{len(segments)}I", *segments))
+            size, data_offset = len(raw), self.cell(struct.pack("<2sHI", b"db", len(segments), segment_list))
+        else:
+            size, data_offset = len(raw), self.cell(raw)
+        encoded, flags = _name_bytes(name, VALUE_COMP_NAME)
+        return self.cell(_VK.pack(b"vk", len(encoded), size, data_offset, value_type, flags) + b"\x00\x00" + encoded)
+
+    def subkey_list(self, children):
+        """ children: [(name, nk offset)] sorted like Windows sorts them (upper-cased name). """
+        lists = []
+        for i in range(0, len(children), LIST_LIMIT):
+            chunk = children[i:i + LIST_LIMIT]
+            entries = [n for name, offset in chunk for n in (offset, _lh_hash(name))]
+            lists.append(self.cell(struct.pack(f"<2sH{len(entries)}I", b"lh", len(chunk), *entries)))
+        if len(lists) == 1:
+            return lists[0]
+        return self.cell(struct.pack(f"<2sH{len(lists)}I", b"ri", len(lists), *lists))
+
+    def key(self, fake_key, flags=KEY_COMP_NAME):
+        children = sorted(((child.name, self.key(child)) for child in fake_key.subkey_list),
+                          key=lambda child: child[0].upper())
+        values = [self.value(*value) for value in fake_key.value_list]
+        subkeys_list = self.subkey_list(children) if children else NO_CELL
+        values_list = self.cell(struct.pack(f"<{len(values)}I", *values)) if values else NO_CELL
+
+        encoded, flags = _name_bytes(fake_key.name, flags)
+        offset = self.cell(struct.pack(
+            "<2sHQ15IHH", b"nk", flags, self.written, 0, NO_CELL, len(children), 0, subkeys_list, NO_CELL,
+            len(values), values_list, NO_CELL, NO_CELL, max((len(name) * 2 for name, _ in children), default=0),
+            0, max((len(value[0]) * 2 for value in fake_key.value_list), default=0), 0, 0, len(encoded), 0,
+        ) + encoded)
+        for _, child in children:
+            struct.pack_into("<I", self.bins, child + 4 + 16, offset)  # parent link
+        return offset
+
+    def finish(self, root_offset):
+        end = len(self.bins)
+        size = (end + BASE_BLOCK_SIZE - 1) // BASE_BLOCK_SIZE * BASE_BLOCK_SIZE
+        if size > end:
+            self.bins += struct.pack("<i", size - end) + bytes(size - end - 4)  # trailing free cell
+        self.bins[:HBIN_HEADER_SIZE] = struct.pack("<4sIIQQI", BIN_SIGNATURE, 0, size, 0, self.written, 0)
+
+        base = bytearray(BASE_BLOCK_SIZE)
+        struct.pack_into("<4sIIQIIIIIII", base, 0, HIVE_SIGNATURE, 1, 1, self.written, 1, 5, 0, 1,
+                         root_offset, size, 1)
+        checksum = 0
+        for word in struct.unpack_from("<127I", base):
+            checksum ^= word
+        struct.pack_into("<I", base, 508, checksum or 1)
+        return bytes(base) + bytes(self.bins)
+
+
+def write_sample_hive(path, keys, root_name="ROOT"):
+    """ Write a hive file from FakeRegistry-style {r"path\\to\\key": {name: data}}, paths relative to the hive root. """
+    root = FakeKey(root_name)
+    for key_path, values in keys.items():
+        key = root
+        for part in filter(None, key_path.split("\\")):
+            key = key.child(part, create=True)
+        for name, data in values.items():
+            key.set_value(name, data)
+    writer = _SampleHiveWriter(int((time.time() + 11_644_473_600) * 10_000_000))
+    root_offset = writer.key(root, KEY_COMP_NAME | 0x0004)  # KEY_HIVE_ENTRY
+    with open(path, "wb") as f:
+        f.write(writer.finish(root_offset))
+
+
+def _sample_hives(programs, devices):
+    """ {hive name: keys} for a small but realistic PC: USB history, services, uninstall entries, Run keys. """
+    control_set = r"ControlSet001"
+    system = {r"Select": {"Current": 1, "Default": 1, "LastKnownGood": 2},
+              rf"{control_set}\Services\USBSTOR": {"Start": 4, "Type": 1, "ImagePath": r"\SystemRoot\System32\drivers\USBSTOR.SYS"},
+              rf"{control_set}\Services\cdrom": {"Start": 1},
+              rf"{control_set}\Services\LanmanServer\Parameters": {"AutoShareWks": 0, "NullSessionPipes": ["srvsvc"]},
+              r"ControlSet002\Services\USBSTOR": {"Start": 3}}
+    for i in range(devices):
+        device = rf"{control_set}\Enum\USBSTOR\Disk&Ven_{['SanDisk', 'Kingston', 'HP'][i % 3]}&Prod_Model{i // 3}&Rev_1.00"
+        values = {"DeviceDesc": "@disk.inf,%disk_devdesc%;Disk drive", "Capabilities": 16,
+                  "HardwareID": [rf"USBSTOR\Disk{i}", r"GenericMass"]}
+        if i % 4:
+            values["FriendlyName"] = f"USB Flash Drive {i} USB Device"
+        system[rf"{device}\{i:012X}&0"] = values
+
+    software = {r"Microsoft\Windows\CurrentVersion\Run": {"SecurityHealth": r"%windir%\system32\SecurityHealthSystray.exe",
+                                                           "OneDrive Setup": r"C:\Program Files\OneDrive.exe /background"},
+                r"Vendor\Blob": {"Payload": bytes(range(256)) * 160, "": "default value", "Empty": b""},
+                "Ünïcödé\\Ключ": {"Имя": "значение"}}
+    ntuser = {r"Software\Microsoft\Windows\CurrentVersion\Run": {"Discord": r"C:\Users\student\AppData\Discord.exe"}}
+    for i in range(programs):
+        keys, prefix = (ntuser, "Software") if i % 10 == 0 else (software, "" if i % 3 else "WOW6432Node")
+        keys[rf"{prefix}\Microsoft\Windows\CurrentVersion\Uninstall\{{{i:08X}-0000-0000-0000-000000000000}}".lstrip("\\")] = {
+            "DisplayName": ["TeamViewer 15", "7-Zip 23.01", "Python 3.11.7 (64-bit)", "Discord"][i % 4] + f" #{i}",
+            "DisplayVersion": f"{i % 30}.{i % 7}.0", "Publisher": "Example Corp", "InstallDate": "20250514",
+            "InstallLocation": rf"C:\Program Files\App{i}", "EstimatedSize": 1024 + i, "NoModify": 1,
+            "UninstallString": rf"MsiExec.exe /X{{{i:08X}}}",
+        }
+    return {"SYSTEM": system, "SOFTWARE": software, "NTUSER.DAT": ntuser}
+
+
+def _walk(reg, key):
+    """ (keys, values) under an open key, read through the winreg interface. """
+    subkeys, values, _ = reg.QueryInfoKey(key)
+    for i in range(values):
+        reg.EnumValue(key, i)
+    keys_seen, values_seen = 1, values
+    for i in range(subkeys):
+        with reg.OpenKey(key, reg.EnumKey(key, i)) as child:
+            child_keys, child_values = _walk(reg, child)
+        keys_seen += child_keys
+        values_seen += child_values
+    return keys_seen, values_seen
+
+
+def _check_fixture(path=os.path.join(FIXTURE_DIR, "NTUSER.DAT.gz")):
+    """
+    Read a real Windows XP NTUSER.DAT (fixtures/README.txt) and compare it with known values: 101 hbins,
+    "lf" subkey lists, class names and security cells, none of which the sample writer produces.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        hive_path = os.path.join(folder, "NTUSER.DAT")
+        with gzip.open(path) as packed, open(hive_path, "wb") as out:
+            shutil.copyfileobj(packed, out)
+        with offline_hives(ntuser=hive_path) as reg:
+            def value(key_path, name):
+                with reg.OpenKey(HKEY_CURRENT_USER, key_path) as key:
+                    return reg.QueryValueEx(key, name)
+
+            def info(key_path):
+                with reg.OpenKey(HKEY_CURRENT_USER, key_path) as key:
+                    return reg.QueryInfoKey(key)
+
+            with reg.OpenKey(HKEY_CURRENT_USER, "") as root:
+                keys, _ = _walk(reg, root)
+            with reg.OpenKey(HKEY_CURRENT_USER, "Software") as software:
+                software_keys, _ = _walk(reg, software)
+            checks = {
+                "key count": (keys, software_keys) == (845, 522),
+                "Software subkeys, values, last written": info("Software") == (4, 0, 129949578653203344),
+                "Console values": info("Console")[1] == 31,
+                "REG_DWORD": value("Console", "ColorTable14") == (65535, REG_DWORD),
+                "REG_SZ": value(r"AppEvents\EventLabels\CriticalBatteryAlarm", "DispFileName")
+                          == ("@mmsys.cpl,-5827", REG_SZ),
+                "REG_BINARY": value(r"Software\Microsoft\Windows\ShellNoRoam\BagMRU", "0")
+                              == (b"\x14\x00\x1fP\xe0O\xd0 \xea:i\x10\xa2\xd8\x08\x00+00\x9d\x00\x00", REG_BINARY),
+                "default value": value(r"AppEvents\EventLabels\.Default", "") == ("Default Beep", REG_SZ),
+            }
+    for name, ok in checks.items():
+        print(f"{'✅' if ok else '❌'} {os.path.basename(path)}: {name}")
+
+
+def _benchmark(programs=5000, devices=300):
+    """
+    The registry probes against generated fixture hives vs the same data in a FakeRegistry (results
+    must match), then full-walk speed. Hive files given on the command line are walked instead.
+    """
+    from audit_context import audit_run
+    import automate_default_share
+    import removable_device_control
+    import software_inventory
+    import startup_apps
+    import usb_devices_list
+
+    if sys.argv[1:]:
+        for path in sys.argv[1:]:
+            with OfflineRegistry() as registry:
+                hive = registry.mount(HKEY_LOCAL_MACHINE, "HIVE", path)
+                start = time.perf_counter()
+                keys, values = _walk(registry, registry.OpenKey(HKEY_LOCAL_MACHINE, "HIVE"))
+                elapsed = time.perf_counter() - start
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"✅ {os.path.basename(path)}: {keys:,} keys, {values:,} values ({size:,.1f} MiB) in {elapsed:.2f}s "
+                  f"({keys / elapsed:,.0f} keys/sec){', dirty: logs not replayed' if hive.dirty else ''}")
+        return
+
+    probes = {
+        "usb_history": usb_devices_list.get_usb_history,
+        "usb_status": removable_device_control.get_usb_status,
+        "cd_status": removable_device_control.get_cd_status,
+        "admin_shares_disabled": automate_default_share.get_admin_share_status,
+        "startup_registry": lambda: [p for p in startup_apps.get_startup_programs() if p[2] == "Registry"],
+        "installed_software": software_inventory.installed_software,
+    }
+    hives = _sample_hives(programs, devices)
+    fake_keys = {}
+    for hive_name, keys in hives.items():
+        prefix = {"SYSTEM": r"HKLM\SYSTEM", "SOFTWARE": r"HKLM\SOFTWARE", "NTUSER.DAT": "HKCU"}[hive_name]
+        for path, values in keys.items():
+            fake_keys[rf"{prefix}\{path.replace('ControlSet001', 'CurrentControlSet')}"] = values
+
+    def run_probes():
+        results = {}
+        with audit_run():
+            for name, probe in probes.items():
+                result = probe()
+                results[name] = sorted(map(repr, result)) if isinstance(result, list) else result
+        return results
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = {}
+        for hive_name, keys in hives.items():
+            paths[hive_name] = os.path.join(folder, hive_name)
+            write_sample_hive(paths[hive_name], keys, hive_name.split(".")[0])
+
+        previous = registry_backend.set_backend(registry_backend.FakeRegistry(fake_keys))
+        try:
+            start = time.perf_counter()
+            expected = run_probes()
+            fake_elapsed = time.perf_counter() - start
+        finally:
+            registry_backend.set_backend(previous)
+
+        with offline_hives(paths["SYSTEM"], paths["SOFTWARE"], paths["NTUSER.DAT"]) as registry:
+            start = time.perf_counter()
+            actual = run_probes()
+            offline_elapsed = time.perf_counter() - start
+            blob = registry.OpenKey(HKEY_LOCAL_MACHINE, r"SOFTWARE\Vendor\Blob")
+            checks = {
+                "big value (db segments)": registry.QueryValueEx(blob, "Payload")[0] == bytes(range(256)) * 160,
+                "default value": registry.QueryValueEx(blob, "")[0] == "default value",
+                "UTF-16 names": registry.QueryValueEx(registry.OpenKey(
+                    HKEY_LOCAL_MACHINE, "software\\ünïcödé\\ключ"), "имя")[0] == "значение",
+                "HKLM lists mounts": [registry.EnumKey(HKEY_LOCAL_MACHINE, i) for i in range(2)] == ["SOFTWARE", "SYSTEM"],
+            }
+
+            start = time.perf_counter()
+            walked = [_walk(registry, registry.OpenKey(HKEY_LOCAL_MACHINE, name)) for name in ("SYSTEM", "SOFTWARE")]
+            walk_elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(path) for path in paths.values()) / 1024 / 1024
+
+    for name in probes:
+        same = expected[name] == actual[name]
+        print(f"{'✅' if same else '❌'} {name}: offline hive {'matches' if same else 'differs from'} the fake registry")
+    for name, ok in checks.items():
+        print(f"{'✅' if ok else '❌'} {name}")
+    keys = sum(k for k, _ in walked)
+    print(f"   probes: {fake_elapsed * 1000:.0f} ms in memory, {offline_elapsed * 1000:.0f} ms from {size:.1f} MiB of hives")
+    print(f"   full walk: {keys:,} keys, {sum(v for _, v in walked):,} values in {walk_elapsed * 1000:.0f} ms "
+          f"({keys / walk_elapsed:,.0f} keys/sec)")
+
+
+if __name__ == "__main__":
+    if not sys.argv[1:]:
+        _check_fixture()
+    _benchmark()
@@ -0,0 +1,199 @@
+try:
+    import winreg
+except ImportError:  # not on Windows: only fake / offline backends are available
+    winreg = None
+
+# ✅ Registry reads go through a swappable object with winreg's function names
+# (OpenKey, EnumKey, EnumValue, QueryInfoKey, QueryValueEx, CloseKey), so probes can run
+# against the live registry, a FakeRegistry built from dicts, or an offline hive file.
+
+HKEY_CLASSES_ROOT = getattr(winreg, "HKEY_CLASSES_ROOT", 0x80000000)
+HKEY_CURRENT_USER = getattr(winreg, "HKEY_CURRENT_USER", 0x80000001)
+HKEY_LOCAL_MACHINE = getattr(winreg, "HKEY_LOCAL_MACHINE", 0x80000002)
+HKEY_USERS = getattr(winreg, "HKEY_USERS", 0x80000003)
+
+REG_NONE = 0
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_BINARY = 3
+REG_DWORD = 4
+REG_MULTI_SZ = 7
+REG_QWORD = 11
+
+KEY_READ = getattr(winreg, "KEY_READ", 0x20019)
+KEY_SET_VALUE = getattr(winreg, "KEY_SET_VALUE", 0x0002)
+
+HIVE_NAMES = {
+    HKEY_CLASSES_ROOT: "HKCR",
+    HKEY_CURRENT_USER: "HKCU",
+    HKEY_LOCAL_MACHINE: "HKLM",
+    HKEY_USERS: "HKU",
+}
+HIVES_BY_NAME = {name: hive for hive, name in HIVE_NAMES.items()}
+HIVES_BY_NAME.update({"HKEY_CLASSES_ROOT": HKEY_CLASSES_ROOT, "HKEY_CURRENT_USER": HKEY_CURRENT_USER,
+                      "HKEY_LOCAL_MACHINE": HKEY_LOCAL_MACHINE, "HKEY_USERS": HKEY_USERS})
+
+
+class FakeKey:
+    """ One key of a FakeRegistry; subkeys and values are looked up case-insensitively, like Windows. """
+
+    __slots__ = ("name", "subkeys", "values", "subkey_list", "value_list")
+
+    def __init__(self, name):
+        self.name = name
+        self.subkeys = {}      # lower-cased name -> FakeKey
+        self.values = {}       # lower-cased name -> (name, data, type)
+        self.subkey_list = []  # insertion order, for EnumKey / EnumValue by index
+        self.value_list = []
+
+    def child(self, name, create=False):
+        key = self.subkeys.get(name.lower())
+        if key is None and create:
+            key = self.subkeys[name.lower()] = FakeKey(name)
+            self.subkey_list.append(key)
+        return key
+
+    def set_value(self, name, data, value_type=None):
+        value = (name, data, _value_type(data) if value_type is None else value_type)
+        if name.lower() in self.values:
+            self.value_list = [v if v[0].lower() != name.lower() else value for v in self.value_list]
+        else:
+            self.value_list.append(value)
+        self.values[name.lower()] = value
+
+    def Close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _value_type(data):
+    if isinstance(data, int):
+        return REG_DWORD if 0 <= data < 2 ** 32 else REG_QWORD
+    if isinstance(data, (bytes, bytearray)):
+        return REG_BINARY
+    if isinstance(data, (list, tuple)):
+        return REG_MULTI_SZ
+    return REG_SZ
+
+
+class FakeRegistry:
+    """
+    Dict-built registry for running registry probes on hosts without Windows. `keys` maps
+    "HKLM\\path\\to\\key" to that key's values ({name: data}; the type follows the data:
+    str -> REG_SZ, int -> REG_DWORD, bytes -> REG_BINARY, list -> REG_MULTI_SZ).
+    `calls` counts the registry operations made, to compare access patterns.
+    """
+
+    def __init__(self, keys=None):
+        self.roots = {}
+        self.calls = 0
+        for path, values in (keys or {}).items():
+            self.add_key(path, values)
+
+    def add_key(self, path, values=None):
+        hive_name, _, sub_key = path.partition("\\")
+        hive = HIVES_BY_NAME[hive_name.upper()]
+        key = self.roots.setdefault(hive, FakeKey(HIVE_NAMES[hive]))
+        for part in filter(None, sub_key.split("\\")):
+            key = key.child(part, create=True)
+        for name, data in (values or {}).items():
+            key.set_value(name, data)
+        return key
+
+    # --- winreg interface ----------------------------------------------------
+
+    def OpenKey(self, key, sub_key, reserved=0, access=KEY_READ):
+        self.calls += 1
+        if not isinstance(key, FakeKey):
+            key = self.roots.get(key)
+            if key is None:
+                raise FileNotFoundError(2, "The system cannot find the file specified")
+        for part in filter(None, sub_key.split("\\")):
+            key = key.child(part)
+            if key is None:
+                raise FileNotFoundError(2, "The system cannot find the file specified")
+        return key
+
+    OpenKeyEx = OpenKey
+
+    def CloseKey(self, key):
+        pass
+
+    def EnumKey(self, key, index):
+        self.calls += 1
+        try:
+            return key.subkey_list[index].name
+        except IndexError:
+            raise OSError(259, "No more data is available") from None
+
+    def EnumValue(self, key, index):
+        self.calls += 1
+        try:
+            return key.value_list[index]
+        except IndexError:
+            raise OSError(259, "No more data is available") from None
+
+    def QueryInfoKey(self, key):
+        self.calls += 1
+        return len(key.subkeys), len(key.values), 0
+
+    def QueryValueEx(self, key, name):
+        self.calls += 1
+        value = key.values.get(name.lower())
+        if value is None:
+            raise FileNotFoundError(2, "The system cannot find the file specified")
+        return value[1], value[2]
+
+    def SetValueEx(self, key, name, reserved, value_type, value):
+        self.calls += 1
+        key.set_value(name, value, value_type)
+
+
+_backend = winreg
+
+
+def set_backend(backend):
+    """ Swap the registry backend (e.g. a FakeRegistry) and return the previous one. """
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
+
+
+def get_backend():
+    if _backend is None:
+        raise OSError("No registry backend: winreg is only available on Windows")
+    return _backend
+
+
+def subkey_names(key, reg=None):
+    """ Names of the direct subkeys of an open key. """
+    reg = reg or get_backend()
+    return [reg.EnumKey(key, i) for i in range(reg.QueryInfoKey(key)[0])]
+
+
+def read_values(key, names=None, reg=None):
+    """
+    {name: data} of an open key in one EnumValue pass instead of a QueryValueEx per value.
+    With `names`, only those are kept (under the spelling asked for, matched case-insensitively)
+    and the pass stops once all of them were seen.
+    """
+    reg = reg or get_backend()
+    count = reg.QueryInfoKey(key)[1]
+    wanted = None if names is None else {name.lower(): name for name in names}
+    values = {}
+    for i in range(count):
+        name, data, _ = reg.EnumValue(key, i)
+        if wanted is None:
+            values[name] = data
+            continue
+        name = wanted.get(name.lower())
+        if name is not None:
+            values[name] = data
+            if len(values) == len(wanted):
+                break
+    return values
@@ -1,4 +1,5 @@
-import winreg
+from audit_context import invalidate_probes
+from registry_backend import HKEY_LOCAL_MACHINE, KEY_READ, KEY_SET_VALUE, REG_DWORD, get_backend
 
 # Registry paths and keys
 USBSTOR_PATH = r"SYSTEM\CurrentControlSet\Services\USBSTOR"
@@ -8,8 +9,9 @@ START_VALUE = "Start"
 # Common helper to get the registry DWORD value
 def get_reg_dword(path, name):
     try:
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path, 0, winreg.KEY_READ) as key:
-            value, _ = winreg.QueryValueEx(key, name)
+        reg = get_backend()
+        with reg.OpenKey(HKEY_LOCAL_MACHINE, path, 0, KEY_READ) as key:
+            value, _ = reg.QueryValueEx(key, name)
             return value
     except Exception as e:
         print(f"[ERROR] Reading registry: {e}")
@@ -18,13 +20,17 @@ def get_reg_dword(path, name):
 # Common helper to set a registry DWORD value
 def set_reg_dword(path, name, value):
     try:
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path, 0, winreg.KEY_SET_VALUE) as key:
-            winreg.SetValueEx(key, name, 0, winreg.REG_DWORD, value)
-            return True
+        reg = get_backend()
+        with reg.OpenKey(HKEY_LOCAL_MACHINE, path, 0, KEY_SET_VALUE) as key:
+            reg.SetValueEx(key, name, 0, REG_DWORD, value)
     except Exception as e:
         print(f"[ERROR] Writing registry: {e}")
         return False
 
+    # ✅ Any registry probe of a running audit may have read this value; drop them all
+    invalidate_probes()
+    return True
+
 # ---------------------- USB STORAGE CONTROL ----------------------
 def get_usb_status():
     value = get_reg_dword(USBSTOR_PATH, START_VALUE)
@@ -1,5 +1,8 @@
 import subprocess
 import datetime
+from probe_executor import check_output
+from powershell_pool import run_powershell, run_powershell_json
+from audit_context import audit_cached
 import socket
 import re
 import winreg
@@ -8,11 +11,12 @@ def clean_output(text):
     # Remove all non-ASCII printable characters (except newline)
     return re.sub(r'[^\x20-\x7E\n]', '', text)
 
+@audit_cached
 def get_antivirus_status():
     try:
         # ✅ Get installed antivirus from Windows Security Center
-        cmd = 'powershell -Command "Get-CimInstance -Namespace root/SecurityCenter2 -ClassName AntivirusProduct | Select-Object -ExpandProperty displayName"'
-        output = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
+        cmd = 'Get-CimInstance -Namespace root/SecurityCenter2 -ClassName AntivirusProduct | Select-Object -ExpandProperty displayName'
+        output = run_powershell(cmd).strip()
 
         if not output:
             return "No antivirus detected (Windows Defender may be inactive or another AV is in use)"
@@ -23,25 +27,26 @@ def get_antivirus_status():
     except Exception as e:
         return f"Error retrieving antivirus status: {e}"
 
+@audit_cached
 def get_last_scan_time():
     try:
         # ✅ First, check if Windows Defender is running
-        cmd1 = 'powershell -Command "(Get-MpComputerStatus).AMRunningMode"'
-        defender_mode = subprocess.check_output(cmd1, shell=True).decode('utf-8').strip()
+        cmd1 = '(Get-MpComputerStatus).AMRunningMode'
+        defender_mode = run_powershell(cmd1).strip()
 
         if "Passive" in defender_mode:
             return "Windows Defender is in Passive Mode (Another antivirus is active)"
 
         # ✅ Check Last Scan Time (First Try Standard Method)
-        cmd2 = 'powershell -Command "(Get-MpComputerStatus).ScanTime"'
-        output = subprocess.check_output(cmd2, shell=True).decode('utf-8').strip()
+        cmd2 = '(Get-MpComputerStatus).ScanTime'
+        output = run_powershell(cmd2).strip()
 
         if output:
             return f"{output}"
 
         # ✅ If Standard Method Fails, Check Event Logs
-        cmd3 = 'powershell -Command "Get-WinEvent -LogName \'Microsoft-Windows-Windows Defender/Operational\' | Where-Object Id -eq 1001 | Select-Object -First 1 -ExpandProperty TimeCreated"'
-        output = subprocess.check_output(cmd3, shell=True).decode('utf-8').strip()
+        cmd3 = 'Get-WinEvent -LogName \'Microsoft-Windows-Windows Defender/Operational\' | Where-Object Id -eq 1001 | Select-Object -First 1 -ExpandProperty TimeCreated'
+        output = run_powershell(cmd3).strip()
 
         if output:
             return f"{output}"
@@ -51,6 +56,7 @@ def get_last_scan_time():
     except Exception as e:
         return f"Error retrieving scan time: {e}"
 
+@audit_cached
 def get_usb_device_control_status():
     try:
         with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Services\USBSTOR") as key:
@@ -64,6 +70,7 @@ def get_usb_device_control_status():
     except Exception as e:
         return f"Error checking USB storage access: {e}"
 
+@audit_cached
 def get_autoplay_status():
     try:
         path1 = r"Software\Microsoft\Windows\CurrentVersion\Policies\Explorer"
@@ -94,10 +101,11 @@ def get_autoplay_status():
     except Exception as e:
         return f"Error checking AutoPlay status: {e}"
 
+@audit_cached
 def get_rdp_status():
     try:
-        cmd = 'powershell -Command "(Get-ItemProperty -Path \'HKLM:\\System\\CurrentControlSet\\Control\\Terminal Server\').fDenyTSConnections"'
-        output = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
+        cmd = '(Get-ItemProperty -Path \'HKLM:\\System\\CurrentControlSet\\Control\\Terminal Server\').fDenyTSConnections'
+        output = run_powershell(cmd).strip()
 
         if output == "1":
             return "Disabled (RDP is OFF)"
@@ -109,10 +117,11 @@ def get_rdp_status():
     except Exception as e:
         return f"Error retrieving RDP status: {e}"
 
+@audit_cached
 def get_telnet_status():
     try:
-        cmd = 'powershell -Command "Get-Service -Name Telnet | Select-Object -ExpandProperty Status"'
-        output = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
+        cmd = 'Get-Service -Name Telnet | Select-Object -ExpandProperty Status'
+        output = run_powershell(cmd).strip()
 
         if output.lower() == "stopped":
             return "Disabled"
@@ -124,6 +133,7 @@ def get_telnet_status():
     except subprocess.CalledProcessError:
         return "Not Installed"
 
+@audit_cached
 def get_default_share_status():
     try:
         key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Services\LanmanServer\Parameters")
@@ -138,10 +148,11 @@ def get_default_share_status():
     except Exception as e:
         return f"Error reading Default Share status: {e}"
 
+@audit_cached
 def get_shared_folder_status():
     try:
-        cmd = 'powershell -Command "Get-SmbShare | Where-Object {$_.Name -notmatch \'^\\w+\\$$\'} | Select-Object -ExpandProperty Name"'
-        output = subprocess.check_output(cmd, shell=True, stderr=subprocess.STDOUT).decode('utf-8').strip()
+        cmd = 'Get-SmbShare | Where-Object {$_.Name -notmatch \'^\\w+\\$$\'} | Select-Object -ExpandProperty Name'
+        output = run_powershell(cmd).strip()
 
         if "is not recognized" in output or "not found" in output.lower():
             return "Error: Get-SmbShare not available"
@@ -152,7 +163,10 @@ def get_shared_folder_status():
             return "Not Configured (Safe)"
 
     except subprocess.CalledProcessError as e:
-        return f"Error retrieving Shared Folder status:\n{e.output.decode('utf-8')}"
+        details = e.stderr or e.output or ""
+        if "is not recognized" in details:
+            return "Error: Get-SmbShare not available"
+        return f"Error retrieving Shared Folder status:\n{details}"
 
 def get_bios_password_status():
     return "Manual Check Required"
@@ -160,15 +174,16 @@ def get_bios_password_status():
 def check_browser_saved_passwords():
     return "Manual Check Required"
 
+@audit_cached
 def get_login_password_status():
     try:
         # ✅ Get the current logged-in Windows user
-        cmd_user = 'powershell -Command "$env:USERNAME"'
-        username = subprocess.check_output(cmd_user, shell=True).decode('utf-8').strip()
+        cmd_user = '$env:USERNAME'
+        username = run_powershell(cmd_user).strip()
 
         # ✅ Check if the user has a password set
         cmd_password = f'net user {username}'
-        output = subprocess.check_output(cmd_password, shell=True).decode('utf-8')
+        output = check_output(cmd_password)
 
         if "Password required" in output:
             if "Yes" in output:
@@ -181,10 +196,11 @@ def get_login_password_status():
     except:
         return "Error Retrieving Windows Login Password Status"
 
+@audit_cached
 def get_password_policy_status():
     try:
-        cmd = 'powershell -Command "net accounts | Select-String \'password\'"'
-        output = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
+        cmd = 'net accounts | Select-String \'password\''
+        output = run_powershell(cmd).strip()
         output = clean_output(output)
 
         min_length = None
@@ -210,11 +226,12 @@ def get_password_policy_status():
     except Exception as e:
         return f"Error Retrieving Password Policy: {e}"
 
+@audit_cached
 def get_lockout_policy_status():
     try:
         # Run PowerShell command to extract lockout-related lines from `net accounts`
-        cmd = 'powershell -Command "net accounts | Select-String \'Lockout\'"'
-        output = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
+        cmd = 'net accounts | Select-String \'Lockout\''
+        output = run_powershell(cmd).strip()
 
         lockout_threshold = "Unknown"
 
@@ -265,15 +282,15 @@ KNOWN_UDP_PORTS = {
     "5353": "mDNS (Multicast DNS)"
 }
 
+@audit_cached
 def get_open_ports():
     """Find open TCP and UDP ports and their associated processes, filtering unnecessary noise."""
     try:
         # ✅ Get TCP Connections
-        tcp_result = subprocess.run(["powershell", "Get-NetTCPConnection | Select-Object LocalPort, State"], 
-                                    capture_output=True, text=True, shell=True)
+        tcp_output = run_powershell("Get-NetTCPConnection | Select-Object LocalPort, State", check=False)
 
         tcp_ports = set()
-        for line in tcp_result.stdout.strip().split("\n")[3:]:  # Skip headers
+        for line in tcp_output.strip().split("\n")[3:]:  # Skip headers
             parts = line.strip().split()
             if len(parts) >= 2 and parts[1].lower() == "listen":
                 port = parts[0]
@@ -282,11 +299,11 @@ def get_open_ports():
                     tcp_ports.add(f"Port {port} (TCP) - {COMMON_PORTS.get(port, 'Unknown')}")
 
         # ✅ Get UDP Connections
-        udp_result = subprocess.run(["powershell", "Get-NetUDPEndpoint | Select-Object LocalAddress, LocalPort, OwningProcess"], 
-                                    capture_output=True, text=True, shell=True)
+        udp_output = run_powershell("Get-NetUDPEndpoint | Select-Object LocalAddress, LocalPort, OwningProcess",
+                                    check=False)
 
         udp_ports = {}
-        for line in udp_result.stdout.strip().split("\n")[3:]:  # Skip headers
+        for line in udp_output.strip().split("\n")[3:]:  # Skip headers
             parts = re.split(r"\s+", line.strip())  
             if len(parts) >= 3:
                 local_address, local_port, process_id = parts[:3]
@@ -308,24 +325,21 @@ def get_open_ports():
             "udp": [f"Error retrieving UDP services: {e}"]
         }
 
+@audit_cached
 def get_firewall_status():
     try:
-        cmd = 'powershell -Command "Get-NetFirewallProfile | Select-Object -Property Name, Enabled"'
-        result = subprocess.check_output(cmd, shell=True, text=True).strip()
+        cmd = "Get-NetFirewallProfile | ForEach-Object { @{ Name = $_.Name; Enabled = [string]$_.Enabled } }"
+        profiles = run_powershell_json(cmd) or []
+        if isinstance(profiles, dict):
+            profiles = [profiles]
 
         profile_statuses = []
-        for line in result.splitlines():
-            if "Domain" in line:
-                profile = "Domain"
-            elif "Private" in line:
-                profile = "Private"
-            elif "Public" in line:
-                profile = "Public"
-            else:
+        for profile in profiles:
+            if profile.get("Name") not in ("Domain", "Private", "Public"):
                 continue
 
-            status = "Enabled" if "True" in line else "Disabled"
-            profile_statuses.append(f"{profile} Profile: {status}")
+            status = "Enabled" if profile.get("Enabled") == "True" else "Disabled"
+            profile_statuses.append(f"{profile['Name']} Profile: {status}")
 
         return "\n".join(profile_statuses) if profile_statuses else "Could not determine Firewall status"
 
@@ -401,6 +415,13 @@ UDP Services: {udp_services_text}
     with open("security_logs.txt", "a", encoding="utf-8") as log_file:
         log_file.write(log_entry + "\n")
 
+    # ✅ Keep a queryable copy next to the collected events
+    try:
+        from event_store import get_store
+        get_store().add_snapshot("security_log", log_entry)
+    except Exception as e:
+        print(f"⚠️ Could not store security log snapshot: {e}")
+
     print(log_entry)
 
 if __name__ == "__main__":
@@ -14,6 +14,9 @@ from security_logs import (
     get_password_policy_status
 )
 from unwanted_softwares import detect_unwanted_software
+from logon_detector import detect_logon_anomalies, has_logon_attacks
+from probe_executor import run_probes
+from audit_context import audit_run
 
 # ✅ Helper functions
 
@@ -47,11 +50,16 @@ def login_password_set():
 
 # ✅ Final function to calculate the score
 def calculate_security_health():
-    compulsory_score = sum(1 for check in COMPULSORY_PARAMETERS.values() if check() == "YES")
-    desirable_score = sum(1 for check in DESIRABLE_PARAMETERS.values() if check() == "YES")
+    # ✅ Submit every check to the probe executor once and score from the results
+    # (get_system_info() and friends are shared between checks through the audit run)
+    with audit_run():
+        results = run_probes({**COMPULSORY_PARAMETERS, **DESIRABLE_PARAMETERS})
 
-    compulsory_results = {name: check() for name, check in COMPULSORY_PARAMETERS.items()}
-    desirable_results = {name: check() for name, check in DESIRABLE_PARAMETERS.items()}
+    compulsory_results = {name: results[name] for name in COMPULSORY_PARAMETERS}
+    desirable_results = {name: results[name] for name in DESIRABLE_PARAMETERS}
+
+    compulsory_score = sum(1 for status in compulsory_results.values() if status == "YES")
+    desirable_score = sum(1 for status in desirable_results.values() if status == "YES")
 
     return compulsory_score, desirable_score, compulsory_results, desirable_results
 
@@ -99,6 +107,7 @@ DESIRABLE_PARAMETERS = {
     "Password Policy Configured": lambda: "YES" if "Configured" in get_password_policy_status() else "NO",
     "Open TCP Ports < 10": lambda: "YES" if get_tcp_port_count() < 10 else "NO",
     "Open UDP Ports < 10": lambda: "YES" if get_udp_port_count() < 10 else "NO",
+    "No Brute-Force / Spraying Logons (24h)": lambda: "NO" if has_logon_attacks(detect_logon_anomalies()) else "YES",
 }
 
 
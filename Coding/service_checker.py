@@ -1,4 +1,5 @@
-import subprocess
+from service_snapshot import get_service_snapshot
+from audit_context import audit_cached
 
 # ✅ List of critical services to check
 CRITICAL_SERVICES = {
@@ -22,27 +23,20 @@ CRITICAL_SERVICES = {
     "Telnet Client": "TlntSvr"
 }
 
-def get_service_status(service_name):
+def get_service_status(service_name, snapshot=None):
     """ ✅ Checks if a Windows service is running or stopped. """
     try:
-        command = f'sc query "{service_name}"'
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-
-        # ✅ Extract service state from output
-        if "RUNNING" in result.stdout:
-            return "Running"
-        elif "STOPPED" in result.stdout:
-            return "Stopped"
-        else:
-            return "Unknown"
+        # ✅ Read the state from the bulk service snapshot instead of one `sc query` per service
+        snapshot = snapshot or get_service_snapshot()
+        return snapshot.status(service_name)
     except Exception as e:
         return f"Error: {e}"
 
+@audit_cached
 def check_critical_services():
     """ ✅ Fetch status of all critical services. """
-    service_statuses = {}
-    
-    for service, service_code in CRITICAL_SERVICES.items():
-        service_statuses[service] = get_service_status(service_code)
-
-    return service_statuses  # ✅ Returns a dictionary
+    snapshot = get_service_snapshot()
+    return {
+        service: get_service_status(service_code, snapshot)
+        for service, service_code in CRITICAL_SERVICES.items()
+    }  # ✅ Returns a dictionary
@@ -0,0 +1,234 @@
+import time
+from probe_executor import run_command, run_probes
+from audit_context import audit_cached
+
+# ✅ One `sc query` for every service's state + one registry walk for every start type,
+# instead of `sc qc` / `sc query` per service
+SC_QUERY_COMMAND = "sc query type= service state= all bufsize= 262144"  # room for ~1000 services
+START_TYPE_COMMAND = r"reg query HKLM\SYSTEM\CurrentControlSet\Services /s /v Start"
+SERVICES_KEY = "\\services\\"
+
+# Same names `sc qc` prints for START_TYPE
+START_TYPES = {
+    0: "BOOT_START",
+    1: "SYSTEM_START",
+    2: "AUTO_START",
+    3: "DEMAND_START",
+    4: "DISABLED",
+}
+
+
+def parse_sc_query(text):
+    """ Parse `sc query` output into {lowercase service name: {"name", "display_name", "state"}}. """
+    services = {}
+    current = None
+
+    for line in text.splitlines():
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        key = key.strip()
+
+        if key == "SERVICE_NAME":
+            name = value.strip()
+            current = {"name": name, "display_name": "", "state": "UNKNOWN"}
+            services[name.lower()] = current
+        elif current is None:
+            continue
+        elif key == "DISPLAY_NAME":
+            current["display_name"] = value.strip()
+        elif key == "STATE":
+            # "4  RUNNING" -> "RUNNING"
+            parts = value.split()
+            current["state"] = parts[1] if len(parts) > 1 else "UNKNOWN"
+
+    return services
+
+
+def parse_start_types(text):
+    """ Parse `reg query ...\\Services /s /v Start` output into {lowercase service name: start type}. """
+    start_types = {}
+    service = None
+
+    for line in text.splitlines():
+        if line.startswith("HKEY_"):
+            # Only direct children of \Services count, not their Parameters/... subkeys
+            lowered = line.strip().lower()
+            index = lowered.find(SERVICES_KEY)
+            rest = lowered[index + len(SERVICES_KEY):] if index != -1 else ""
+            service = rest if rest and "\\" not in rest else None
+            continue
+
+        if service is None:
+            continue
+        parts = line.split()
+        if len(parts) == 3 and parts[0] == "Start" and parts[1] == "REG_DWORD":
+            try:
+                value = int(parts[2], 16)
+            except ValueError:
+                continue
+            start_types[service] = START_TYPES.get(value, f"UNKNOWN ({value})")
+
+    return start_types
+
+
+class ServiceSnapshot:
+    """ Name-indexed (case-insensitive) view of every service's state and start type at one moment. """
+
+    def __init__(self, sc_output="", start_type_output=""):
+        self.taken_at = time.time()
+        self.services = parse_sc_query(sc_output)
+        self.start_types = parse_start_types(start_type_output)
+
+    def __contains__(self, name):
+        return name.lower() in self.services
+
+    def state(self, name):
+        """ Raw sc state (RUNNING, STOPPED, START_PENDING, ...) or None when the service doesn't exist. """
+        service = self.services.get(name.lower())
+        return service["state"] if service else None
+
+    def start_type(self, name):
+        return self.start_types.get(name.lower())
+
+    def status(self, name, include_config=False):
+        """
+        Same answers the per-service checks used to give: "Running", "Stopped" or "Unknown",
+        and "Disabled" first when `include_config` is set (like `sc qc` before `sc query`).
+        """
+        if include_config and self.start_type(name) == "DISABLED":
+            return "Disabled"
+
+        state = self.state(name)
+        if state == "RUNNING":
+            return "Running"
+        if state == "STOPPED":
+            return "Stopped"
+        return "Unknown"
+
+
+def take_snapshot(include_start_types=True):
+    """ Query every service now (two commands, run concurrently). Never cached. """
+    if not include_start_types:
+        # State polling only needs the one `sc query`
+        return ServiceSnapshot(_command_output(SC_QUERY_COMMAND))
+
+    outputs = run_probes(
+        {
+            "states": lambda: _command_output(SC_QUERY_COMMAND),
+            "start_types": lambda: _command_output(START_TYPE_COMMAND),
+        },
+        defaults={"states": "", "start_types": ""},
+    )
+    return ServiceSnapshot(outputs["states"], outputs["start_types"])
+
+
+def _command_output(command):
+    return run_command(command).stdout or ""
+
+
+@audit_cached
+def get_service_snapshot():
+    """ Snapshot shared by every service check of the current audit run. """
+    return take_snapshot()
+
+
+# ✅ Recorded output (trimmed) for the parser benchmark below
+SAMPLE_SC_QUERY = """
+SERVICE_NAME: Dnscache
+DISPLAY_NAME: DNS Client
+        TYPE               : 30  WIN32
+        STATE              : 4  RUNNING
+                                (NOT_STOPPABLE, NOT_PAUSABLE, IGNORES_SHUTDOWN)
+        WIN32_EXIT_CODE    : 0  (0x0)
+        SERVICE_EXIT_CODE  : 0  (0x0)
+        CHECKPOINT         : 0x0
+        WAIT_HINT          : 0x0
+
+SERVICE_NAME: lfsvc
+DISPLAY_NAME: Geolocation Service
+        TYPE               : 30  WIN32
+        STATE              : 1  STOPPED
+        WIN32_EXIT_CODE    : 1077  (0x435)
+        SERVICE_EXIT_CODE  : 0  (0x0)
+        CHECKPOINT         : 0x0
+        WAIT_HINT          : 0x0
+
+SERVICE_NAME: RemoteRegistry
+DISPLAY_NAME: Remote Registry
+        TYPE               : 10  WIN32_OWN_PROCESS
+        STATE              : 1  STOPPED
+        WIN32_EXIT_CODE    : 1077  (0x435)
+        SERVICE_EXIT_CODE  : 0  (0x0)
+        CHECKPOINT         : 0x0
+        WAIT_HINT          : 0x0
+
+SERVICE_NAME: TermService
+DISPLAY_NAME: Remote Desktop Services
+        TYPE               : 30  WIN32
+        STATE              : 2  START_PENDING
+                                (NOT_STOPPABLE, NOT_PAUSABLE, IGNORES_SHUTDOWN)
+        WIN32_EXIT_CODE    : 0  (0x0)
+        SERVICE_EXIT_CODE  : 0  (0x0)
+        CHECKPOINT         : 0x1
+        WAIT_HINT          : 0x7530
+
+SERVICE_NAME: WlanSvc
+DISPLAY_NAME: WLAN AutoConfig
+        TYPE               : 30  WIN32
+        STATE              : 4  RUNNING
+                                (STOPPABLE, NOT_PAUSABLE, ACCEPTS_SHUTDOWN)
+        WIN32_EXIT_CODE    : 0  (0x0)
+        SERVICE_EXIT_CODE  : 0  (0x0)
+        CHECKPOINT         : 0x0
+        WAIT_HINT          : 0x0
+"""
+
+SAMPLE_START_TYPES = r"""
+HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Services\Dnscache
+    Start    REG_DWORD    0x2
+
+HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Services\lfsvc
+    Start    REG_DWORD    0x3
+
+HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Services\RemoteRegistry
+    Start    REG_DWORD    0x4
+
+HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Services\TermService
+    Start    REG_DWORD    0x3
+
+HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Services\Tcpip\Parameters\Adapters
+    Start    REG_DWORD    0x0
+
+HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Services\WlanSvc
+    Start    REG_DWORD    0x2
+
+End of search: 6 match(es) found.
+"""
+
+
+def _benchmark(copies=60, rounds=50):
+    """ Parse the recorded output scaled up to a realistic service count. """
+    sc_blocks = SAMPLE_SC_QUERY.split("\n\n")
+    reg_blocks = SAMPLE_START_TYPES.strip().split("\n\n")[:-1]
+    sc_text = "\n\n".join(
+        block.replace("SERVICE_NAME: ", f"SERVICE_NAME: {i}_") for i in range(copies) for block in sc_blocks
+    )
+    reg_text = "\n\n".join(
+        block.replace("\\Services\\", f"\\Services\\{i}_") for i in range(copies) for block in reg_blocks
+    )
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        snapshot = ServiceSnapshot(sc_text, reg_text)
+    elapsed = time.perf_counter() - start
+
+    count = len(snapshot.services)
+    print(f"✅ Parsed {count} services x {rounds} rounds in {elapsed:.3f}s "
+          f"({count * rounds / elapsed:,.0f} services/sec, {elapsed / rounds * 1000:.2f} ms per snapshot)")
+    print(f"   0_TermService -> {snapshot.state('0_TermService')}, start type {snapshot.start_type('0_TermService')}")
+    print(f"   0_RemoteRegistry -> {snapshot.status('0_RemoteRegistry', include_config=True)}")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,94 @@
+import time
+from typing import NamedTuple
+from audit_context import invalidate_probes
+from probe_executor import run_command, run_probes
+from remote_services import check_remote_services
+from service_checker import check_critical_services
+from service_snapshot import get_service_snapshot, take_snapshot
+
+# ✅ Fire every `sc config` / `sc start` at once, then confirm them all from one shared poll loop
+CONFIRM_TIMEOUT = 10  # seconds to wait (after the start commands) for the batch to reach RUNNING
+POLL_INTERVAL = 0.5
+COMMAND_TIMEOUT = 10
+
+ALREADY_RUNNING = "1056"  # sc start: "An instance of the service is already running."
+
+# Audit probes built on service state; a running audit must not keep serving them after a change
+SERVICE_PROBES = (get_service_snapshot, check_critical_services, check_remote_services)
+
+
+class TransitionResult(NamedTuple):
+    service: str
+    ok: bool
+    stage: str      # "done", "config", "start", "confirm" or "error" (where it stopped)
+    detail: str
+    seconds: float  # from the start of the batch until the service was confirmed/failed
+
+
+def _configure_and_start(service, start_mode, start):
+    """ Runs on a probe worker: set the start type and optionally kick off the service. """
+    config = run_command(["sc", "config", service, "start=", start_mode], timeout=COMMAND_TIMEOUT)
+    if "SUCCESS" not in config.stdout:
+        return "config", config.stdout.strip()
+    if not start:
+        return "done", ""
+
+    result = run_command(["sc", "start", service], timeout=COMMAND_TIMEOUT)
+    if "FAILED" in result.stdout and ALREADY_RUNNING not in result.stdout:
+        return "start", result.stdout.strip()
+    return "confirm", ""
+
+
+def transition_services(services, start_mode, start=False, timeout=CONFIRM_TIMEOUT, poll_interval=POLL_INTERVAL):
+    """
+    Set `start_mode` ("auto", "demand", "disabled", ...) on every service concurrently and, when
+    `start` is set, start them and wait until they report RUNNING. Returns {service: TransitionResult}
+    in the order given.
+    """
+    began = time.monotonic()
+    services = list(services)
+    try:
+        return _transition(services, start_mode, start, timeout, poll_interval, began)
+    finally:
+        invalidate_probes(*SERVICE_PROBES)
+
+
+def _transition(services, start_mode, start, timeout, poll_interval, began):
+
+    def elapsed():
+        return round(time.monotonic() - began, 2)
+
+    outcomes = run_probes(
+        {service: (lambda service=service: _configure_and_start(service, start_mode, start)) for service in services},
+        timeout=COMMAND_TIMEOUT * 2 + 5,
+    )
+
+    results = {}
+    waiting = []
+    for service in services:
+        outcome = outcomes[service]
+        if isinstance(outcome, str):  # run_probes turned an exception into "Error: ..."
+            results[service] = TransitionResult(service, False, "error", outcome.replace("Error: ", "", 1), elapsed())
+        elif outcome[0] == "confirm":
+            waiting.append(service)
+        else:
+            stage, detail = outcome
+            results[service] = TransitionResult(service, stage == "done", stage, detail, elapsed())
+
+    # ✅ One `sc query` per round covers every service still starting
+    deadline = time.monotonic() + timeout
+    while waiting:
+        snapshot = take_snapshot(include_start_types=False)
+        for service in list(waiting):
+            if snapshot.state(service) == "RUNNING":
+                results[service] = TransitionResult(service, True, "done", "", elapsed())
+                waiting.remove(service)
+
+        if not waiting or time.monotonic() + poll_interval > deadline:
+            break
+        time.sleep(poll_interval)
+
+    for service in waiting:
+        results[service] = TransitionResult(service, False, "confirm", "did not reach RUNNING", elapsed())
+
+    return {service: results[service] for service in services}
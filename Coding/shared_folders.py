@@ -1,5 +1,7 @@
 import subprocess
+from audit_context import audit_cached
 
+@audit_cached
 def get_shared_folders():
     """
     Retrieves a list of shared folders on the system using PowerShell.
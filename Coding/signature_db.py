@@ -0,0 +1,275 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from typing import NamedTuple
+from app_paths import data_path
+
+# ✅ Unwanted-software signatures live in a JSON file that can be updated without a new build:
+#
+#   {"format": 1, "version": "2025.05.14", "signatures": [
+#       {"name": "TeamViewer", "category": "Remote Access", "severity": "High",
+#        "names": ["TeamViewer"],            # optional, defaults to [name]; whole-word phrases ([] = publisher only)
+#        "publishers": ["TeamViewer"],       # optional; any program from this publisher matches - only for
+#                                            # vendors whose every product fits the category
+#        "versions": ">=1.0, <15.2"},        # optional; only these DisplayVersions match
+#   ]}
+#
+# An updated file placed next to the installed exe takes precedence over the one bundled in it.
+# The parsed file is compiled into word tries and cached as JSON in the data directory (app_paths),
+# keyed by the file's sha256, so only the first start after an update pays for parsing. The cache
+# is plain data: the app runs elevated and the data directory is writable by any process of the user.
+SIGNATURES_FILE = "unwanted_signatures.json"
+CACHE_FILE = "unwanted_signatures.cache.json"
+COMPILED_FORMAT = 2  # bump when the compiled layout changes
+SEVERITY_ORDER = {"High": 0, "Medium": 1, "Low": 2}
+
+_WORDS = re.compile(r"[^\W\d_]+")  # runs of letters; digits and punctuation separate words
+_NUMBERS = re.compile(r"\d+")
+_CONSTRAINT = re.compile(r"\s*(>=|<=|==|>|<)?\s*([\w.\-]+)\s*$")
+_END = ""
+
+
+class Signature(NamedTuple):
+    name: str
+    category: str
+    severity: str
+    versions: tuple = ()  # ((operator, version tuple), ...), all must hold
+
+
+class SignatureMatch(NamedTuple):
+    program: str
+    signature: Signature  # publisher matches: named "<Publisher> (publisher of <name>)", not after the product
+    matched_on: str  # "name" or "publisher"
+
+
+def words(text):
+    return _WORDS.findall(text.lower())
+
+
+def version_key(version):
+    """ "23.01 (x64)" -> (23, 1). """
+    return tuple(int(n) for n in _NUMBERS.findall(version or ""))
+
+
+def parse_versions(spec):
+    """ ">=1.0, <15.2" -> ((">=", (1, 0)), ("<", (15, 2))). """
+    constraints = []
+    for part in filter(None, (spec or "").split(",")):
+        found = _CONSTRAINT.match(part)
+        if not found:
+            raise ValueError(f"bad version constraint {part!r}")
+        constraints.append((found.group(1) or "==", version_key(found.group(2))))
+    return tuple(constraints)
+
+
+def version_in_range(version, constraints):
+    if not constraints:
+        return True
+    key = version_key(version)
+    if not key:
+        return False  # a ranged signature needs a version to compare
+    for operator, bound in constraints:
+        if not ((operator == ">=" and key >= bound) or (operator == ">" and key > bound)
+                or (operator == "<=" and key <= bound) or (operator == "<" and key < bound)
+                or (operator == "==" and key[:len(bound)] == bound)):
+            return False
+    return True
+
+
+def _trie_add(trie, phrase, index):
+    node = trie
+    for word in words(phrase):
+        node = node.setdefault(word, {})
+    node.setdefault(_END, []).append(index)
+
+
+def _trie_search(trie, text):
+    """ Signature indexes of the phrases found in `text`, leftmost first, longer phrases first. """
+    text_words = _WORDS.findall(text.lower())
+    end = len(text_words)
+    for start, word in enumerate(text_words):
+        node = trie.get(word)
+        if node is None:
+            continue
+        ends = []
+        position = start + 1
+        while node is not None:
+            if _END in node:
+                ends.append(node[_END])
+            if position == end:
+                break
+            node = node.get(text_words[position])
+            position += 1
+        for indexes in reversed(ends):
+            yield from indexes
+
+
+class SignatureDB:
+    """ Compiled signatures: the Signature list plus word tries over name and publisher patterns. """
+
+    def __init__(self, version, sha256, signatures, name_trie, publisher_trie):
+        self.version = version
+        self.sha256 = sha256
+        self.signatures = signatures
+        self.name_trie = name_trie
+        self.publisher_trie = publisher_trie
+
+    @classmethod
+    def compile(cls, document, sha256=""):
+        if document.get("format") != 1:
+            raise ValueError(f"unsupported signature file format {document.get('format')!r}")
+        signatures, name_trie, publisher_trie = [], {}, {}
+        for entry in document.get("signatures", []):
+            severity = entry.get("severity", "Medium")
+            if severity not in SEVERITY_ORDER:
+                raise ValueError(f"{entry.get('name')}: unknown severity {severity!r}")
+            index = len(signatures)
+            signatures.append(Signature(entry["name"], entry.get("category", "Other"), severity,
+                                        parse_versions(entry.get("versions"))))
+            for phrase in entry.get("names", [entry["name"]]):
+                _trie_add(name_trie, phrase, index)
+            for phrase in entry.get("publishers", []):
+                _trie_add(publisher_trie, phrase, index)
+        return cls(str(document.get("version", "")), sha256, signatures, name_trie, publisher_trie)
+
+    def to_cache(self):
+        """ JSON-ready form of the compiled database (tries are already plain dicts). """
+        return {"format": COMPILED_FORMAT, "sha256": self.sha256, "version": self.version,
+                "signatures": [[s.name, s.category, s.severity, s.versions] for s in self.signatures],
+                "name_trie": self.name_trie, "publisher_trie": self.publisher_trie}
+
+    @classmethod
+    def from_cache(cls, data):
+        signatures = [Signature(str(name), str(category), str(severity),
+                                tuple((str(operator), tuple(int(n) for n in bound)) for operator, bound in versions))
+                      for name, category, severity, versions in data["signatures"]]
+        for trie in (data["name_trie"], data["publisher_trie"]):
+            if not isinstance(trie, dict):
+                raise ValueError("malformed trie")
+        return cls(str(data["version"]), data["sha256"], signatures, data["name_trie"], data["publisher_trie"])
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def match(self, name, version="", publisher=""):
+        """ First SignatureMatch for a program (by name, then by publisher) whose version range fits, or None. """
+        signatures = self.signatures
+        for matched_on, trie, text in (("name", self.name_trie, name), ("publisher", self.publisher_trie, publisher)):
+            if not text or not trie:
+                continue
+            for index in _trie_search(trie, text):
+                signature = signatures[index]
+                if version_in_range(version, signature.versions):
+                    if matched_on == "publisher":
+                        signature = signature._replace(name=f"{publisher} (publisher of {signature.name})")
+                    return SignatureMatch(name, signature, matched_on)
+        return None
+
+
+def bundled_signatures_path():
+    """ The signature file shipped with the app (next to the code, or in the PyInstaller bundle). """
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, SIGNATURES_FILE)
+
+
+def signatures_path():
+    """
+    An updated file next to the installed exe, else the bundled one. Updates are not read from the
+    data directory: writing next to the exe needs the same admin rights as installing the app.
+    """
+    if getattr(sys, "frozen", False):
+        override = os.path.join(os.path.dirname(sys.executable), SIGNATURES_FILE)
+        if os.path.exists(override):
+            return override
+    return bundled_signatures_path()
+
+
+def load_signatures(path=None, cache_path=None):
+    """ SignatureDB for a signature file, from the compiled cache when the file's hash still matches. """
+    path = path or signatures_path()
+    cache_path = cache_path or data_path(CACHE_FILE)
+    with open(path, "rb") as f:
+        raw = f.read()
+    sha256 = hashlib.sha256(raw).hexdigest()
+
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("format") == COMPILED_FORMAT and cached.get("sha256") == sha256:
+            return SignatureDB.from_cache(cached)
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        pass  # missing, stale or malformed cache: compile below
+
+    db = SignatureDB.compile(json.loads(raw.decode("utf-8-sig")), sha256)
+    try:
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(db.to_cache(), f, separators=(",", ":"))
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ Could not cache compiled signatures: {e}")
+    return db
+
+
+_db = None
+_db_lock = threading.Lock()
+
+
+def get_signature_db():
+    """ The active signature database, loaded on first use. """
+    global _db
+    with _db_lock:
+        if _db is None:
+            _db = load_signatures()
+        return _db
+
+
+def _benchmark(count=5000, programs=10_000):
+    """ Cold (parse + compile + cache) vs warm (hash + cached JSON) load of `count` signatures, then matching. """
+    import random
+    import tempfile
+
+    rng = random.Random(23)
+    syllables = ["tor", "rent", "view", "desk", "vpn", "guard", "key", "log", "net", "scan", "cloud", "sync",
+                 "remote", "spy", "shield", "crack", "zip", "box", "mega", "proxy", "tunnel", "ghost"]
+    categories = ["Remote Access", "Keyloggers", "VPNs", "Torrent Clients", "Cloud Storage"]
+    entries = []
+    for i in range(count):
+        name = "".join(rng.choice(syllables) for _ in range(3)).title() + f" {rng.choice(['Pro', 'Free', 'Suite'])}"
+        entry = {"name": name, "category": categories[i % 5], "severity": ["High", "Medium", "Low"][i % 3]}
+        if i % 10 == 0:
+            entry["publishers"] = [f"{name.split()[0]} Software"]
+        if i % 7 == 0:
+            entry["versions"] = f">=1.0, <{rng.randint(2, 9)}.0"
+        entries.append(entry)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, SIGNATURES_FILE)
+        cache_path = os.path.join(folder, CACHE_FILE)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"format": 1, "version": "bench", "signatures": entries}, f)
+
+        start = time.perf_counter()
+        db = load_signatures(path, cache_path)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        load_signatures(path, cache_path)
+        warm = time.perf_counter() - start
+        print(f"✅ {len(db)} signatures ({os.path.getsize(path) / 1024:.0f} KiB): "
+              f"cold load {cold * 1000:.0f} ms, cached load {warm * 1000:.1f} ms")
+        bundled = load_signatures(bundled_signatures_path(), os.path.join(folder, "bundled.cache.json"))
+
+    names = [rng.choice(entries)["name"] + f" {rng.randint(1, 9)}.{rng.randint(0, 9)}" if i % 20 == 0
+             else f"Contoso {rng.choice(syllables).title()} Helper {i}" for i in range(programs)]
+    start = time.perf_counter()
+    matches = [m for m in (db.match(name, name.rsplit(" ", 1)[1]) for name in names) if m]
+    print(f"   matched {programs} programs in {(time.perf_counter() - start) * 1000:.0f} ms, {len(matches)} hits")
+    print(f"   bundled file: {len(bundled)} signatures, version {bundled.version}")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -1,6 +1,10 @@
-import subprocess
+import itertools
 import re
-from tabulate import tabulate
+import sys
+import time
+from typing import NamedTuple
+from audit_context import audit_cached
+from registry_backend import HKEY_LOCAL_MACHINE, FakeRegistry, get_backend, read_values, set_backend
 
 # Known smartphone/dongle vendors
 VENDOR_MAP = {
@@ -15,73 +19,187 @@ VENDOR_MAP = {
     "VID_297F": "Vivo"
 }
 
-def detect_vendor_from_vid(serial):
-    for vid, brand in VENDOR_MAP.items():
-        if vid in serial.upper():
-            return brand
-    return "Unknown"
+# ✅ Walk the USB enum tree key by key: only VID_xxxx&PID_yyyy keys of known vendors are opened,
+# and the walk stops as soon as `limit` devices were found
+USB_ENUM_PATH = r"SYSTEM\CurrentControlSet\Enum\USB"
+DEVICE_VALUES = ("DeviceDesc", "FriendlyName", "Service")
+DEVICE_LIMIT = 10
+DONGLE_KEYWORDS = ("ethernet", "modem", "ndis", "tethering")
 
-def detect_type(device_name, vendor):
-    name_lower = device_name.lower()
-    if any(keyword in name_lower for keyword in ["ethernet", "modem", "ndis", "tethering"]):
+_VID_PID = re.compile(r"VID_([0-9A-F]{4})&PID_([0-9A-F]{4})$", re.IGNORECASE)  # MI_xx interface keys don't match
+_INF_PREFIX = re.compile(r"^@[\w.]+,?%?[^;]*%;?")  # "@oem42.inf,%desc%;Galaxy S21" -> "Galaxy S21"
+
+
+class UsbDevice(NamedTuple):
+    vid: str      # "VID_04E8"
+    pid: str      # "PID_6860"
+    serial: str   # instance key name: the device serial, or a generated id for devices without one
+    name: str     # FriendlyName, else DeviceDesc, without the "@driver.inf,%...%;" prefix
+    service: str
+    vendor: str
+
+
+def detect_type(device_name, vendor, service=""):
+    name_lower = f"{device_name} {service}".lower()
+    if any(keyword in name_lower for keyword in DONGLE_KEYWORDS):
         return "Dongle"
     elif vendor in VENDOR_MAP.values():
         return "Smartphone"
     else:
         return "Smartphone/Dongle"
 
-def get_smartphone_dongle_history():
+
+def iter_usb_devices(vendors=VENDOR_MAP, reg=None):
+    """ Yield a UsbDevice per instance of a VID_xxxx&PID_yyyy key whose VID is in `vendors`, as it is read. """
+    reg = reg or get_backend()
+    try:
+        usb = reg.OpenKey(HKEY_LOCAL_MACHINE, USB_ENUM_PATH)
+    except FileNotFoundError:
+        return
+    try:
+        for i in range(reg.QueryInfoKey(usb)[0]):  # one EnumKey at a time: the walk may stop early
+            key_name = reg.EnumKey(usb, i)
+            found = _VID_PID.match(key_name)
+            if not found:
+                continue
+            vid = f"VID_{found.group(1).upper()}"
+            vendor = vendors.get(vid)
+            if vendor is None:
+                continue  # decided from the key name alone, nothing below it is opened
+            try:
+                device = reg.OpenKey(usb, key_name)
+            except OSError:
+                continue
+            try:
+                for j in range(reg.QueryInfoKey(device)[0]):
+                    serial = reg.EnumKey(device, j)
+                    try:
+                        instance = reg.OpenKey(device, serial)
+                    except OSError:
+                        continue
+                    try:
+                        values = read_values(instance, DEVICE_VALUES, reg)
+                    except OSError:
+                        values = {}
+                    finally:
+                        reg.CloseKey(instance)
+                    name = _INF_PREFIX.sub("", str(values.get("FriendlyName") or values.get("DeviceDesc") or ""))
+                    yield UsbDevice(vid, f"PID_{found.group(2).upper()}", serial, name or f"{vendor} Device",
+                                    str(values.get("Service") or ""), vendor)
+            finally:
+                reg.CloseKey(device)
+    finally:
+        reg.CloseKey(usb)
+
+
+@audit_cached
+def get_smartphone_dongle_history(limit=DEVICE_LIMIT):
+    """ Up to `limit` smartphones / USB dongles of known vendors that were ever connected (None: all). """
     try:
-        result = subprocess.check_output(
-            'reg query HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Enum\\USB /s',
-            shell=True, text=True, errors='ignore'
-        )
-    except subprocess.CalledProcessError:
+        devices = list(itertools.islice(iter_usb_devices(), limit))
+    except OSError as e:
+        print(f"Error accessing registry: {e}")
         return []
 
-    devices = []
-    blocks = result.split("HKEY_LOCAL_MACHINE")[1:]
-
-    for block in blocks:
-        if len(devices) >= 10:
-            break
-
-        block_text = "HKEY_LOCAL_MACHINE" + block
-        lines = block_text.splitlines()
-
-        serial = ""
-        device_name_candidates = []
-
-        for line in lines:
-            if "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Enum\\USB\\" in line:
-                serial_parts = line.strip().split("\\")
-                if len(serial_parts) > 5:
-                    candidate = serial_parts[-1]
-                    if len(candidate) >= 4 and all(x not in candidate.lower() for x in ["parameters", "properties"]):
-                        serial = candidate
-
-            if any(key in line.lower() for key in ["devicedesc", "friendlyname", "device description", "class", "service"]):
-                match = re.search(r"REG_SZ\s+(.*)", line)
-                if match:
-                    raw_name = match.group(1).strip()
-                    cleaned = re.sub(r'^@[\w.]+,?%?[^;]*%;?', '', raw_name)
-                    if cleaned.lower() not in device_name_candidates:
-                        device_name_candidates.append(cleaned)
-
-        vendor = detect_vendor_from_vid(serial)
-        if vendor != "Unknown":
-            device_name = device_name_candidates[0] if device_name_candidates else f"{vendor} Device"
-            device_type = detect_type(device_name, vendor)
-            devices.append({
-                "Device": device_name,
-                "Vendor": vendor,
-                "Type": device_type,
-                "Serial": serial or "N/A"
-            })
-
-    return devices
-
-if __name__ == "__main__":
+    return [{
+        "Device": device.name,
+        "Vendor": device.vendor,
+        "Type": detect_type(device.name, device.vendor, device.service),
+        "Serial": device.serial or "N/A",
+    } for device in devices]
+
+
+def _sample_usb_tree(devices=20000, phones=12):
+    """ A busy lab PC's Enum\\USB: hubs, keyboards, mice, composite interfaces; the phones plugged in late. """
+    import random
+
+    rng = random.Random(25)
+    other_vendors = ["046D", "045E", "0781", "0951", "8087", "1532", "0BDA", "413C", "03F0", "17EF"]
+    phone_ids = [(vid[4:], brand) for vid, brand in VENDOR_MAP.items()]
+    phone_at = set(rng.sample(range(devices // 2, devices), phones))
+    keys = {}
+    for i in range(devices):
+        if i in phone_at:
+            vid, brand = phone_ids[i % len(phone_ids)]
+            pid = f"{0x6860 + i % 16:04X}"
+            desc = [f"@oem{i % 90}.inf,%android.devicedesc%;{brand} Android Phone",
+                    "@netrndis.inf,%rndismp6.devicedesc%;Remote NDIS based Internet Sharing Device"][i % 3 == 0]
+            service = "usbrndis6" if i % 3 == 0 else "WUDFRd"
+        else:
+            vid, pid = rng.choice(other_vendors), f"{i:04X}"[-4:]
+            desc, service = "@input.inf,%hid.devicedesc%;USB Input Device", "HidUsb"
+        base = rf"HKLM\SYSTEM\CurrentControlSet\Enum\USB\VID_{vid}&PID_{pid}"
+        serial = f"{rng.getrandbits(48):012X}" if i % 2 else f"6&{rng.getrandbits(28):07x}&0&{i % 8}"
+        keys[rf"{base}\{serial}"] = {"DeviceDesc": desc, "Service": service, "Capabilities": 0x84,
+                                     "HardwareID": [rf"USB\VID_{vid}&PID_{pid}&REV_0100", rf"USB\VID_{vid}&PID_{pid}"],
+                                     "Driver": "{36fc9e60-c465-11cf-8056-444553540000}\\0042", "Mfg": "(Standard)"}
+        keys[rf"{base}\{serial}\Device Parameters"] = {"SymbolicName": rf"\??\USB#VID_{vid}&PID_{pid}#{serial}"}
+        if i % 4 == 0:  # composite device: one key per interface
+            keys[rf"{base}&MI_00\7&{i:07x}&0&0000"] = {"DeviceDesc": desc, "Service": service}
+    for hub in range(8):
+        keys[rf"HKLM\SYSTEM\CurrentControlSet\Enum\USB\ROOT_HUB30\4&{hub:08x}&0&0"] = {"DeviceDesc": "USB Root Hub"}
+    return keys
+
+
+def _benchmark(paths=(), devices=20000):
+    """
+    Registry calls and time for the report's first DEVICE_LIMIT devices vs the whole tree, over a
+    generated Enum\\USB tree in memory and as a hive file - or over a collected SYSTEM hive given
+    on the command line.
+    """
+    import contextlib
+    import os
+    import tempfile
+    import regf_reader
+
+    def run(label, open_registry, calls=lambda: None):
+        for limit in (DEVICE_LIMIT, None):
+            with open_registry() as reg:  # a fresh mount per run: hive timings are cold
+                start = time.perf_counter()
+                found = list(itertools.islice(iter_usb_devices(reg=reg), limit))
+                elapsed = time.perf_counter() - start
+            count = calls()
+            print(f"   {label}, limit {limit}: {len(found)} devices in {elapsed * 1000:.1f} ms"
+                  + (f", {count} registry calls" if count is not None else ""))
+        return found
+
+    if paths:
+        for path in paths:
+            print(f"✅ {os.path.basename(path)}")
+            for device in run("hive", lambda: regf_reader.offline_hives(system=path))[:DEVICE_LIMIT]:
+                print(f"   {device.vendor:8} {device.vid}&{device.pid} {device.serial:24} {device.name}")
+        return
+
+    keys = _sample_usb_tree(devices)
+    print(f"✅ Enum\\USB with {devices} devices ({len(keys)} keys)")
+    registry = FakeRegistry(keys)
+
+    def calls():
+        count, registry.calls = registry.calls, 0
+        return count
+
+    found = run("in memory", lambda: contextlib.nullcontext(registry), calls)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "SYSTEM")
+        prefix = "HKLM\\SYSTEM\\"
+        regf_reader.write_sample_hive(path, {k[len(prefix):].replace("CurrentControlSet", "ControlSet001"): v
+                                             for k, v in keys.items()} | {"Select": {"Current": 1}}, "SYSTEM")
+        run(f"hive file ({os.path.getsize(path) / 1024 / 1024:.1f} MiB)", lambda: regf_reader.offline_hives(system=path))
+
+    previous = set_backend(registry)
+    try:
+        report = get_smartphone_dongle_history()
+    finally:
+        set_backend(previous)
+    print(f"   report: {len(report)} of {len(found)} known-vendor devices, "
+          f"{sum(d['Type'] == 'Dongle' for d in report)} dongles")
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--benchmark"]:
+    _benchmark(sys.argv[2:])  # python smartphone_dongle_history.py --benchmark [SYSTEM hive ...]
+elif __name__ == "__main__":
+    from tabulate import tabulate
+
     devices = get_smartphone_dongle_history()
     print("\nSmartphone / Dongle Connection History")
     if devices:
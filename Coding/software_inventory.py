@@ -0,0 +1,109 @@
+import time
+from typing import NamedTuple
+from audit_context import audit_cached, audit_run
+from registry_backend import (HKEY_LOCAL_MACHINE, HKEY_CURRENT_USER, HIVE_NAMES, FakeRegistry,
+                              get_backend, set_backend, read_values, subkey_names)
+
+# ✅ One walk over the Uninstall keys per audit run, shared by every software check
+UNINSTALL_PATHS = (
+    r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall",
+)
+INVENTORY_HIVES = (HKEY_LOCAL_MACHINE, HKEY_CURRENT_USER)
+INVENTORY_VALUES = ("DisplayName", "DisplayVersion", "Publisher", "InstallDate", "InstallLocation", "EstimatedSize")
+
+
+class InstalledProgram(NamedTuple):
+    name: str
+    version: str
+    publisher: str
+    install_date: str      # YYYYMMDD as written by the installer, "" if not recorded
+    install_location: str
+    estimated_size: int    # KiB, 0 if not recorded
+    hive: str              # "HKLM" / "HKCU"
+    key: str               # Uninstall subkey name (product code or app name)
+
+
+def scan_uninstall_keys(hives=INVENTORY_HIVES, paths=UNINSTALL_PATHS, reg=None):
+    """ Yield an InstalledProgram per Uninstall subkey with a DisplayName; each subkey is opened once. """
+    reg = reg or get_backend()
+    for hive in hives:
+        for path in paths:
+            try:
+                uninstall = reg.OpenKey(hive, path)
+            except FileNotFoundError:
+                continue
+            try:
+                for name in subkey_names(uninstall, reg):
+                    try:
+                        subkey = reg.OpenKey(uninstall, name)
+                    except OSError:
+                        continue
+                    try:
+                        values = read_values(subkey, INVENTORY_VALUES, reg)
+                    except OSError:
+                        continue
+                    finally:
+                        reg.CloseKey(subkey)
+
+                    display_name = values.get("DisplayName")
+                    if not display_name:
+                        continue
+                    size = values.get("EstimatedSize")
+                    yield InstalledProgram(
+                        str(display_name),
+                        str(values.get("DisplayVersion") or ""),
+                        str(values.get("Publisher") or ""),
+                        str(values.get("InstallDate") or ""),
+                        str(values.get("InstallLocation") or ""),
+                        size if isinstance(size, int) else 0,
+                        HIVE_NAMES.get(hive, str(hive)),
+                        name,
+                    )
+            finally:
+                reg.CloseKey(uninstall)
+
+
+@audit_cached
+def installed_software():
+    """ Every installed program (HKLM + HKCU, 64- and 32-bit views), read once per audit run. """
+    return list(scan_uninstall_keys())
+
+
+def _benchmark(count=2000):
+    """ A fake hive with `count` programs: one scan, then both report consumers inside one audit run. """
+    import extra_installed_programs
+    import unwanted_softwares
+
+    keys = {}
+    for i in range(count):
+        hive = "HKCU" if i % 10 == 0 else "HKLM"
+        path = UNINSTALL_PATHS[i % 3 == 0]
+        keys[rf"{hive}\{path}\{{{i:08X}-0000-0000-0000-000000000000}}"] = {
+            "DisplayName": ["TeamViewer 15", "7-Zip 23.01", "Python 3.11.7 (64-bit)", "Discord"][i % 4] + f" #{i}",
+            "DisplayVersion": f"{i % 30}.{i % 7}.0", "Publisher": "Example Corp", "InstallDate": "20250514",
+            "InstallLocation": rf"C:\Program Files\App{i}", "EstimatedSize": 1024 + i,
+            "UninstallString": rf"MsiExec.exe /X{{{i:08X}}}", "NoModify": 1, "NoRepair": 1, "Language": 1033,
+            "HelpLink": "https://example.com", "URLInfoAbout": "https://example.com", "VersionMajor": i % 30,
+        }
+    registry = FakeRegistry(keys)
+    previous = set_backend(registry)
+    try:
+        start = time.perf_counter()
+        programs = list(scan_uninstall_keys())
+        elapsed = time.perf_counter() - start
+        print(f"✅ {len(programs)} programs in {elapsed * 1000:.0f} ms, {registry.calls} registry calls "
+              f"({registry.calls / len(programs):.1f} per program)")
+
+        registry.calls = 0
+        with audit_run():
+            installed = extra_installed_programs.get_installed_programs()
+            unwanted = unwanted_softwares.detect_unwanted_software()
+        print(f"   report: {len(installed)} installed, {len(unwanted)} unwanted, {registry.calls} registry calls "
+              f"for both checks together")
+    finally:
+        set_backend(previous)
+
+
+if __name__ == "__main__":
+    _benchmark()
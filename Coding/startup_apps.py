@@ -1,6 +1,8 @@
-import winreg
 import subprocess
+from audit_context import audit_cached
+from registry_backend import HKEY_CURRENT_USER, HKEY_LOCAL_MACHINE, get_backend
 
+@audit_cached
 def get_startup_programs():
     """
     Retrieves a list of startup applications from the Windows Registry and Task Scheduler.
@@ -9,21 +11,22 @@ def get_startup_programs():
 
     # Registry paths for startup applications
     registry_paths = [
-        (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"),
-        (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run")
+        (HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"),
+        (HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run")
     ]
 
     # Extract startup programs from Windows Registry
+    reg = get_backend()
     for hive, path in registry_paths:
         try:
-            reg_key = winreg.OpenKey(hive, path)
-            for i in range(winreg.QueryInfoKey(reg_key)[1]):  # Number of values in the key
+            reg_key = reg.OpenKey(hive, path)
+            for i in range(reg.QueryInfoKey(reg_key)[1]):  # Number of values in the key
                 try:
-                    name, command, _ = winreg.EnumValue(reg_key, i)
+                    name, command, _ = reg.EnumValue(reg_key, i)
                     startup_programs.append((name, command, "Registry"))
                 except FileNotFoundError:
                     continue
-            winreg.CloseKey(reg_key)
+            reg.CloseKey(reg_key)
         except FileNotFoundError:
             continue
 
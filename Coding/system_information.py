@@ -4,12 +4,16 @@ import subprocess
 import os
 import platform
 import requests
+from probe_executor import run_command, run_probes
+from powershell_pool import run_powershell
+from audit_context import audit_cached
 
 # Function to get System Serial Number
+@audit_cached
 def get_system_serial_number():
     try:
         command = "wmic bios get SerialNumber"
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         lines = [line.strip() for line in result.stdout.split("\n") if line.strip()]
         serial_number = lines[1] if len(lines) > 1 else "Not Available"
         
@@ -21,6 +25,7 @@ def get_system_serial_number():
         return f"Error: {e}"
 
 # Function to get public IP
+@audit_cached
 def get_public_ip():
     """
     Retrieve public IP address with multiple fallback methods
@@ -47,6 +52,7 @@ def get_public_ip():
     return "Could not retrieve"
 
 # Function to get local IP
+@audit_cached
 def get_local_ip():
     try:
         return socket.gethostbyname(socket.gethostname())
@@ -55,12 +61,13 @@ def get_local_ip():
 
 # Function to get PC Name, OS Name, Windows Version, Machine Type, Processor, Service Pack
 # Optimized function to fetch multiple system details in one call
+@audit_cached
 def get_system_identity():
     pc_name = socket.gethostname()
 
     try:
         command = 'wmic os get Name, Version, SystemDirectory, WindowsDirectory, OSArchitecture /format:list'
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         output_lines = [line.strip() for line in result.stdout.split("\n") if "=" in line]
 
         system_info = {}
@@ -83,7 +90,7 @@ def get_system_identity():
 
     # Fetch Processor Name (Optimized)
     try:
-        cpu_output = subprocess.run("wmic cpu get Name", shell=True, capture_output=True, text=True)
+        cpu_output = run_command("wmic cpu get Name")
         cpu_lines = [line.strip() for line in cpu_output.stdout.split("\n") if line.strip()]
         processor = cpu_lines[1] if len(cpu_lines) > 1 else platform.processor()
     except:
@@ -91,7 +98,7 @@ def get_system_identity():
 
     # Fetch Service Pack Version
     try:
-        sp_output = subprocess.run("wmic os get ServicePackMajorVersion, ServicePackMinorVersion", shell=True, capture_output=True, text=True)
+        sp_output = run_command("wmic os get ServicePackMajorVersion, ServicePackMinorVersion")
         sp_lines = [line.strip() for line in sp_output.stdout.split("\n") if line.strip()]
         if len(sp_lines) > 1:
             sp_major, sp_minor = sp_lines[1].split()
@@ -103,10 +110,11 @@ def get_system_identity():
 
     return pc_name, os_name, windows_version, machine_type, processor, service_pack, system_directory, windows_directory
 
+@audit_cached
 def get_os_install_date():
     try:
         command = 'wmic os get InstallDate'
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         lines = [line.strip() for line in result.stdout.split("\n") if line.strip()]
         install_date_raw = lines[1] if len(lines) > 1 else "Could not retrieve"
         
@@ -119,6 +127,7 @@ def get_os_install_date():
     except:
         return "Could not retrieve"
 
+@audit_cached
 def check_clear_desktop():
     try:
         desktop_path = os.path.join(os.environ["USERPROFILE"], "Desktop")
@@ -138,10 +147,11 @@ def check_clear_desktop():
         return f"Error Checking Desktop Status ({str(e)})"
 
 # Function to get Domain information
+@audit_cached
 def get_domain():
     try:
         command = 'wmic computersystem get Domain'
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         lines = [line.strip() for line in result.stdout.split("\n") if line.strip()]
         domain = lines[1] if len(lines) > 1 else "WORKGROUP"
         return domain
@@ -149,19 +159,21 @@ def get_domain():
         return "Could not retrieve"
 
 # Function to get BIOS Version
+@audit_cached
 def get_bios_version():
     try:
         command = "wmic bios get SMBIOSBIOSVersion"
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         lines = [line.strip() for line in result.stdout.split("\n") if line.strip()]
         return lines[1] if len(lines) > 1 else "Could not retrieve"
     except:
         return "Could not retrieve"
 
 # Function to get OS Configuration
+@audit_cached
 def get_os_configuration():
     try:
-        output = os.popen('systeminfo | findstr /C:"OS Configuration"').read()
+        output = run_command('systeminfo | findstr /C:"OS Configuration"').stdout
         return output.strip().split(":")[1].strip() if ":" in output else "Not Available"
     except Exception as e:
         return f"Error: {e}"
@@ -174,11 +186,12 @@ def classify_network(ip_address):
     else:
         return "Project Network or Unknown"
 
+@audit_cached
 def get_plug_and_play_status():
     try:
         # ✅ Check if Plug and Play (PnP) is enabled/disabled
-        cmd = 'powershell -Command "(Get-ItemProperty -Path \'HKLM:\\SYSTEM\\CurrentControlSet\\Services\\PlugPlay\' -Name Start).Start"'
-        output = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
+        cmd = '(Get-ItemProperty -Path \'HKLM:\\SYSTEM\\CurrentControlSet\\Services\\PlugPlay\' -Name Start).Start'
+        output = run_powershell(cmd).strip()
 
         if output == "2":
             return "Plug and Play Enabled (Automatic Start)"
@@ -193,20 +206,22 @@ def get_plug_and_play_status():
         return "Error Retrieving Plug and Play Status"
     
 # Function to get Windows Product ID
+@audit_cached
 def get_windows_product_id():
     try:
         command = "wmic os get SerialNumber"
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         lines = [line.strip() for line in result.stdout.split("\n") if line.strip()]
         return lines[1] if len(lines) > 1 else "Could not retrieve"
     except Exception as e:
         return f"Error: {e}"
 
 # Function to get last Windows update
+@audit_cached
 def get_last_windows_update():
     try:
         command = "wmic qfe get HotFixID, InstalledOn"
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         updates = [line.strip() for line in result.stdout.split("\n") if line.strip() and "HotFixID" not in line]
         
         if not updates:
@@ -217,11 +232,11 @@ def get_last_windows_update():
     except Exception as e:
         return f"Error: {e}"
 
+@audit_cached
 def get_last_system_update():
     try:
-        command = 'powershell "Get-HotFix | Sort-Object InstalledOn -Descending | Select-Object -ExpandProperty InstalledOn -First 1"'
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        last_update_date = result.stdout.strip()
+        command = 'Get-HotFix | Sort-Object InstalledOn -Descending | Select-Object -ExpandProperty InstalledOn -First 1'
+        last_update_date = run_powershell(command).strip()
 
         # Ensure the output contains a full date
         if last_update_date and len(last_update_date.split()) >= 3:
@@ -231,11 +246,11 @@ def get_last_system_update():
         return "Could not retrieve"
     
 # Function to check Windows License Status
+@audit_cached
 def get_windows_license_status():
     try:
-        command = 'powershell "(Get-WmiObject -query \'select LicenseStatus from SoftwareLicensingProduct where PartialProductKey is not null\').LicenseStatus"'
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        status_code = result.stdout.strip()
+        command = '(Get-WmiObject -query \'select LicenseStatus from SoftwareLicensingProduct where PartialProductKey is not null\').LicenseStatus'
+        status_code = run_powershell(command).strip()
 
         # Ensure status_code is valid
         if not status_code:
@@ -257,11 +272,12 @@ def get_windows_license_status():
     except:
         return "Could not retrieve"
 
+@audit_cached
 def get_bitlocker_status():
     try:
         # Run the BitLocker status command
-        cmd = 'powershell -ExecutionPolicy Bypass -NoProfile -Command "manage-bde -status C:"'
-        output = subprocess.check_output(cmd, shell=True, text=True, stderr=subprocess.DEVNULL).strip()
+        cmd = 'manage-bde -status C:'
+        output = run_powershell(cmd).strip()
 
         # Check for different BitLocker statuses
         if "Protection On" in output:
@@ -277,18 +293,20 @@ def get_bitlocker_status():
         return "Error: (Requires Admin Privileges)"
 
 # Function to check Internet Connectivity
+@audit_cached
 def check_connectivity():
     try:
         command = "ping -n 1 8.8.8.8" if platform.system().lower() == "windows" else "ping -c 1 8.8.8.8"
-        result = subprocess.run(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        result = run_command(command)
         return "Connected" if result.returncode == 0 else "No Internet Connection"
     except:
         return "Could not determine"
 
+@audit_cached
 def get_wifi_ssid():
     try:
         command = 'netsh wlan show interfaces | findstr SSID'
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         lines = [line.strip() for line in result.stdout.split("\n") if "SSID" in line and "BSSID" not in line]
 
         if lines:
@@ -299,11 +317,12 @@ def get_wifi_ssid():
     except:
         return "Could not retrieve Wi-Fi SSID"
 
+@audit_cached
 def get_geolocation_status():
     try:
         # ✅ Check if Location Services is enabled/disabled
-        cmd = 'powershell -Command "(Get-ItemProperty -Path \'HKLM:\\SYSTEM\\CurrentControlSet\\Services\\lfsvc\' -Name Start).Start"'
-        output = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
+        cmd = '(Get-ItemProperty -Path \'HKLM:\\SYSTEM\\CurrentControlSet\\Services\\lfsvc\' -Name Start).Start'
+        output = run_powershell(cmd).strip()
 
         if output == "3":
             return "Geo-Location Services Enabled"
@@ -315,11 +334,12 @@ def get_geolocation_status():
     except:
         return "Error Retrieving Geo-Location Status"
   
+@audit_cached
 def get_bluetooth_status():
     try:
         # ✅ Check if a Bluetooth adapter exists
-        cmd = 'powershell -Command "Get-PnpDevice -Class Bluetooth | Select-Object -ExpandProperty Status"'
-        output = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
+        cmd = 'Get-PnpDevice -Class Bluetooth | Select-Object -ExpandProperty Status'
+        output = run_powershell(cmd).strip()
 
         if not output:  # ✅ No Bluetooth adapter detected
             return "No Bluetooth Adapter Found"
@@ -333,10 +353,11 @@ def get_bluetooth_status():
         return "No Bluetooth Adapter Found"  # ✅ If command fails, assume no Bluetooth hardware
 
 # Function to get all user account names
+@audit_cached
 def get_all_user_accounts():
     try:
         command = 'wmic useraccount get name'
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         lines = [line.strip() for line in result.stdout.split("\n") if line.strip()]
         users = lines[1:]  # Skip header
         return ", ".join(users) if users else "No users found."
@@ -344,6 +365,7 @@ def get_all_user_accounts():
         return f"Error: {e}"
 
 # Function to list desktop files and count them
+@audit_cached
 def get_desktop_files():
     desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
     try:
@@ -355,60 +377,82 @@ def get_desktop_files():
         return "Could not retrieve desktop files.", 0
 
 # Function to get system info
+@audit_cached
 def get_system_info():
-    cpu_usage = psutil.cpu_percent(interval=1)
-    memory_usage = psutil.virtual_memory().percent
-    pc_name, os_name, windows_version, machine_type, processor, service_pack, system_directory, windows_directory = get_system_identity()
+    # ✅ Run the individual probes concurrently (the CPU sample alone takes a second)
+    results = run_probes({
+        "cpu_usage": lambda: psutil.cpu_percent(interval=1),
+        "memory_usage": lambda: psutil.virtual_memory().percent,
+        "identity": get_system_identity,
+        "serial_number": get_system_serial_number,
+        "bios_version": get_bios_version,
+        "product_id": get_windows_product_id,
+        "os_configuration": get_os_configuration,
+        "plug_and_play": get_plug_and_play_status,
+        "clear_desktop": check_clear_desktop,
+        "install_date": get_os_install_date,
+        "domain": get_domain,
+        "last_update": get_last_system_update,
+        "license_status": get_windows_license_status,
+        "bitlocker": get_bitlocker_status,
+        "connectivity": check_connectivity,
+        "geolocation": get_geolocation_status,
+        "bluetooth": get_bluetooth_status,
+        "local_ip": get_local_ip,
+        "public_ip": get_public_ip,
+    }, defaults={"identity": (socket.gethostname(),) + ("Could not retrieve",) * 7})
+
+    pc_name, os_name, windows_version, machine_type, processor, service_pack, system_directory, windows_directory = results["identity"]
 
     return {
-        "System Serial Number": get_system_serial_number(),
+        "System Serial Number": results["serial_number"],
         "PC Name": pc_name,
         "OS Name": os_name,
         "Windows Version": windows_version,
-        "BIOS Version": get_bios_version(),
+        "BIOS Version": results["bios_version"],
         "Machine Type": machine_type,
         "Processor": processor,
-        "Product ID": get_windows_product_id(),
+        "Product ID": results["product_id"],
         "Service Pack Status": service_pack,
-        "OS Configuration": get_os_configuration(),
-        "Plug and Play Status": get_plug_and_play_status(),
+        "OS Configuration": results["os_configuration"],
+        "Plug and Play Status": results["plug_and_play"],
         "Windows Directory": windows_directory,
         "System Directory": system_directory,
-        "Clear Desktop Status": check_clear_desktop(),
-        "OS Install Date": get_os_install_date(),
-        "Domain": get_domain(),
-        "System Last Updated On": get_last_system_update(),
-        "Windows License Status": get_windows_license_status(),
-        "BitLocker Status": get_bitlocker_status(),
-        "Internet Connectivity": check_connectivity(),
-        "Geo-Location Status": get_geolocation_status(),
-        "Bluetooth Status": get_bluetooth_status(),
-        "Local IP Address": get_local_ip(),
-        "Public IP Address": get_public_ip(),
-        "CPU Usage": f"{cpu_usage}%",
-        "Memory Usage": f"{memory_usage}%",
+        "Clear Desktop Status": results["clear_desktop"],
+        "OS Install Date": results["install_date"],
+        "Domain": results["domain"],
+        "System Last Updated On": results["last_update"],
+        "Windows License Status": results["license_status"],
+        "BitLocker Status": results["bitlocker"],
+        "Internet Connectivity": results["connectivity"],
+        "Geo-Location Status": results["geolocation"],
+        "Bluetooth Status": results["bluetooth"],
+        "Local IP Address": results["local_ip"],
+        "Public IP Address": results["public_ip"],
+        "CPU Usage": f"{results['cpu_usage']}%",
+        "Memory Usage": f"{results['memory_usage']}%",
     }
 
 # Function to get Network Interface Name (Wi-Fi & Ethernet)
+@audit_cached
 def get_network_interface():
     try:
         # ✅ Get active network adapter (Ethernet/Wi-Fi)
         command = 'wmic nic where "NetEnabled=True" get Name'
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = run_command(command)
         lines = [line.strip() for line in result.stdout.split("\n") if line.strip()]
 
         active_interface = lines[1] if len(lines) > 1 else "Unknown"
 
         # ✅ Check if Wi-Fi adapter exists
-        wifi_command = 'powershell -Command "Get-NetAdapter | Where-Object {$_.Name -match \'Wi-Fi\'} | Select-Object -ExpandProperty Name"'
-        wifi_result = subprocess.run(wifi_command, shell=True, capture_output=True, text=True)
-        wifi_lines = [line.strip() for line in wifi_result.stdout.split("\n") if line.strip()]
+        wifi_command = 'Get-NetAdapter | Where-Object {$_.Name -match \'Wi-Fi\'} | Select-Object -ExpandProperty Name'
+        wifi_output = run_powershell(wifi_command)
+        wifi_lines = [line.strip() for line in wifi_output.split("\n") if line.strip()]
         wifi_adapter = wifi_lines[0] if wifi_lines else "No Wi-Fi Adapter Found"
 
         # ✅ Check if Wi-Fi is ON or OFF
-        wifi_status_command = 'powershell -Command "Get-NetAdapter | Where-Object {$_.Name -match \'Wi-Fi\'} | Select-Object -ExpandProperty Status"'
-        wifi_status_result = subprocess.run(wifi_status_command, shell=True, capture_output=True, text=True)
-        wifi_status = wifi_status_result.stdout.strip()
+        wifi_status_command = 'Get-NetAdapter | Where-Object {$_.Name -match \'Wi-Fi\'} | Select-Object -ExpandProperty Status'
+        wifi_status = run_powershell(wifi_status_command).strip()
 
         if "Up" in wifi_status:
             wifi_status = "Wi-Fi is ON"
@@ -423,6 +467,7 @@ def get_network_interface():
         return "Unknown", "Could not retrieve", "Unknown Wi-Fi Status"
     
 # Function to get network details
+@audit_cached
 def get_network_details():
     try:
         ip_address = get_local_ip()
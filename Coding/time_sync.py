@@ -1,4 +1,6 @@
 import subprocess
+from audit_context import invalidate_probes
+from service_transitions import SERVICE_PROBES
 
 def set_time_service_automatic():
     commands = [
@@ -11,6 +13,8 @@ def set_time_service_automatic():
         return "Time service set to Automatic and started successfully."
     except subprocess.CalledProcessError as e:
         return f"Failed to set time service: {e.stderr}"
+    finally:
+        invalidate_probes(*SERVICE_PROBES)
 
 def set_time_server(server="time.nist.gov"):
     try:
@@ -1,82 +1,89 @@
-import winreg
+import time
+from typing import NamedTuple
+from audit_context import audit_cached
+from software_inventory import installed_software
+from signature_db import SEVERITY_ORDER, get_signature_db
 
-# ✅ Expanded list of unwanted software
-UNWANTED_SOFTWARE = [
-    # Remote Access
-    "TeamViewer", "AnyDesk", "UltraVNC", "LogMeIn", "RemotePC", "Ammyy Admin", "ShowMyPC", "Chrome Remote Desktop",
-    "TightVNC", "ConnectWise Control", "Zoho Assist", "RustDesk", "NoMachine",
+# ✅ The unwanted-software list is the signature file (unwanted_signatures.json, see signature_db)
 
-    # Registry Cleaners
-    "CCleaner", "Advanced SystemCare", "Registry Mechanic", "Wise Registry Cleaner", "Glary Utilities",
-    "Auslogics Registry Cleaner", "IObit Advanced SystemCare", "WinOptimizer", "RegCure Pro",
-    "PC Speed Maximizer", "WinThruster", "OneSafe PC Cleaner",
 
-    # Virtual Machines
-    "VMware", "VirtualBox", "Hyper-V", "Sandboxie", "Parallels Desktop", "QEMU", "Shadow Defender", "Deep Freeze",
+class UnwantedMatch(NamedTuple):
+    program: str   # installed program name
+    pattern: str   # name of the signature it matched
+    category: str
+    severity: str  # "High" / "Medium" / "Low"
 
-    # Torrent Clients
-    "uTorrent", "BitTorrent", "qBittorrent", "Deluge", "Vuze", "FrostWire", "Transmission", "eMule",
-    "Popcorn Time", "Pirate Bay Client", "LimeWire",
 
-    # Hacking & Cracking Tools
-    "Cain & Abel", "Wireshark", "Metasploit", "John the Ripper", "Aircrack-ng", "Nmap", "Hydra", "Mimikatz",
-    "Maltego", "Brutus", "Hashcat", "NetStumbler", "ZMap",
+def match_programs(programs, db=None):
+    """ UnwantedMatch for each InstalledProgram a signature matches (by name or publisher, within its versions). """
+    db = db or get_signature_db()
+    matches = []
+    for program in programs:
+        found = db.match(program.name, program.version, program.publisher)
+        if found is not None:
+            signature = found.signature
+            matches.append(UnwantedMatch(program.name, signature.name, signature.category, signature.severity))
+    return matches
 
-    # Keyloggers
-    "Refog Keylogger", "Elite Keylogger", "Spyrix Keylogger", "Ardamax Keylogger", "Best Free Keylogger",
-    "PC Pandora", "REFOG Personal Monitor", "KidLogger",
-
-    # VPNs
-    "Tor", "Psiphon", "Freegate", "Ultrasurf", "Hotspot Shield", "NordVPN", "ExpressVPN", "ProtonVPN",
-    "CyberGhost", "TunnelBear", "Windscribe", "Hidemyass VPN",
-
-    # Cloud Storage
-    "Dropbox", "Google Drive", "OneDrive", "Box", "Mega", "MediaFire", "Sync.com", "pCloud",
-    "WeTransfer", "Send Anywhere",
-
-    # Social Media Apps
-    "Facebook Messenger", "WhatsApp Desktop", "Telegram Desktop", "TikTok", "Instagram", "Snapchat",
-    "Reddit Desktop", "Discord", "Skype"
-]
 
+@audit_cached
 def get_installed_software():
-    """ Retrieves a list of installed software from the Windows registry. """
-    software_list = []
-
-    registry_paths = [
-        r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
-        r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
-    ]
-
-    for reg_path in registry_paths:
-        try:
-            reg_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
-            for i in range(winreg.QueryInfoKey(reg_key)[0]):
-                try:
-                    sub_key_name = winreg.EnumKey(reg_key, i)
-                    sub_key = winreg.OpenKey(reg_key, sub_key_name)
-
-                    software_name, _ = winreg.QueryValueEx(sub_key, "DisplayName")
-                    software_list.append(software_name)
+    """ Retrieves a list of installed software from the Windows registry (HKEY_LOCAL_MACHINE). """
+    return [program.name for program in installed_software() if program.hive == "HKLM"]
 
-                    winreg.CloseKey(sub_key)
-                except (FileNotFoundError, OSError):
-                    continue
-
-            winreg.CloseKey(reg_key)
-
-        except FileNotFoundError:
-            continue
-
-    return software_list
+@audit_cached
+def detect_unwanted_matches():
+    """ ✅ UnwantedMatch (program, signature, category, severity) per unwanted program, most severe first. """
+    programs = [program for program in installed_software() if program.hive == "HKLM"]
+    return sorted(match_programs(programs), key=lambda match: SEVERITY_ORDER.get(match.severity, 3))
 
+@audit_cached
 def detect_unwanted_software():
     """ ✅ Returns a list of unwanted software instead of printing it. """
-    installed_software = get_installed_software()
-
-    # ✅ Ensure function always returns a list
-    detected_unwanted = [
-        s for s in installed_software if any(u.lower() in s.lower() for u in UNWANTED_SOFTWARE)
-    ] if installed_software else []
-
-    return detected_unwanted  # ✅ FIX: Returning a list instead of printing
+    return [match.program for match in detect_unwanted_matches()]
+
+
+def _benchmark(count=10_000):
+    """ 10k synthetic programs: signature matching against the old per-pattern substring test. """
+    import random
+    from software_inventory import InstalledProgram
+
+    db = get_signature_db()
+    patterns = [signature.name for signature in db.signatures]
+    rng = random.Random(14)
+    vendors = ["Microsoft", "Adobe", "Intel(R)", "NVIDIA", "Realtek", "Mozilla", "Google", "Oracle", "HP", "Dell"]
+    products = ["Visual C++ 2015-2022 Redistributable (x64)", "Acrobat Reader DC", "Graphics Driver", "Audio Driver",
+                "Firefox (x64 en-US)", "Update Helper", "Java 8 Update 401", "Support Assistant", "Notepad++ Editor",
+                "Toolbox for Windows", "Megabyte Backup", "Inbox Sync", "Storage Monitor", "Network Drivers"]
+    programs = []
+    for i in range(count):
+        version = f"{rng.randint(1, 20)}.{rng.randint(0, 9)}"
+        if i % 25 == 0:
+            name, publisher = f"{rng.choice(patterns)} {version}", ""
+        else:
+            publisher = rng.choice(vendors)
+            name = f"{publisher} {rng.choice(products)} {version}"
+        programs.append(InstalledProgram(name, version, publisher, "", "", 0, "HKLM", f"{{{i}}}"))
+    names = [program.name for program in programs]
+
+    start = time.perf_counter()
+    old = [s for s in names if any(u.lower() in s.lower() for u in patterns)]
+    old_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matches = match_programs(programs, db)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {count} programs, {len(db)} signatures (version {db.version}): substring test "
+          f"{old_elapsed * 1000:.0f} ms ({len(old)} hits), signature matcher {elapsed * 1000:.1f} ms ({len(matches)} hits)")
+    matched = {match.program for match in matches}
+    false_positives = sorted({name.rsplit(" ", 1)[0] for name in old if name not in matched})
+    print(f"   no longer flagged ({len(false_positives)} names): {', '.join(false_positives[:6])}")
+    by_category = {}
+    for match in matches:
+        by_category[f"{match.category} ({match.severity})"] = by_category.get(f"{match.category} ({match.severity})", 0) + 1
+    print("   " + ", ".join(f"{category}: {n}" for category, n in by_category.items()))
+
+
+if __name__ == "__main__":
+    _benchmark()
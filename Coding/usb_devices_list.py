@@ -1,19 +1,22 @@
-import winreg
+from registry_backend import HKEY_LOCAL_MACHINE, get_backend
+from audit_context import audit_cached
 
+@audit_cached
 def get_usb_history():
     usb_devices = []
     reg_path = r'SYSTEM\\CurrentControlSet\\Enum\\USBSTOR'
 
     try:
-        reg_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
+        reg = get_backend()
+        reg_key = reg.OpenKey(HKEY_LOCAL_MACHINE, reg_path)
         
-        for i in range(winreg.QueryInfoKey(reg_key)[0]):
-            device_key_name = winreg.EnumKey(reg_key, i)
-            device_key = winreg.OpenKey(reg_key, device_key_name)
+        for i in range(reg.QueryInfoKey(reg_key)[0]):
+            device_key_name = reg.EnumKey(reg_key, i)
+            device_key = reg.OpenKey(reg_key, device_key_name)
             
-            for j in range(winreg.QueryInfoKey(device_key)[0]):
-                instance_key_name = winreg.EnumKey(device_key, j)
-                instance_key = winreg.OpenKey(device_key, instance_key_name)
+            for j in range(reg.QueryInfoKey(device_key)[0]):
+                instance_key_name = reg.EnumKey(device_key, j)
+                instance_key = reg.OpenKey(device_key, instance_key_name)
                 
                 device_info = {
                     'Device': device_key_name,
@@ -22,17 +25,17 @@ def get_usb_history():
                 }
 
                 try:
-                    friendly_name, _ = winreg.QueryValueEx(instance_key, 'FriendlyName')
+                    friendly_name, _ = reg.QueryValueEx(instance_key, 'FriendlyName')
                     device_info['FriendlyName'] = friendly_name
                 except FileNotFoundError:
                     device_info['FriendlyName'] = 'N/A'
                 
                 usb_devices.append(device_info)
-                winreg.CloseKey(instance_key)
+                reg.CloseKey(instance_key)
 
-            winreg.CloseKey(device_key)
+            reg.CloseKey(device_key)
 
-        winreg.CloseKey(reg_key)
+        reg.CloseKey(reg_key)
 
     except Exception as e:
         print(f"Error accessing registry: {e}")